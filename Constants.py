@@ -411,6 +411,7 @@ CHART_KEY_FIELDS = ('vendor', 'metric_type')
 
 DATABASE_FOLDER = r'./all_data/search/'
 DATABASE_LOCATION = DATABASE_FOLDER + r'search.db'
+DATABASE_REBUILD_TRANSACTION_ROWS = 200000  # Rows inserted per transaction when the files are parsed in parallel
 # All yearly reports tsv and json are saved here in original condition as backup
 PROTECTED_DATABASE_FILE_DIR = "./all_data/.DO_NOT_MODIFY/"
 FILE_SUBDIRECTORY_ORDER = ('year', 'vendor')
@@ -441,6 +442,14 @@ MONTH_NAMES = ("January", "February", "March", "April", "May", "June", "July", "
 
 MASTER_REPORTS = ("DR", "IR", "PR", "TR")
 
+# Large reports that can be requested in month range shards, see the report_shard_months setting
+SHARDED_REPORTS = ("IR", "TR")
+
+# Master reports by the usual size of their response, smallest first. Standard views are smaller than all of these
+REPORT_SIZE_ORDER = ("PR", "DR", "TR", "IR")
+
+STREAM_CHUNK_SIZE = 1 << 16  # Bytes read at a time when streaming report items
+
 
 class MajorReportType(Enum):
     PLATFORM = "PR"
@@ -578,6 +587,19 @@ RETRY_LATER_CODES = [1010,
                      1011]
 RETRY_WAIT_TIME = 5  # Seconds
 
+# If these HTTP status codes are received the request will be retried, see the request_retries setting
+RETRY_HTTP_CODES = (429, 500, 502, 503, 504)
+
+FETCH_JOURNAL_FILE_DIR = "./all_data/fetch_journal/"
+FETCH_JOURNAL_FILE_NAME = "fetch_journal.dat"
+
+SUPPORTED_REPORTS_FILE_DIR = "./all_data/supported_reports/"
+SUPPORTED_REPORTS_FILE_NAME = "supported_reports.dat"
+
+# Raw JSON of yearly reports, saved as {year}/{vendor}/{year}_{vendor}_{report type}.json + compression extension
+JSON_ARCHIVE_FILE_DIR = PROTECTED_DATABASE_FILE_DIR + "_json/"
+JSON_ARCHIVE_EXTENSIONS = {"none": "", "gzip": ".gz", "zstd": ".zst"}  # <k = compression, v = file extension>
+
 
 class CompletionStatus(Enum):
     SUCCESSFUL = "Successful!"
@@ -602,6 +624,41 @@ CONCURRENT_VENDORS = 2
 CONCURRENT_REPORTS = 2
 USER_AGENT = "Mozilla/5.0 Firefox/73.0 Chrome/80.0.3987.132 Safari/605.1.15"
 DEFAULT_CURRENCY = 'USD'
+CONNECTION_POOL_SIZE = 10  # Kept-alive connections per vendor host
+REQUEST_RATE = 0.0  # Requests per second, per vendor. 0 uses REQUEST_INTERVAL
+REQUEST_BURST = 1
+GLOBAL_REQUEST_RATE = 0.0  # Requests per second, all vendors. 0 for no limit
+REPORT_SHARD_MONTHS = 0  # Months per request for large reports, e.g. 1 or 3. 0 to request the whole range at once
+STREAM_REPORT_ITEMS = False
+REQUEST_RETRIES = 2  # Retries for connection errors, timeouts and RETRY_HTTP_CODES
+RETRY_DELAY = 2.0  # Seconds, doubled for each retry
+QUEUED_REPORT_RETRIES = 3  # Retries for RETRY_LATER_CODES
+QUEUED_REPORT_RETRY_DELAY = float(RETRY_WAIT_TIME)  # Seconds, doubled for each retry
+RETRY_MAX_DELAY = 120.0  # Seconds
+MAX_IN_FLIGHT_REQUESTS = CONCURRENT_VENDORS * CONCURRENT_REPORTS  # Report requests, all vendors
+SMALL_REPORTS_FIRST = True  # False to fetch reports in the order of the selected vendors
+SUPPORTED_REPORTS_TTL = 24  # Hours to use a vendor's cached supported reports for. 0 to always request them
+JSON_ARCHIVE_COMPRESSION = "none"  # "none", "gzip" or "zstd" (needs the zstandard package)
+JSON_ARCHIVE_COMPRESSION_LEVEL = 6  # 1-9 for gzip, 1-22 for zstd
+BUILD_REPORT_MODELS = False
+JSON_BACKEND = "auto"  # One of JSON_BACKENDS
+USE_REPORT_PROCESSES = False
+REPORT_PROCESSES = 0  # 0 for one per CPU core
+PARALLEL_DATABASE_REBUILD = False
+DATABASE_REBUILD_PROCESSES = 0  # 0 for one per CPU core
+# endregion
+
+
+# region Variable Constants for GeneralUtils
+# The JSON parsers that can decode vendor responses. "auto" is the fastest installed parser, in the order listed here
+JSON_BACKENDS = ("auto", "orjson", "simdjson", "ujson", "json")
+# endregion
+
+
+# region Variable Constants for HeadlessFetch
+HEADLESS_EXIT_SUCCESS = 0
+HEADLESS_EXIT_FAILED = 1  # Some vendors or reports failed or were cancelled
+HEADLESS_EXIT_INVALID_ARGUMENTS = 2  # Same as argparse's exit code for usage errors
 # endregion
 
 
@@ -6,7 +6,8 @@ from PyQt5.QtCore import QDate
 
 import GeneralUtils
 from Constants import COUNTER_4_REPORT_EQUIVALENTS, COUNTER_5_REPORT_EQUIVALENTS, MajorReportType
-from FetchData import ReportRow, ReportHeaderModel, TypeValueModel, NameValueModel, ReportWorker
+from FetchData import ReportRow, ReportHeaderModel, TypeValueModel, NameValueModel, ReportWorker, ValuePool, \
+    get_month_index
 from ManageVendors import Vendor
 
 
@@ -35,9 +36,34 @@ class Counter4To5Converter:
         self.begin_date = QDate(date.year(), 1, 1)
         self.end_date = QDate(date.year(), 12, 31)
         self.target_c5_report_types = self.get_c5_equivalent(c4_report_types)
+        self.month_columns = self.get_month_columns()
+        self.value_pool = ValuePool()
 
         self.final_rows_dict = {}
 
+    def get_month_columns(self) -> list:
+        """Returns the month columns of the year, as (supported column headers, month-year, month slot) tuples"""
+        month_index = get_month_index(self.begin_date, self.end_date)
+        year = int(self.begin_date.toString("yyyy"))
+        year2 = int(self.begin_date.toString("yy"))
+        month_columns = []
+        for i in range(0, 12):
+            month = QDate(year, i + 1, 1).toString("MMM")
+            month2 = QDate(year, i + 1, 1).toString("M")
+
+            supported_dates = (
+                f"{month}-{year}",
+                f"{month}-{year2}",
+                f"{year}-{month}",
+                f"{year2}-{month}",
+                f"{month2}/1/{year}",
+                f"{month2}/1/{year2}"
+            )
+            standard_month_year = f"{month}-{year}"
+            month_columns.append((supported_dates, standard_month_year, month_index.slots[standard_month_year]))
+
+        return month_columns
+
     def do_conversion(self) -> dict:
         file_paths = {}
         report_rows_dict = {}  # {report_type: report_rows_dict}
@@ -55,7 +81,9 @@ class Counter4To5Converter:
             c4_customer = c4_report_header.customer
             c4_institution_id = c4_report_header.institution_id
             report_rows = self.c4_model_to_rows(report_model)
-            report_rows_dict[short_c4_report_type] = report_rows
+            # Sorted once here, each C4 report's rows are merged into several C5 reports
+            report_rows_dict[short_c4_report_type] = ReportWorker.sort_rows(
+                report_rows, self.get_c4_major_report_type(short_c4_report_type))
 
         if not c4_report_types_processed:
             raise Exception("No valid COUNTER 4 report selected for this operation")
@@ -64,20 +92,20 @@ class Counter4To5Converter:
         for c5_report_type in self.target_c5_report_types.split(", "):
             required_c4_report_types = self.get_c4_equivalent(c5_report_type).split(", ")
             c4_report_types_used = []
-            c5_report_type_rows = []
+            c4_report_type_rows = []
 
-            # Fill up c5_report_type_rows with rows from required_c4_report_types
+            # Fill up c4_report_type_rows with the sorted rows of required_c4_report_types
             for c4_report_type in required_c4_report_types:
                 if c4_report_type in report_rows_dict:
-                    c5_report_type_rows += report_rows_dict[c4_report_type]
+                    c4_report_type_rows.append(report_rows_dict[c4_report_type])
                     c4_report_types_used.append(c4_report_type)
 
             if not c4_report_types_used:  # If no c4 file for this c5 report type is available
                 continue
 
-            # Sort the rows
+            # Merge the sorted rows
             c5_major_report_type = GeneralUtils.get_major_report_type(c5_report_type)
-            c5_report_type_rows = ReportWorker.sort_rows(c5_report_type_rows, c5_major_report_type)
+            c5_report_type_rows = ReportWorker.merge_sorted_rows(c4_report_type_rows, c5_major_report_type)
 
             # Create header for this report
             c5_report_header = self.get_c5_report_header(c5_report_type,
@@ -311,21 +339,8 @@ class Counter4To5Converter:
                 report_row.total_count = 0
 
         # Month Columns
-        year = int(self.begin_date.toString("yyyy"))
-        year2 = int(self.begin_date.toString("yy"))
-        for i in range(0, 12):
-            month = QDate(year, i + 1, 1).toString("MMM")
-            month2 = QDate(year, i + 1, 1).toString("M")
-
-            supported_dates = [
-                f"{month}-{year}",
-                f"{month}-{year2}",
-                f"{year}-{month}",
-                f"{year2}-{month}",
-                f"{month2}/1/{year}",
-                f"{month2}/1/{year2}"
-            ]
-            standard_month_year = f"{month}-{year}"
+        month_counts = report_row.month_counts.counts
+        for supported_dates, standard_month_year, month_slot in self.month_columns:
             month_value = ""
 
             for date in supported_dates:
@@ -334,11 +349,14 @@ class Counter4To5Converter:
                     break
 
             if month_value:
-                report_row.month_counts[standard_month_year] = int(month_value)
+                month_counts[month_slot] = int(month_value)
             else:
                 message = f"Column header {standard_month_year} not found"
                 raise Exception(message)
 
+        self.value_pool.intern_row(report_row)
+        report_row.sort_key = ReportWorker.get_sort_key(report_row, c4_major_report_type)
+
         return report_row
 
     def get_c5_report_header(self, target_c5_report_type, c4_report_types: str, customer: str,
@@ -8,21 +8,40 @@ The process of fetching reports is made up of these steps:
 4. The model objects are then used to create create row objects that will be in the final TSV file.
 5. The row objects are then sorted by their primary columns, for example, item reports are sorted by the item column.
 6. The sorted rows are then used to create and save a final TSV report file that adheres to the COUNTER 5 standards.
-7. After all reports are processed, the database is updated with the new data
+7. Each yearly report is added to the database as soon as it is saved, by one database writer thread
 
 .. NOTE::
-    All fetch operations are multi-threaded. Each vendor has it's own thread, each report for that vendor
-    also has it's own thread. The maximum concurrent vendors and reports (per vendor) can be changed in the settings tab
-    on the GUI
+    All fetch operations are multi-threaded. Each vendor has it's own thread to request its supported reports, each
+    report also has it's own thread. The reports of all vendors are started from one queue, smallest reports first,
+    by a FetchScheduler. The maximum concurrent vendors, reports (per vendor) and reports (all vendors) can be changed
+    in the settings
 """
 
 from os import path, makedirs
+from urllib.parse import urlsplit
 import csv
+import gzip
+import heapq
+import io
+import codecs
+import os
 import json
+import multiprocessing
+import threading
+import time
+import random
 import requests
 import platform
 import copy
 import ctypes
+from array import array
+from collections.abc import Mapping
+from concurrent.futures import CancelledError, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from operator import attrgetter, itemgetter
+from requests.adapters import HTTPAdapter
+from urllib3 import response as urllib3_response
 
 from PyQt5.QtCore import QObject, QThread, pyqtSignal, QDate, Qt
 from PyQt5.QtGui import QStandardItemModel, QStandardItem
@@ -30,13 +49,19 @@ from PyQt5.QtWidgets import QPushButton, QDialog, QWidget, QProgressBar, QLabel,
     QCheckBox, QDateEdit, QFrame, QHBoxLayout, QSizePolicy, QLineEdit, QListView, QRadioButton, QButtonGroup
 
 import GeneralUtils
+import ManageDB
 from ui import FetchReportsTab, FetchSpecialReportsTab, FetchProgressDialog, ReportResultWidget, VendorResultsWidget
 from GeneralUtils import JsonModel
 from ManageVendors import Vendor
 from Settings import SettingsModel
-from ManageDB import UpdateDatabaseWorker
+from ManageDB import DatabaseWriterWorker
 from Constants import *
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None  # The zstd JSON archive compression is only available if the zstandard package is installed
+
 
 # region Models
 class SupportedReportModel(JsonModel):
@@ -186,66 +211,69 @@ class ReportModel(JsonModel):
         self.exceptions = []
 
     @classmethod
-    def from_json(cls, json_dict: dict):
-        exceptions = ReportModel.process_exceptions(json_dict)
+    def from_json(cls, json_dict: dict, include_report_items: bool = True):
+        """Converts a report JSON dict into a report model
 
-        report_header = ReportHeaderModel.from_json(json_dict["Report_Header"])
-        report_type = report_header.report_id
-        major_report_type = GeneralUtils.get_major_report_type(report_type)
-        report_header.major_report_type = major_report_type
+        :param json_dict: The report's JSON dict
+        :param include_report_items: Also convert the Report_Items. If not, only the header and exceptions are read
+        """
+        report_header, exceptions = ReportModel.process_report_header(json_dict)
+        major_report_type = report_header.major_report_type
 
         report_items = []
-        if "Report_Items" in json_dict:
+        if include_report_items and "Report_Items" in json_dict:
             report_item_dicts = json_dict["Report_Items"]
             if len(report_item_dicts) > 0:
-                if major_report_type == MajorReportType.PLATFORM:
-                    for report_item_dict in report_item_dicts:
-                        report_items.append(PlatformReportItemModel.from_json(report_item_dict))
-
-                elif major_report_type == MajorReportType.DATABASE:
-                    for report_item_dict in report_item_dicts:
-                        report_items.append(DatabaseReportItemModel.from_json(report_item_dict))
-
-                elif major_report_type == MajorReportType.TITLE:
-                    for report_item_dict in report_item_dicts:
-                        report_items.append(TitleReportItemModel.from_json(report_item_dict))
-
-                elif major_report_type == MajorReportType.ITEM:
-                    for report_item_dict in report_item_dicts:
-                        report_items.append(ItemReportItemModel.from_json(report_item_dict))
+                for report_item_dict in report_item_dicts:
+                    report_item = ReportModel.report_item_from_json(major_report_type, report_item_dict)
+                    if report_item is not None: report_items.append(report_item)
 
         report_model = cls(report_header, report_items)
         report_model.exceptions = exceptions
         return report_model
 
+    @staticmethod
+    def report_item_from_json(major_report_type: MajorReportType, json_dict: dict):
+        """Converts a Report_Items JSON dict into the report item model of the major report type
+
+        :param major_report_type: The major report type of the report
+        :param json_dict: The report item's JSON dict
+        """
+        if major_report_type == MajorReportType.PLATFORM:
+            return PlatformReportItemModel.from_json(json_dict)
+        elif major_report_type == MajorReportType.DATABASE:
+            return DatabaseReportItemModel.from_json(json_dict)
+        elif major_report_type == MajorReportType.TITLE:
+            return TitleReportItemModel.from_json(json_dict)
+        elif major_report_type == MajorReportType.ITEM:
+            return ItemReportItemModel.from_json(json_dict)
+
     @classmethod
-    def process_exceptions(cls, json_dict: dict) -> list:
-        """Gets all exception models in a JSON dict, returns them as a list
+    def process_report_header(cls, json_dict: dict, report_header: ReportHeaderModel = None) -> tuple:
+        """Reads the header and all exception models of a report JSON dict, without touching its report items
 
-        :param json_dict: A JSON dict
+        Returns (report_header, exceptions). The Report_Header is only converted once, and the exceptions are checked
+        before any report items are read, so exception-only responses (e.g. 3030 No Usage Available) end here
+
+        :param json_dict: A report JSON dict
+        :param report_header: The report's header if it was already converted, e.g. while streaming the report
         :raises ReportHeaderMissingException: When the report header is missing
         :raises RetryLaterException: When a retry later exception model is received
         :raises UnacceptableCodeException: When the report cannot be processed based on the exception code
         """
-        exceptions = []
-
-        if "Exception" in json_dict:
-            exceptions.append(ExceptionModel.from_json(json_dict["Exception"]))
+        exceptions = get_exception_models(json_dict)
 
-        code = int(json_dict["Code"]) if "Code" in json_dict else ""
-        message = json_dict["Message"] if "Message" in json_dict else ""
-        data = json_dict["Data"] if "Data" in json_dict else ""
-        severity = json_dict["Severity"] if "Severity" in json_dict else ""
-        if code:
-            exceptions.append(ExceptionModel(code, message, severity, data))
+        if "Report_Header" not in json_dict:
+            # Queued reports are usually sent without a header
+            for exception in exceptions:
+                if exception.code in RETRY_LATER_CODES:
+                    raise RetryLaterException(exceptions)
+            raise ReportHeaderMissingException(exceptions)
 
-        if "Report_Header" in json_dict:
+        if report_header is None:
             report_header = ReportHeaderModel.from_json(json_dict["Report_Header"])
-            if len(report_header.exceptions) > 0:
-                for exception in report_header.exceptions:
-                    exceptions.append(exception)
-        else:
-            raise ReportHeaderMissingException(exceptions)
+            report_header.major_report_type = GeneralUtils.get_major_report_type(report_header.report_id)
+        exceptions += report_header.exceptions
 
         for exception in exceptions:
             if exception.code in RETRY_LATER_CODES:
@@ -253,7 +281,18 @@ class ReportModel(JsonModel):
             elif exception.code not in ACCEPTABLE_CODES:
                 raise UnacceptableCodeException(exceptions)
 
-        return exceptions
+        return report_header, exceptions
+
+    @classmethod
+    def process_exceptions(cls, json_dict: dict) -> list:
+        """Gets all exception models in a JSON dict, returns them as a list
+
+        :param json_dict: A JSON dict
+        :raises ReportHeaderMissingException: When the report header is missing
+        :raises RetryLaterException: When a retry later exception model is received
+        :raises UnacceptableCodeException: When the report cannot be processed based on the exception code
+        """
+        return cls.process_report_header(json_dict)[1]
 
 
 class PlatformReportItemModel(JsonModel):
@@ -454,11 +493,186 @@ class ItemReportItemModel(JsonModel):
 # endregion
 
 
+# region Streaming JSON
+class ReportJsonStreamParser:
+    """Incrementally parses a SUSHI report JSON document from text chunks
+
+    The report items in the top level Report_Items list are returned one at a time as soon as they're complete, so
+    only the unparsed part of the document is kept in memory. All other top level members are collected in json_value.
+    A document that isn't a JSON object is only parsed once it's complete.
+    """
+    _START = 0
+    _MEMBERS = 1
+    _REPORT_ITEMS = 2
+    _DONE = 3
+    _NOT_OBJECT = 4
+
+    _WHITESPACE = " \t\n\r"
+    _COMPACT_SIZE = 1 << 16
+
+    def __init__(self):
+        self.json_value = {}  # The parsed document without Report_Items
+        self.buffer = ""
+        self.position = 0
+        self.state = self._START
+        self.decoder = json.JSONDecoder()
+
+    def feed(self, text: str) -> list:
+        """Parses a chunk of the document, returns the report item dicts completed by this chunk
+
+        :param text: The next chunk of the document
+        """
+        self.buffer += text
+        return self.parse(False)
+
+    def close(self) -> list:
+        """Parses the rest of the document, returns the remaining report item dicts
+
+        :raises json.JSONDecodeError: When the document is incomplete or invalid
+        """
+        return self.parse(True)
+
+    def parse(self, is_final: bool) -> list:
+        """Parses as much of the buffered document as possible
+
+        :param is_final: If the whole document has been received
+        """
+        report_item_dicts = []
+        buffer = self.buffer
+        position = self.position
+
+        while self.state != self._NOT_OBJECT:
+            position = self.skip_whitespace(buffer, position)
+            if position >= len(buffer): break
+            char = buffer[position]
+
+            if self.state == self._START:
+                if char != "{":
+                    self.state = self._NOT_OBJECT
+                    break
+                position += 1
+                self.state = self._MEMBERS
+
+            elif self.state == self._MEMBERS:
+                if char == "}":
+                    position += 1
+                    self.state = self._DONE
+                    continue
+                if char == ",":
+                    position += 1
+                    continue
+
+                member = self.parse_member(buffer, position, is_final)
+                if member is None: break
+                key, value, position = member
+                if key == "Report_Items" and value is None:
+                    self.state = self._REPORT_ITEMS
+                else:
+                    self.json_value[key] = value
+
+            elif self.state == self._REPORT_ITEMS:
+                if char == "]":
+                    position += 1
+                    self.state = self._MEMBERS
+                    continue
+                if char == ",":
+                    position += 1
+                    continue
+
+                decoded_value = self.decode_value(buffer, position, is_final)
+                if decoded_value is None: break
+                report_item_dict, position = decoded_value
+                report_item_dicts.append(report_item_dict)
+
+            else:
+                if is_final: raise json.JSONDecodeError("Extra data", buffer, position)
+                break
+
+        if self.state == self._NOT_OBJECT:
+            if is_final: self.json_value = json.loads(buffer)
+        elif is_final and self.state != self._DONE:
+            raise json.JSONDecodeError("Expecting value" if self.state == self._START else "Unexpected end of data",
+                                       buffer, position)
+
+        # Drop the parsed part of the buffer
+        if position >= self._COMPACT_SIZE and self.state != self._NOT_OBJECT:
+            buffer = buffer[position:]
+            position = 0
+        self.buffer = buffer
+        self.position = position
+
+        return report_item_dicts
+
+    def parse_member(self, buffer: str, position: int, is_final: bool):
+        """Parses a top level "key": value pair, returns (key, value, end_position) or None if more data is needed
+
+        The value of Report_Items is returned as None when it's a list, the position is then at the start of the list
+
+        :param buffer: The buffered document
+        :param position: The position of the key
+        :param is_final: If the whole document has been received
+        """
+        if buffer[position] != '"':
+            raise json.JSONDecodeError("Expecting property name enclosed in double quotes", buffer, position)
+
+        decoded_key = self.decode_value(buffer, position, is_final)
+        if decoded_key is None: return None
+        key, position = decoded_key
+
+        position = self.skip_whitespace(buffer, position)
+        if position >= len(buffer):
+            if is_final: raise json.JSONDecodeError("Expecting ':' delimiter", buffer, position)
+            return None
+        if buffer[position] != ":": raise json.JSONDecodeError("Expecting ':' delimiter", buffer, position)
+
+        position = self.skip_whitespace(buffer, position + 1)
+        if position >= len(buffer):
+            if is_final: raise json.JSONDecodeError("Expecting value", buffer, position)
+            return None
+        if key == "Report_Items" and buffer[position] == "[":
+            return key, None, position + 1
+
+        decoded_value = self.decode_value(buffer, position, is_final)
+        if decoded_value is None: return None
+        value, position = decoded_value
+
+        return key, value, position
+
+    def decode_value(self, buffer: str, position: int, is_final: bool):
+        """Decodes the JSON value at a position, returns (value, end_position) or None if more data is needed
+
+        :param buffer: The buffered document
+        :param position: The position of the value
+        :param is_final: If the whole document has been received
+        """
+        try:
+            value, end_position = self.decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if is_final: raise
+            return None
+
+        # A number or literal at the end of the buffer may continue in the next chunk, e.g. "1." of "1.5"
+        if not is_final and buffer[end_position - 1] not in '"]}' \
+                and not buffer[end_position:].lstrip("0123456789+-.eE"):
+            return None
+
+        return value, end_position
+
+    @classmethod
+    def skip_whitespace(cls, buffer: str, position: int) -> int:
+        while position < len(buffer) and buffer[position] in cls._WHITESPACE:
+            position += 1
+        return position
+# endregion
+
+
 # region Custom Exceptions
 class RetryLaterException(Exception):
     """An exception raised when a retry later exception code is received in an exception model"""
     def __init__(self, exceptions: list):
         self.exceptions = exceptions
+        self.retry_after = None  # Seconds, from the response's Retry-After header
+        self.shard_index = None  # The date range shard that received it, when raised by a report process
 
 
 class ReportHeaderMissingException(Exception):
@@ -471,6 +685,17 @@ class UnacceptableCodeException(Exception):
     """An exception raised when a report cannot be processed based on an exception code"""
     def __init__(self, exceptions: list):
         self.exceptions = exceptions
+
+
+class RequestFailedException(Exception):
+    """An exception raised when a request fails before a usable response is received"""
+    def __init__(self, message: str):
+        super().__init__(message)
+        self.message = message
+
+
+class RequestCancelledException(Exception):
+    """An exception raised when a worker is cancelled before its request is sent"""
 # endregion
 
 
@@ -487,6 +712,41 @@ def exception_models_to_message(exceptions: list) -> str:
     return message
 
 
+def get_exception_models(json_dict: dict) -> list:
+    """Returns the exception models sent outside of a report header, as an Exception object or as the Code, Message,
+    Severity and Data of the response itself
+
+    :param json_dict: A JSON response dict
+    """
+    exceptions = []
+
+    if "Exception" in json_dict:
+        exceptions.append(ExceptionModel.from_json(json_dict["Exception"]))
+
+    code = int(json_dict["Code"]) if "Code" in json_dict else ""
+    message = json_dict["Message"] if "Message" in json_dict else ""
+    data = json_dict["Data"] if "Data" in json_dict else ""
+    severity = json_dict["Severity"] if "Severity" in json_dict else ""
+    if code:
+        exceptions.append(ExceptionModel(code, message, severity, data))
+
+    return exceptions
+
+
+def add_unique_exceptions(exceptions: list, new_exceptions: list):
+    """Adds exception models to a list, skipping the ones that are already in the list
+
+    :param exceptions: The list to add to
+    :param new_exceptions: The exception models to add
+    """
+    exception_keys = set((exception.code, exception.message, exception.data) for exception in exceptions)
+    for exception in new_exceptions:
+        exception_key = exception.code, exception.message, exception.data
+        if exception_key not in exception_keys:
+            exception_keys.add(exception_key)
+            exceptions.append(exception)
+
+
 def get_models(model_key: str, model_type, json_dict: dict) -> list:
     """This converts json lists into a list of the specified SUSHI model type
 
@@ -494,19 +754,533 @@ def get_models(model_key: str, model_type, json_dict: dict) -> list:
     :param model_type: The target model type, e.g PerformanceModel
     :param json_dict: The JSON dict to get the list from
     """
+    return [model_type.from_json(model_dict) for model_dict in get_json_dicts(model_key, json_dict)]
+
+
+def get_json_dicts(key: str, json_dict: dict) -> list:
+    """Returns a list of JSON dicts in a JSON dict, or an empty list if the key is missing
+
+    :param key: The target key to get the list of JSONObjects
+    :param json_dict: The JSON dict to get the list from
+    """
     # Some vendors sometimes return a single dict even when the standard specifies a list,
     # we need to check for that
-    models = []
-    if model_key in json_dict and json_dict[model_key] is not None:
-        if type(json_dict[model_key]) is list:
-            model_dicts = json_dict[model_key]
-            for model_dict in model_dicts:
-                models.append(model_type.from_json(model_dict))
+    json_value = json_dict[key] if key in json_dict else None
+    if type(json_value) is list:
+        return json_value
+    elif type(json_value) is dict:
+        return [json_value]
+
+    return []
+
+
+# region Report Processes
+_report_process_pool = None
+_report_process_pool_lock = threading.Lock()
+
+
+def get_report_process_pool(max_workers: int) -> ProcessPoolExecutor:
+    """Returns the shared pool of report processes, starting it if needed
+
+    The processes are spawned rather than forked, forking a process that runs Qt threads isn't safe. They share the
+    database write lock, so they take turns with the fetch's database writer to add reports to the database
+
+    :param max_workers: The number of report processes, 0 for one per CPU core
+    """
+    global _report_process_pool
+    with _report_process_pool_lock:
+        if _report_process_pool is None:
+            _report_process_pool = ProcessPoolExecutor(max_workers if max_workers > 0 else None,
+                                                       multiprocessing.get_context("spawn"),
+                                                       initializer=ManageDB.set_database_write_lock,
+                                                       initargs=(ManageDB.database_write_lock,))
+
+        return _report_process_pool
+
+
+def shutdown_report_process_pool():
+    """Stops the shared report processes once their reports are done, without waiting for them"""
+    global _report_process_pool
+    with _report_process_pool_lock:
+        process_pool = _report_process_pool
+        _report_process_pool = None
+
+    if process_pool is not None: process_pool.shutdown(wait=False)
+# endregion
+
+
+# region Connection Pooling
+_vendor_sessions = {}  # <k = (scheme, host), v = requests.Session>
+_vendor_sessions_lock = threading.Lock()
+
+
+def get_accept_encoding() -> str:
+    """Returns the Accept-Encoding header value listing every content encoding that responses can be decoded from
+
+    gzip and deflate are always listed, br if the brotli (or brotlicffi) package is installed and zstd if a zstd
+    package is installed that urllib3 can decode with.
+    """
+    encodings = ["gzip", "deflate"]
+    if getattr(urllib3_response, "brotli", None) is not None: encodings.append("br")
+    if getattr(urllib3_response, "HAS_ZSTD", False): encodings.append("zstd")
+    return ", ".join(encodings)
+
+
+def get_vendor_session(base_url: str, pool_size: int = CONNECTION_POOL_SIZE) -> requests.Session:
+    """Returns the shared keep-alive session for the host of a vendor's base URL
+
+    Every request to the same host reuses the connections kept alive in this session's pool instead of opening a new
+    TCP+TLS connection for each request. Sessions are created on first use and shared between threads.
+
+    :param base_url: The vendor's base URL
+    :param pool_size: The max number of connections to keep alive for this host
+    """
+    url_parts = urlsplit(base_url)
+    session_key = url_parts.scheme.lower(), url_parts.netloc.lower()
+
+    with _vendor_sessions_lock:
+        session = _vendor_sessions.get(session_key)
+        if session is None:
+            session = requests.Session()
+            session.headers["Accept-Encoding"] = get_accept_encoding()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(pool_size, 1))
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _vendor_sessions[session_key] = session
+
+    return session
+
+
+def close_vendor_sessions():
+    """Closes all shared vendor sessions, dropping their kept-alive connections"""
+    with _vendor_sessions_lock:
+        sessions = list(_vendor_sessions.values())
+        _vendor_sessions.clear()
+
+    for session in sessions:
+        session.close()
+# endregion
+
+
+# region Rate Limiting
+class TokenBucket:
+    """A thread-safe token bucket that limits how often requests can be sent
 
-        elif type(json_dict[model_key]) is dict:
-            models.append(model_type.from_json(json_dict[model_key]))
+    Tokens are refilled continuously at the bucket's rate, up to its burst size. A caller only waits when no token is
+    left, for exactly as long as it takes for its token to be refilled.
 
-    return models
+    :param rate: The number of tokens refilled per second, 0 for no limit
+    :param burst: The max number of tokens that can be saved up
+    """
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.tokens = float(self.burst)
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Takes a token and returns the number of seconds to wait before it can be used"""
+        if self.rate <= 0: return 0
+
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.last_refill) * self.rate)
+            self.last_refill = now
+            self.tokens -= 1  # Negative tokens are reserved by callers that are still waiting
+
+            return -self.tokens / self.rate if self.tokens < 0 else 0
+
+
+_rate_limiters = {}  # <k = vendor_name, None for the global limit, v = TokenBucket>
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(key, rate: float, burst: int) -> TokenBucket:
+    """Returns the shared token bucket for a key, creating it on first use
+
+    :param key: The vendor name, None for the limiter shared by all vendors
+    :param rate: The max requests per second
+    :param burst: The max requests that can be sent back to back
+    """
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(key)
+        if limiter is None:
+            limiter = TokenBucket(rate, burst)
+            _rate_limiters[key] = limiter
+
+    return limiter
+
+
+def wait_for_request_slot(vendor_name: str, settings: SettingsModel, is_cancelled=None) -> bool:
+    """Blocks the calling thread until the vendor and global rate limits allow a request to be sent
+
+    :param vendor_name: The vendor the request is sent to
+    :param settings: The user's settings
+    :param is_cancelled: An optional callable that stops the wait early when it returns True
+    :returns: False if the wait was cancelled
+    """
+    vendor_rate = settings.request_rate
+    if vendor_rate <= 0 < settings.request_interval: vendor_rate = 1 / settings.request_interval
+
+    wait_time = get_rate_limiter(vendor_name, vendor_rate, settings.request_burst).reserve()
+    wait_time = max(wait_time, get_rate_limiter(None, settings.global_request_rate, settings.request_burst).reserve())
+
+    return sleep_unless_cancelled(wait_time, is_cancelled)
+
+
+def sleep_unless_cancelled(seconds: float, is_cancelled=None) -> bool:
+    """Blocks the calling thread for a number of seconds, checking regularly if the wait was cancelled
+
+    :param seconds: The time to wait
+    :param is_cancelled: An optional callable that stops the wait early when it returns True
+    :returns: False if the wait was cancelled
+    """
+    end_time = time.monotonic() + seconds
+    while seconds > 0:
+        if is_cancelled is not None and is_cancelled(): return False
+        time.sleep(min(seconds, 0.25))
+        seconds = end_time - time.monotonic()
+
+    return is_cancelled is None or not is_cancelled()
+
+
+def reset_rate_limiters():
+    """Discards all rate limiters so the next fetch starts with full buckets and the current settings"""
+    with _rate_limiters_lock:
+        _rate_limiters.clear()
+# endregion
+
+
+# region Shared Fetch State
+_active_fetch_count = 0  # The running fetches, e.g. of the fetch and special fetch tabs, that share the state
+_active_fetch_count_lock = threading.Lock()
+
+
+def start_shared_fetch():
+    """Registers a fetch that uses the shared vendor sessions, rate limiters and report processes"""
+    global _active_fetch_count
+    with _active_fetch_count_lock:
+        _active_fetch_count += 1
+
+
+def finish_shared_fetch():
+    """Unregisters a fetch, closing the shared vendor sessions, rate limiters and report processes once no other fetch
+    is running, so a fetch that finishes never resets the rate limits of one that is still running"""
+    global _active_fetch_count
+    with _active_fetch_count_lock:
+        _active_fetch_count = max(_active_fetch_count - 1, 0)
+        if _active_fetch_count > 0: return
+
+        close_vendor_sessions()
+        reset_rate_limiters()
+        shutdown_report_process_pool()
+# endregion
+
+
+# region Retrying
+class RetryPolicy:
+    """Decides how long to wait before retrying a request, using exponential backoff with jitter
+
+    The wait doubles with each retry, up to max_delay, and a random half of it is skipped so workers that failed at the
+    same time don't all retry at the same time. A server's Retry-After time is used instead when one is received.
+
+    :param max_retries: The max number of retries
+    :param base_delay: The average wait before the first retry (seconds)
+    :param max_delay: The longest wait before a retry (seconds)
+    """
+    def __init__(self, max_retries: int, base_delay: float, max_delay: float):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def get_delay(self, retry_number: int, retry_after: float = None):
+        """Returns the seconds to wait before a retry, or None if the request should not be retried
+
+        :param retry_number: The number of this retry, starting at 1
+        :param retry_after: The wait requested by the server in a Retry-After header
+        """
+        if retry_number > self.max_retries: return None
+
+        if retry_after is not None:
+            return retry_after if retry_after <= self.max_delay else None  # Don't retry before the server is ready
+
+        delay = min(self.base_delay * 2 ** (retry_number - 1), self.max_delay)
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    @staticmethod
+    def parse_retry_after(response: requests.Response):
+        """Returns the seconds to wait from a response's Retry-After header, or None if it has none
+
+        :param response: The received response
+        """
+        retry_after = response.headers.get("Retry-After", "").strip()
+        if not retry_after: return None
+        if retry_after.isdigit(): return float(retry_after)
+
+        try:
+            retry_date = parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            return None
+        if retry_date.tzinfo is None: retry_date = retry_date.replace(tzinfo=timezone.utc)
+
+        return max((retry_date - datetime.now(timezone.utc)).total_seconds(), 0)
+
+
+def get_request_retry_policy(settings: SettingsModel) -> RetryPolicy:
+    """Returns the retry policy for transport errors and retryable HTTP status codes
+
+    :param settings: The user's settings
+    """
+    return RetryPolicy(settings.request_retries, settings.retry_delay, settings.retry_max_delay)
+
+
+def get_queued_report_retry_policy(settings: SettingsModel) -> RetryPolicy:
+    """Returns the retry policy for reports that the vendor has not finished preparing (RETRY_LATER_CODES)
+
+    :param settings: The user's settings
+    """
+    return RetryPolicy(settings.queued_report_retries, settings.queued_report_retry_delay, settings.retry_max_delay)
+
+
+def send_sushi_request(session: requests.Session, request_url: str, request_query: dict, settings: SettingsModel,
+                       vendor_name: str, is_cancelled=None, stream: bool = False) -> requests.Response:
+    """Sends a GET request to a vendor's SUSHI server, waiting for the rate limits before every attempt
+
+    Transport errors and RETRY_HTTP_CODES are retried according to the request retry policy. The last response is
+    returned whatever its status code.
+
+    :param session: The vendor's session
+    :param request_url: The URL of the request
+    :param request_query: The query parameters of the request
+    :param settings: The user's settings
+    :param vendor_name: The vendor's name
+    :param is_cancelled: An optional callable that stops the request early when it returns True
+    :param stream: Only download the response's body when it's read
+    :raises RequestCancelledException: When cancelled before a response is received
+    :raises requests.exceptions.RequestException: When the last attempt fails
+    """
+    retry_policy = get_request_retry_policy(settings)
+    retry_number = 0
+    while True:
+        if not wait_for_request_slot(vendor_name, settings, is_cancelled): raise RequestCancelledException()
+
+        retry_number += 1
+        try:
+            # Some vendors only work if they think a web browser is making the request...
+            response = session.get(request_url, params=request_query, headers={'User-Agent': settings.user_agent},
+                                   timeout=settings.request_timeout, stream=stream)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            delay = retry_policy.get_delay(retry_number)
+            if delay is None: raise
+            reason = str(e)
+        else:
+            if response.status_code not in RETRY_HTTP_CODES: return response
+            delay = retry_policy.get_delay(retry_number, RetryPolicy.parse_retry_after(response))
+            if delay is None: return response
+            response.close()
+            reason = f"HTTP status code {response.status_code}"
+
+        if settings.show_debug_messages: print(f"{vendor_name}: {reason}, retrying in {delay:.1f} seconds...")
+        if not sleep_unless_cancelled(delay, is_cancelled): raise RequestCancelledException()
+# endregion
+
+
+# region Scheduling
+class FetchScheduler:
+    """Starts queued fetch tasks in priority order, keeping the number of tasks in flight under a global and a
+    per-vendor limit, and the number of vendors with tasks in flight under a vendor limit
+
+    Tasks are started as soon as a slot is free, so the slots freed by one vendor go to the pending tasks of other
+    vendors. Tasks are queued, started and finished from the main thread, extra slots for a task in flight can be
+    taken from any thread with take_slots.
+
+    :param max_in_flight: The max number of tasks in flight, across all vendors
+    :param max_per_vendor: The max number of tasks in flight, per vendor
+    :param max_vendors: The max number of vendors with tasks in flight, 0 for no limit
+    """
+    def __init__(self, max_in_flight: int, max_per_vendor: int, max_vendors: int = 0):
+        self.max_in_flight = max(max_in_flight, 1)
+        self.max_per_vendor = max(max_per_vendor, 1)
+        self.max_vendors = max_vendors
+        self.pending_tasks = []  # Heap of (priority, sequence, vendor_name, start_task)
+        self.in_flight = {}  # <k = vendor_name, v = number of tasks in flight>
+        self.in_flight_count = 0
+        self.sequence = 0
+        self.lock = threading.Lock()
+
+    def add_task(self, vendor_name: str, priority: tuple, start_task):
+        """Queues a task, it is started by start_tasks once a slot is free
+
+        :param vendor_name: The vendor that the task sends requests to
+        :param priority: The task's priority, lowest first. Tasks with the same priority are started in queued order
+        :param start_task: A callable that starts the task. task_finished must be called when the task is done
+        """
+        heapq.heappush(self.pending_tasks, (priority, self.sequence, vendor_name, start_task))
+        self.sequence += 1
+
+    def task_finished(self, vendor_name: str, slot_count: int = 1):
+        """Frees the slots of a finished task and starts the next pending tasks
+
+        :param vendor_name: The vendor of the finished task
+        :param slot_count: The number of slots the task had, its own slot and the ones it took with take_slots
+        """
+        with self.lock:
+            self.in_flight[vendor_name] -= slot_count
+            if self.in_flight[vendor_name] == 0: self.in_flight.pop(vendor_name)
+            self.in_flight_count -= slot_count
+        self.start_tasks()
+
+    def take_slots(self, vendor_name: str, count: int) -> int:
+        """Takes up to count free slots for a vendor's task in flight, returning the number of slots taken
+
+        This is used to fetch the date range shards of a report concurrently within the global and per-vendor limits.
+        The slots are freed with the task, see task_finished
+
+        :param vendor_name: The vendor of the task
+        :param count: The number of slots wanted
+        """
+        with self.lock:
+            count = min(count, self.max_in_flight - self.in_flight_count,
+                        self.max_per_vendor - self.in_flight.get(vendor_name, 0))
+            if count <= 0: return 0
+
+            self.in_flight[vendor_name] += count
+            self.in_flight_count += count
+            return count
+
+    def start_tasks(self):
+        """Starts the highest priority pending tasks that fit in the free slots"""
+        held_tasks = []  # Tasks of vendors that are at their limit, or that would go over the vendor limit
+        with self.lock:
+            while len(self.pending_tasks) > 0 and self.in_flight_count < self.max_in_flight:
+                task = heapq.heappop(self.pending_tasks)
+                priority, sequence, vendor_name, start_task = task
+                vendor_in_flight = self.in_flight.get(vendor_name, 0)
+                if vendor_in_flight >= self.max_per_vendor or \
+                        (vendor_in_flight == 0 and 0 < self.max_vendors <= len(self.in_flight)):
+                    held_tasks.append(task)
+                    continue
+
+                self.in_flight[vendor_name] = vendor_in_flight + 1
+                self.in_flight_count += 1
+                start_task()
+
+            for task in held_tasks:
+                heapq.heappush(self.pending_tasks, task)
+
+    def has_tasks(self, vendor_name: str) -> bool:
+        """Checks if a vendor has tasks that are pending or in flight
+
+        :param vendor_name: The vendor's name
+        """
+        if vendor_name in self.in_flight: return True
+        for task in self.pending_tasks:
+            if task[2] == vendor_name: return True
+        return False
+
+    def cancel_pending_tasks(self) -> set:
+        """Removes all pending tasks, returning the names of the vendors whose tasks were removed"""
+        vendor_names = set(task[2] for task in self.pending_tasks)
+        self.pending_tasks = []
+        return vendor_names
+
+
+def get_report_size_rank(report_type: str) -> int:
+    """Ranks a report type by the usual size of its response, smallest first
+
+    :param report_type: The report type
+    """
+    return REPORT_SIZE_ORDER.index(report_type) + 1 if report_type in REPORT_SIZE_ORDER else 0
+# endregion
+
+
+# region JSON Archive
+def open_archived_json_file(file_path: str, compression: str = JSON_ARCHIVE_COMPRESSION,
+                            compression_level: int = JSON_ARCHIVE_COMPRESSION_LEVEL):
+    """Opens a raw JSON file in the archive for writing text, compressing it on the fly
+
+    The file extension of the compression is added to file_path. Copies of the file saved with other compressions are
+    removed. Falls back to gzip if zstd is selected but the zstandard package is not installed. The file is a
+    GeneralUtils.AtomicFile that is synced to disk at the end of the fetch.
+
+    :param file_path: The path of the uncompressed JSON file
+    :param compression: The compression to use, one of JSON_ARCHIVE_EXTENSIONS
+    :param compression_level: The compression level, higher is smaller but slower
+    """
+    if compression == "zstd" and zstandard is None: compression = "gzip"
+    if compression not in JSON_ARCHIVE_EXTENSIONS: compression = "none"
+
+    for other_compression, extension in JSON_ARCHIVE_EXTENSIONS.items():
+        if other_compression != compression and path.isfile(file_path + extension):
+            os.remove(file_path + extension)
+
+    file_path += JSON_ARCHIVE_EXTENSIONS[compression]
+    if compression == "gzip":
+        return GeneralUtils.AtomicFile(file_path, 'wt', gzip.open, True, encoding="utf-8",
+                                       compresslevel=min(max(compression_level, 1), 9))
+    elif compression == "zstd":
+        compressor = zstandard.ZstdCompressor(level=compression_level)
+
+        def open_zstd_file(temp_file_path: str, mode: str):
+            return io.TextIOWrapper(compressor.stream_writer(open(temp_file_path, mode)), encoding="utf-8")
+
+        return GeneralUtils.AtomicFile(file_path, 'wb', open_zstd_file, True)
+    else:
+        return GeneralUtils.AtomicFile(file_path, 'w', sync_later=True, encoding="utf-8")
+
+
+def read_archived_json(file_path: str) -> str:
+    """Returns the text of a raw JSON file in the archive, whatever compression it was saved with
+
+    :param file_path: The path of the file, with or without its compression's file extension
+    :raises FileNotFoundError: When there is no such file
+    """
+    if not path.isfile(file_path):
+        for extension in JSON_ARCHIVE_EXTENSIONS.values():
+            if path.isfile(file_path + extension):
+                file_path += extension
+                break
+
+    if file_path.endswith(JSON_ARCHIVE_EXTENSIONS["gzip"]):
+        json_file = gzip.open(file_path, 'rt', encoding="utf-8")
+    elif file_path.endswith(JSON_ARCHIVE_EXTENSIONS["zstd"]):
+        if zstandard is None: raise ImportError(f"The zstandard package is needed to read {file_path}")
+        json_file = io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(open(file_path, 'rb')),
+                                     encoding="utf-8")
+    else:
+        json_file = open(file_path, 'r', encoding="utf-8")
+
+    with json_file:
+        return json_file.read()
+
+
+def get_archived_json_files(year: int = None, vendor_name: str = None,
+                            archive_dir: str = JSON_ARCHIVE_FILE_DIR) -> list:
+    """Returns the paths of the raw JSON files in the archive, optionally only those of one year or vendor
+
+    The files can be read with read_archived_json
+
+    :param year: Only return the files of this year
+    :param vendor_name: Only return the files of this vendor
+    :param archive_dir: The directory of the archive
+    """
+    file_paths = []
+    for root, dirs, files in os.walk(archive_dir):
+        dirs.sort()
+        relative_dirs = path.relpath(root, archive_dir).split(os.sep)
+        if len(relative_dirs) != 2: continue  # Files are saved as {year}/{vendor}/{file}
+
+        dir_year, dir_vendor_name = relative_dirs
+        if year is not None and dir_year != str(year): continue
+        if vendor_name is not None and dir_vendor_name != vendor_name: continue
+
+        for file_name in sorted(files):
+            if any(file_name.endswith(".json" + extension) for extension in JSON_ARCHIVE_EXTENSIONS.values()):
+                file_paths.append(path.join(root, file_name))
+
+    return file_paths
+# endregion
 
 
 def get_month_years(begin_date: QDate, end_date: QDate) -> list:
@@ -546,22 +1320,153 @@ class SpecialReportOptions:
         self.include_parent_details = False, SpecialOptionType.POB, None, None
 
 
-class ReportRow:
-    """This models a row in the generated report, it contains every possible column
+class MonthIndex:
+    """The month columns of a date range, with the position of each month in the counts of a report row
 
-    :param begin_date: The begin date of the request, used to populate the month columns in the report
-    :param end_date: The end date of the request, used to populate the month columns in the report
+    Month indexes are shared by all rows of the same date range, see get_month_index
+
+    :param begin_date: The begin date of the date range
+    :param end_date: The end date of the date range
     """
+    __slots__ = ("month_years", "slots", "zero_counts", "period_slots")
+
     def __init__(self, begin_date: QDate, end_date: QDate):
-        self.database = ""
-        self.title = ""
-        self.item = ""
-        self.publisher = ""
-        self.publisher_id = ""
-        self.platform = ""
-        self.authors = ""
-        self.publication_date = ""
-        self.article_version = ""
+        self.month_years = tuple(get_month_years(begin_date, end_date))
+        self.slots = {month_year: slot for slot, month_year in enumerate(self.month_years)}
+        self.zero_counts = array("q", bytes(8 * len(self.month_years)))
+        self.period_slots = {}  # <k = Begin_Date string from a report, v = slot>
+
+    def get_period_slot(self, period_begin_date: str) -> int:
+        """Returns the slot of a report period's month, raising KeyError if the month is not in this date range
+
+        Each Begin_Date string is only parsed once, reports repeat the same few dates for every report item
+
+        :param period_begin_date: The Begin_Date (yyyy-MM-dd) of a report item's performance period
+        """
+        slot = self.period_slots.get(period_begin_date)
+        if slot is None:
+            month_year = QDate.fromString(period_begin_date, "yyyy-MM-dd").toString("MMM-yyyy")
+            slot = self.slots[month_year]
+            self.period_slots[period_begin_date] = slot
+
+        return slot
+
+
+_month_indexes = {}  # <k = (begin month, end month), v = MonthIndex>
+_month_indexes_lock = threading.Lock()
+
+
+def get_month_index(begin_date: QDate, end_date: QDate) -> MonthIndex:
+    """Returns the shared month index of a date range
+
+    :param begin_date: The begin date of the date range
+    :param end_date: The end date of the date range
+    """
+    key = begin_date.year(), begin_date.month(), end_date.year(), end_date.month()
+    month_index = _month_indexes.get(key)
+    if month_index is None:
+        with _month_indexes_lock:
+            month_index = _month_indexes.setdefault(key, MonthIndex(begin_date, end_date))
+
+    return month_index
+
+
+class MonthCounts(Mapping):
+    """The count of each month column of a report row, stored in an array ordered like get_month_years
+
+    This works like a dict of month-year (MMM-yyyy) strings to counts, with a fixed set of months
+
+    :param month_index: The month index of the row's date range
+    :param counts: The counts, in month order. All zeros if not set
+    """
+    __slots__ = ("month_index", "counts")
+
+    def __init__(self, month_index: MonthIndex, counts: array = None):
+        self.month_index = month_index
+        self.counts = counts if counts is not None else array("q", month_index.zero_counts)
+
+    def __getitem__(self, month_year: str) -> int:
+        return self.counts[self.month_index.slots[month_year]]
+
+    def __setitem__(self, month_year: str, count: int):
+        self.counts[self.month_index.slots[month_year]] = count
+
+    def __iter__(self):
+        return iter(self.month_index.month_years)
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def __repr__(self) -> str:
+        return f"MonthCounts({dict(self.items())})"
+
+    def keys(self):
+        return self.month_index.month_years
+
+    def values(self):
+        return self.counts
+
+    def items(self):
+        return zip(self.month_index.month_years, self.counts)
+
+    def copy(self):
+        """Returns a copy of these month counts that can be changed separately"""
+        return MonthCounts(self.month_index, array("q", self.counts))
+
+    def add_counts(self, month_counts):
+        """Adds the counts of other month counts to these
+
+        :param month_counts: The month counts to add, usually of the same date range
+        """
+        if month_counts.month_index is self.month_index:
+            counts = self.counts
+            for slot, count in enumerate(month_counts.counts):
+                if count: counts[slot] += count
+        else:
+            for month_year, count in month_counts.items():
+                self[month_year] += count
+
+
+class ReportRow:
+    """This models a row in the generated report, it contains every possible column
+
+    The columns are slots and the month counts are an array, to keep the many rows of large reports small
+
+    :param begin_date: The begin date of the request, used to populate the month columns in the report
+    :param end_date: The end date of the request, used to populate the month columns in the report
+    """
+    __slots__ = ("database", "title", "item", "publisher", "publisher_id", "platform", "authors", "publication_date",
+                  "article_version", "doi", "proprietary_id", "online_issn", "print_issn", "linking_issn", "isbn",
+                  "uri", "parent_title", "parent_authors", "parent_publication_date", "parent_article_version",
+                  "parent_data_type", "parent_doi", "parent_proprietary_id", "parent_online_issn", "parent_print_issn",
+                  "parent_linking_issn", "parent_isbn", "parent_uri", "component_title", "component_authors",
+                  "component_publication_date", "component_data_type", "component_doi", "component_proprietary_id",
+                  "component_online_issn", "component_print_issn", "component_linking_issn", "component_isbn",
+                  "component_uri", "data_type", "section_type", "yop", "access_type", "access_method", "metric_type",
+                  "total_count", "month_counts", "sort_key")
+    VALUE_FIELDS = ("database", "title", "item", "publisher", "publisher_id", "platform", "authors", "publication_date",
+                    "article_version", "doi", "proprietary_id", "online_issn", "print_issn", "linking_issn", "isbn",
+                    "uri", "parent_title", "parent_authors", "parent_publication_date", "parent_article_version",
+                    "parent_data_type", "parent_doi", "parent_proprietary_id", "parent_online_issn",
+                    "parent_print_issn", "parent_linking_issn", "parent_isbn", "parent_uri", "component_title",
+                    "component_authors", "component_publication_date", "component_data_type", "component_doi",
+                    "component_proprietary_id", "component_online_issn", "component_print_issn",
+                    "component_linking_issn", "component_isbn", "component_uri", "data_type", "section_type", "yop",
+                    "access_type", "access_method", "metric_type")  # Every column other than the counts
+    LOW_CARDINALITY_FIELDS = ("publisher", "publisher_id", "platform", "parent_data_type", "component_data_type",
+                              "data_type", "section_type", "yop", "access_type", "access_method",
+                              "metric_type")  # Columns with the same few values in most rows, see ValuePool
+
+    def __init__(self, begin_date: QDate, end_date: QDate):
+        self.database = ""
+        self.title = ""
+        self.item = ""
+        self.publisher = ""
+        self.publisher_id = ""
+        self.platform = ""
+        self.authors = ""
+        self.publication_date = ""
+        self.article_version = ""
         self.doi = ""
         self.proprietary_id = ""
         self.online_issn = ""
@@ -600,10 +1505,571 @@ class ReportRow:
         self.metric_type = ""
         self.total_count = 0
 
-        self.month_counts = {}
+        self.month_counts = MonthCounts(get_month_index(begin_date, end_date))
+        self.sort_key = None  # Set when the row is built, see ReportWorker.get_sort_key
+
+    def __copy__(self):
+        """Returns a copy of this row that shares its month counts, like copy.copy does for other objects"""
+        row = ReportRow.__new__(ReportRow)
+        for name in ReportRow.__slots__:
+            setattr(row, name, getattr(self, name))
+
+        return row
+
+    def get_values_key(self) -> tuple:
+        """Returns all values of this row other than its counts, to match rows of the same item"""
+        return tuple(getattr(self, name) for name in ReportRow.VALUE_FIELDS)
+
+
+class ValuePool:
+    """Stores one copy of each repeated value in a report's rows, so all rows with the value share the same string
+
+    Values like platform, publisher and metric_type repeat in almost every row, and the JSON decoder and CSV reader
+    make a new string for each of them. Unlike sys.intern, the pool is freed with its report
+    """
+    __slots__ = ("values",)
+
+    def __init__(self):
+        self.values = {}  # <k = value, v = the pooled copy of the value>
+
+    def intern(self, value):
+        """Returns the pooled copy of a value, adding the value to the pool if it's new. Only strings are pooled
+
+        :param value: The value
+        """
+        if type(value) is not str: return value
+        return self.values.setdefault(value, value)
+
+    def intern_field_values(self, field_values: dict) -> dict:
+        """Replaces the values of low cardinality row fields with their pooled copies, returning the field values
 
-        for month_year_str in get_month_years(begin_date, end_date):
-            self.month_counts[month_year_str] = 0
+        :param field_values: The field values, <k = row field, v = value>
+        """
+        values = self.values
+        for field in ReportRow.LOW_CARDINALITY_FIELDS:
+            if field in field_values:
+                value = field_values[field]
+                if type(value) is str: field_values[field] = values.setdefault(value, value)
+
+        return field_values
+
+    def intern_row(self, report_row: ReportRow):
+        """Replaces the values of a report row's low cardinality fields with their pooled copies
+
+        :param report_row: The report row
+        """
+        values = self.values
+        for field in ReportRow.LOW_CARDINALITY_FIELDS:
+            value = getattr(report_row, field)
+            if type(value) is str: setattr(report_row, field, values.setdefault(value, value))
+
+
+# region Report Item Fields
+# The report rows' fields of the values in report items, compiled into lookups by compile_field_table
+ATTRIBUTE_FIELD_TABLE = {  # <k = (scope, model attribute), v = row field> Only set if the value is not empty
+    (MajorReportType.PLATFORM, "platform"): "platform",
+    (MajorReportType.PLATFORM, "data_type"): "data_type",
+    (MajorReportType.PLATFORM, "access_method"): "access_method",
+    (MajorReportType.DATABASE, "database"): "database",
+    (MajorReportType.DATABASE, "publisher"): "publisher",
+    (MajorReportType.DATABASE, "platform"): "platform",
+    (MajorReportType.DATABASE, "data_type"): "data_type",
+    (MajorReportType.DATABASE, "access_method"): "access_method",
+    (MajorReportType.TITLE, "title"): "title",
+    (MajorReportType.TITLE, "publisher"): "publisher",
+    (MajorReportType.TITLE, "platform"): "platform",
+    (MajorReportType.TITLE, "data_type"): "data_type",
+    (MajorReportType.TITLE, "section_type"): "section_type",
+    (MajorReportType.TITLE, "yop"): "yop",
+    (MajorReportType.TITLE, "access_type"): "access_type",
+    (MajorReportType.TITLE, "access_method"): "access_method",
+    (MajorReportType.ITEM, "item"): "item",
+    (MajorReportType.ITEM, "publisher"): "publisher",
+    (MajorReportType.ITEM, "platform"): "platform",
+    (MajorReportType.ITEM, "data_type"): "data_type",
+    (MajorReportType.ITEM, "yop"): "yop",
+    (MajorReportType.ITEM, "access_type"): "access_type",
+    (MajorReportType.ITEM, "access_method"): "access_method",
+    ("parent", "item_name"): "parent_title",
+    ("parent", "data_type"): "parent_data_type",
+    ("component", "item_name"): "component_title",
+    ("component", "data_type"): "component_data_type",
+}
+ID_FIELD_TABLE = {  # <k = (scope, Item_ID Type), v = row field>
+    (MajorReportType.DATABASE, "Proprietary"): "proprietary_id",
+    (MajorReportType.DATABASE, "Proprietary_ID"): "proprietary_id",
+    (MajorReportType.TITLE, "DOI"): "doi",
+    (MajorReportType.TITLE, "Proprietary"): "proprietary_id",
+    (MajorReportType.TITLE, "Proprietary_ID"): "proprietary_id",
+    (MajorReportType.TITLE, "ISBN"): "isbn",
+    (MajorReportType.TITLE, "Print_ISSN"): "print_issn",
+    (MajorReportType.TITLE, "Online_ISSN"): "online_issn",
+    (MajorReportType.TITLE, "Linking_ISSN"): "linking_issn",
+    (MajorReportType.TITLE, "URI"): "uri",
+    (MajorReportType.ITEM, "DOI"): "doi",
+    (MajorReportType.ITEM, "Proprietary"): "proprietary_id",
+    (MajorReportType.ITEM, "Proprietary_ID"): "proprietary_id",
+    (MajorReportType.ITEM, "ISBN"): "isbn",
+    (MajorReportType.ITEM, "Print_ISSN"): "print_issn",
+    (MajorReportType.ITEM, "Online_ISSN"): "online_issn",
+    (MajorReportType.ITEM, "Linking_ISSN"): "linking_issn",
+    (MajorReportType.ITEM, "URI"): "uri",
+    ("parent", "DOI"): "parent_doi",
+    ("parent", "Proprietary"): "parent_proprietary_id",
+    ("parent", "Proprietary_ID"): "parent_proprietary_id",
+    ("parent", "ISBN"): "parent_isbn",
+    ("parent", "Print_ISSN"): "parent_print_issn",
+    ("parent", "Online_ISSN"): "parent_online_issn",
+    ("parent", "URI"): "parent_uri",
+    ("component", "DOI"): "component_doi",
+    ("component", "Proprietary"): "component_proprietary_id",
+    ("component", "Proprietary_ID"): "component_proprietary_id",
+    ("component", "ISBN"): "component_isbn",
+    ("component", "Print_ISSN"): "component_print_issn",
+    ("component", "Online_ISSN"): "component_online_issn",
+    ("component", "URI"): "component_uri",
+}
+DATE_FIELD_TABLE = {  # <k = (scope, Item_Dates Type), v = row field>
+    (MajorReportType.ITEM, "Publication_Date"): "publication_date",
+    ("parent", "Publication_Date"): "parent_publication_date",
+    ("parent", "Pub_Date"): "parent_publication_date",
+    ("component", "Publication_Date"): "component_publication_date",
+    ("component", "Pub_Date"): "component_publication_date",
+}
+ITEM_ATTRIBUTE_FIELD_TABLE = {  # <k = (scope, Item_Attributes Type), v = row field>
+    (MajorReportType.ITEM, "Article_Version"): "article_version",
+    ("parent", "Article_Version"): "parent_article_version",
+}
+ATTRIBUTE_JSON_KEYS = {  # <k = model attribute, v = JSON key>
+    "platform": "Platform",
+    "data_type": "Data_Type",
+    "access_method": "Access_Method",
+    "database": "Database",
+    "publisher": "Publisher",
+    "title": "Title",
+    "section_type": "Section_Type",
+    "yop": "YOP",
+    "access_type": "Access_Type",
+    "item": "Item",
+    "item_name": "Item_Name",
+}
+AUTHORS_FIELD_TABLE = {  # <k = scope, v = row field> The authors in the scope's Item_Contributors
+    MajorReportType.ITEM: "authors",
+    "parent": "parent_authors",
+    "component": "component_authors",
+}
+PUBLISHER_ID_SCOPES = (MajorReportType.DATABASE, MajorReportType.TITLE, MajorReportType.ITEM)
+COMPONENT_FIELDS = ("component_title", "component_authors", "component_publication_date", "component_data_type",
+                    "component_doi", "component_proprietary_id", "component_isbn", "component_print_issn",
+                    "component_online_issn", "component_uri")
+
+
+def compile_field_table(field_table: dict) -> dict:
+    """Returns a field table as a lookup of each scope's fields
+
+    :param field_table: A field table, <k = (scope, type), v = row field>
+    :returns: <k = scope, v = <k = type, v = row field>>
+    """
+    scope_fields = {}
+    for (scope, field_type), field in field_table.items():
+        scope_fields.setdefault(scope, {})[field_type] = field
+
+    return scope_fields
+
+
+ATTRIBUTE_FIELDS = {scope: tuple(fields.items())
+                    for scope, fields in compile_field_table(ATTRIBUTE_FIELD_TABLE).items()}
+ATTRIBUTE_JSON_FIELDS = {scope: tuple((ATTRIBUTE_JSON_KEYS[attribute], field) for attribute, field in fields)
+                         for scope, fields in ATTRIBUTE_FIELDS.items()}
+ID_FIELDS = compile_field_table(ID_FIELD_TABLE)
+DATE_FIELDS = compile_field_table(DATE_FIELD_TABLE)
+ITEM_ATTRIBUTE_FIELDS = compile_field_table(ITEM_ATTRIBUTE_FIELD_TABLE)
+
+
+def get_typed_field_values(typed_values: list, type_fields: dict, field_values: dict):
+    """Adds the values of type-value models (IDs, dates, attributes) to the fields they map to
+
+    :param typed_values: The type-value models, later values of the same field replace earlier ones
+    :param type_fields: The row field of each type, <k = type, v = row field>
+    :param field_values: The field values to add to, <k = row field, v = value>
+    """
+    typed_value: TypeValueModel
+    for typed_value in typed_values:
+        field = type_fields.get(typed_value.item_type)
+        if field is not None:
+            field_values[field] = typed_value.value
+
+
+def get_authors_string(item_contributors: list) -> str:
+    """Returns the authors in a list of item contributors, as 'name (identifier); name' """
+    authors_str = ""
+    item_contributor: ItemContributorModel
+    for item_contributor in item_contributors:
+        if item_contributor.item_type == "Author":
+            authors_str += f"{item_contributor.name}"
+            if item_contributor.identifier:
+                authors_str += f" ({item_contributor.identifier})"
+            authors_str += "; "
+
+    return authors_str.rstrip("; ")
+
+
+def get_scope_field_values(model, scope, field_values: dict):
+    """Adds the values of a report item, item parent or item component to the row fields they map to
+
+    :param model: The report item, item parent or item component model
+    :param scope: The major report type of a report item, or 'parent' or 'component'
+    :param field_values: The field values to add to, <k = row field, v = value>
+    """
+    for attribute, field in ATTRIBUTE_FIELDS.get(scope, ()):
+        value = getattr(model, attribute)
+        if value: field_values[field] = value
+
+    if scope in PUBLISHER_ID_SCOPES:
+        pub_id_str = ""
+        for pub_id in model.publisher_ids:
+            if pub_id.item_type == "Proprietary":
+                continue
+            pub_id_str += f"{pub_id.item_type}:{pub_id.value}; "
+        if pub_id_str: field_values["publisher_id"] = pub_id_str.rstrip("; ")
+
+    if scope in AUTHORS_FIELD_TABLE:
+        authors_str = get_authors_string(model.item_contributors)
+        if authors_str: field_values[AUTHORS_FIELD_TABLE[scope]] = authors_str
+
+    if scope in DATE_FIELDS: get_typed_field_values(model.item_dates, DATE_FIELDS[scope], field_values)
+    if scope in ITEM_ATTRIBUTE_FIELDS:
+        get_typed_field_values(model.item_attributes, ITEM_ATTRIBUTE_FIELDS[scope], field_values)
+    if scope in ID_FIELDS: get_typed_field_values(model.item_ids, ID_FIELDS[scope], field_values)
+
+
+def get_report_item_field_values(report_item, major_report_type: MajorReportType) -> dict:
+    """Returns the row field values of a report item, shared by all of the item's metric rows
+
+    :param report_item: The report item model
+    :param major_report_type: The major report type of the report
+    :returns: <k = row field, v = value>
+    """
+    field_values = {}
+    get_scope_field_values(report_item, major_report_type, field_values)
+    if major_report_type == MajorReportType.ITEM and report_item.item_parent is not None:
+        get_scope_field_values(report_item.item_parent, "parent", field_values)
+
+    return field_values
+
+
+def get_typed_json_field_values(typed_dicts: list, type_fields: dict, field_values: dict):
+    """Adds the values of type-value JSON dicts (IDs, dates, attributes) to the fields they map to
+
+    :param typed_dicts: The type-value JSON dicts, later values of the same field replace earlier ones
+    :param type_fields: The row field of each type, <k = type, v = row field>
+    :param field_values: The field values to add to, <k = row field, v = value>
+    """
+    for typed_dict in typed_dicts:
+        field = type_fields.get(str(typed_dict["Type"]) if "Type" in typed_dict else "")
+        if field is not None:
+            field_values[field] = str(typed_dict["Value"]) if "Value" in typed_dict else ""
+
+
+def get_scope_json_field_values(json_dict: dict, scope, field_values: dict):
+    """Adds the values of a report item, item parent or item component JSON dict to the row fields they map to
+
+    This gives the same values as get_scope_field_values, without building the models
+
+    :param json_dict: The report item, item parent or item component JSON dict
+    :param scope: The major report type of a report item, or 'parent' or 'component'
+    :param field_values: The field values to add to, <k = row field, v = value>
+    """
+    for key, field in ATTRIBUTE_JSON_FIELDS.get(scope, ()):
+        if key in json_dict:
+            value = json_dict[key]
+            if value: field_values[field] = value
+
+    if scope in PUBLISHER_ID_SCOPES:
+        pub_id_str = ""
+        for pub_id_dict in get_json_dicts("Publisher_ID", json_dict):
+            pub_id_type = str(pub_id_dict["Type"]) if "Type" in pub_id_dict else ""
+            if pub_id_type == "Proprietary":
+                continue
+            pub_id_value = str(pub_id_dict["Value"]) if "Value" in pub_id_dict else ""
+            pub_id_str += f"{pub_id_type}:{pub_id_value}; "
+        if pub_id_str: field_values["publisher_id"] = pub_id_str.rstrip("; ")
+
+    if scope in AUTHORS_FIELD_TABLE:
+        authors_str = ""
+        for contributor_dict in get_json_dicts("Item_Contributors", json_dict):
+            if "Type" in contributor_dict and contributor_dict["Type"] == "Author":
+                authors_str += f"{contributor_dict['Name'] if 'Name' in contributor_dict else ''}"
+                if "Identifier" in contributor_dict and contributor_dict["Identifier"]:
+                    authors_str += f" ({contributor_dict['Identifier']})"
+                authors_str += "; "
+        authors_str = authors_str.rstrip("; ")
+        if authors_str: field_values[AUTHORS_FIELD_TABLE[scope]] = authors_str
+
+    if scope in DATE_FIELDS:
+        get_typed_json_field_values(get_json_dicts("Item_Dates", json_dict), DATE_FIELDS[scope], field_values)
+    if scope in ITEM_ATTRIBUTE_FIELDS:
+        get_typed_json_field_values(get_json_dicts("Item_Attributes", json_dict), ITEM_ATTRIBUTE_FIELDS[scope],
+                                    field_values)
+    if scope in ID_FIELDS:
+        get_typed_json_field_values(get_json_dicts("Item_ID", json_dict), ID_FIELDS[scope], field_values)
+
+
+def get_report_item_json_field_values(report_item_dict: dict, major_report_type: MajorReportType) -> dict:
+    """Returns the row field values of a Report_Items JSON dict, shared by all of the item's metric rows
+
+    :param report_item_dict: The report item's JSON dict
+    :param major_report_type: The major report type of the report
+    :returns: <k = row field, v = value>
+    """
+    field_values = {}
+    get_scope_json_field_values(report_item_dict, major_report_type, field_values)
+    if major_report_type == MajorReportType.ITEM and "Item_Parent" in report_item_dict:
+        get_scope_json_field_values(report_item_dict["Item_Parent"], "parent", field_values)
+
+    return field_values
+
+
+class ComponentRow:
+    """This models the row of an item component in an item report
+
+    Component rows are flyweights: only the component's values are stored, the other columns and the month counts are
+    read from the item's metric row, which is shared by all its component rows. The columns can't be changed, use
+    expand to get a ReportRow that can
+
+    :param metric_row: The item's metric row
+    :param component_values: The component's values, ordered like COMPONENT_FIELDS
+    """
+    __slots__ = ("metric_row", "component_values")
+
+    def __init__(self, metric_row: ReportRow, component_values: tuple):
+        self.metric_row = metric_row
+        self.component_values = component_values
+
+    def expand(self) -> ReportRow:
+        """Returns this row as a ReportRow, which shares the metric row's month counts"""
+        row = copy.copy(self.metric_row)
+        for field, value in zip(COMPONENT_FIELDS, self.component_values):
+            setattr(row, field, value)
+
+        return row
+
+    get_values_key = ReportRow.get_values_key
+
+
+def get_component_row_column(field: str) -> property:
+    """Returns the read-only column of a component row, from its component values or its metric row
+
+    :param field: The ReportRow field of the column
+    """
+    if field in COMPONENT_FIELDS:
+        slot = COMPONENT_FIELDS.index(field)
+        return property(lambda component_row: component_row.component_values[slot])
+
+    return property(attrgetter("metric_row." + field))
+
+
+for row_field in ReportRow.__slots__:
+    setattr(ComponentRow, row_field, get_component_row_column(row_field))
+# endregion
+
+
+# region Report Columns
+# The columns of each report type before Metric_Type, Reporting_Period_Total and the months, as (column name, row
+# field, option) tuples. Columns with an option are only in reports with all attributes (e.g. the protected database
+# files), or in special reports where the special option of that name is selected
+PARENT_COLUMNS = (("Parent_Title", "parent_title", "include_parent_details"),
+                  ("Parent_Authors", "parent_authors", "include_parent_details"),
+                  ("Parent_Publication_Date", "parent_publication_date", "include_parent_details"),
+                  ("Parent_Article_Version", "parent_article_version", "include_parent_details"),
+                  ("Parent_Data_Type", "parent_data_type", "include_parent_details"),
+                  ("Parent_DOI", "parent_doi", "include_parent_details"),
+                  ("Parent_Proprietary_ID", "parent_proprietary_id", "include_parent_details"),
+                  ("Parent_ISBN", "parent_isbn", "include_parent_details"),
+                  ("Parent_Print_ISSN", "parent_print_issn", "include_parent_details"),
+                  ("Parent_Online_ISSN", "parent_online_issn", "include_parent_details"),
+                  ("Parent_URI", "parent_uri", "include_parent_details"))
+COMPONENT_COLUMNS = (("Component_Title", "component_title", "include_component_details"),
+                     ("Component_Authors", "component_authors", "include_component_details"),
+                     ("Component_Publication_Date", "component_publication_date", "include_component_details"),
+                     ("Component_Data_Type", "component_data_type", "include_component_details"),
+                     ("Component_DOI", "component_doi", "include_component_details"),
+                     ("Component_Proprietary_ID", "component_proprietary_id", "include_component_details"),
+                     ("Component_ISBN", "component_isbn", "include_component_details"),
+                     ("Component_Print_ISSN", "component_print_issn", "include_component_details"),
+                     ("Component_Online_ISSN", "component_online_issn", "include_component_details"),
+                     ("Component_URI", "component_uri", "include_component_details"))
+REPORT_COLUMNS = {
+    "PR": (("Platform", "platform", None),
+           ("Data_Type", "data_type", "data_type"),
+           ("Access_Method", "access_method", "access_method")),
+    "PR_P1": (("Platform", "platform", None),),
+    "DR": (("Database", "database", None),
+           ("Publisher", "publisher", None),
+           ("Publisher_ID", "publisher_id", None),
+           ("Platform", "platform", None),
+           ("Proprietary_ID", "proprietary_id", None),
+           ("Data_Type", "data_type", "data_type"),
+           ("Access_Method", "access_method", "access_method")),
+    "DR_D1": (("Database", "database", None),
+              ("Publisher", "publisher", None),
+              ("Publisher_ID", "publisher_id", None),
+              ("Platform", "platform", None),
+              ("Proprietary_ID", "proprietary_id", None)),
+    "TR": (("Title", "title", None),
+           ("Publisher", "publisher", None),
+           ("Publisher_ID", "publisher_id", None),
+           ("Platform", "platform", None),
+           ("DOI", "doi", None),
+           ("Proprietary_ID", "proprietary_id", None),
+           ("ISBN", "isbn", None),
+           ("Print_ISSN", "print_issn", None),
+           ("Online_ISSN", "online_issn", None),
+           ("URI", "uri", None),
+           ("Data_Type", "data_type", "data_type"),
+           ("Section_Type", "section_type", "section_type"),
+           ("YOP", "yop", "yop"),
+           ("Access_Type", "access_type", "access_type"),
+           ("Access_Method", "access_method", "access_method")),
+    "TR_B1": (("Title", "title", None),
+              ("Publisher", "publisher", None),
+              ("Publisher_ID", "publisher_id", None),
+              ("Platform", "platform", None),
+              ("DOI", "doi", None),
+              ("Proprietary_ID", "proprietary_id", None),
+              ("ISBN", "isbn", None),
+              ("Print_ISSN", "print_issn", None),
+              ("Online_ISSN", "online_issn", None),
+              ("URI", "uri", None),
+              ("YOP", "yop", None)),
+    "TR_B3": (("Title", "title", None),
+              ("Publisher", "publisher", None),
+              ("Publisher_ID", "publisher_id", None),
+              ("Platform", "platform", None),
+              ("DOI", "doi", None),
+              ("Proprietary_ID", "proprietary_id", None),
+              ("ISBN", "isbn", None),
+              ("Print_ISSN", "print_issn", None),
+              ("Online_ISSN", "online_issn", None),
+              ("URI", "uri", None),
+              ("YOP", "yop", None),
+              ("Access_Type", "access_type", None)),
+    "TR_J1": (("Title", "title", None),
+              ("Publisher", "publisher", None),
+              ("Publisher_ID", "publisher_id", None),
+              ("Platform", "platform", None),
+              ("DOI", "doi", None),
+              ("Proprietary_ID", "proprietary_id", None),
+              ("Print_ISSN", "print_issn", None),
+              ("Online_ISSN", "online_issn", None),
+              ("URI", "uri", None)),
+    "TR_J3": (("Title", "title", None),
+              ("Publisher", "publisher", None),
+              ("Publisher_ID", "publisher_id", None),
+              ("Platform", "platform", None),
+              ("DOI", "doi", None),
+              ("Proprietary_ID", "proprietary_id", None),
+              ("Print_ISSN", "print_issn", None),
+              ("Online_ISSN", "online_issn", None),
+              ("URI", "uri", None),
+              ("Access_Type", "access_type", None)),
+    "TR_J4": (("Title", "title", None),
+              ("Publisher", "publisher", None),
+              ("Publisher_ID", "publisher_id", None),
+              ("Platform", "platform", None),
+              ("DOI", "doi", None),
+              ("Proprietary_ID", "proprietary_id", None),
+              ("Print_ISSN", "print_issn", None),
+              ("Online_ISSN", "online_issn", None),
+              ("URI", "uri", None),
+              ("YOP", "yop", None)),
+    "IR": (("Item", "item", None),
+           ("Publisher", "publisher", None),
+           ("Publisher_ID", "publisher_id", None),
+           ("Platform", "platform", None),
+           ("Authors", "authors", "authors"),
+           ("Publication_Date", "publication_date", "publication_date"),
+           ("Article_version", "article_version", "article_version"),
+           ("DOI", "doi", None),
+           ("Proprietary_ID", "proprietary_id", None),
+           ("ISBN", "isbn", None),
+           ("Print_ISSN", "print_issn", None),
+           ("Online_ISSN", "online_issn", None),
+           ("URI", "uri", None)) + PARENT_COLUMNS + COMPONENT_COLUMNS +
+          (("Data_Type", "data_type", "data_type"),
+           ("YOP", "yop", "yop"),
+           ("Access_Type", "access_type", "access_type"),
+           ("Access_Method", "access_method", "access_method")),
+    "IR_A1": (("Item", "item", None),
+              ("Publisher", "publisher", None),
+              ("Publisher_ID", "publisher_id", None),
+              ("Platform", "platform", None),
+              ("Authors", "authors", None),
+              ("Publication_Date", "publication_date", None),
+              ("Article_version", "article_version", None),
+              ("DOI", "doi", None),
+              ("Proprietary_ID", "proprietary_id", None),
+              ("Print_ISSN", "print_issn", None),
+              ("Online_ISSN", "online_issn", None),
+              ("URI", "uri", None),
+              ("Parent_Title", "parent_title", None),
+              ("Parent_Authors", "parent_authors", None),
+              ("Parent_Article_Version", "parent_article_version", None),
+              ("Parent_DOI", "parent_doi", None),
+              ("Parent_Proprietary_ID", "parent_proprietary_id", None),
+              ("Parent_Print_ISSN", "parent_print_issn", None),
+              ("Parent_Online_ISSN", "parent_online_issn", None),
+              ("Parent_URI", "parent_uri", None),
+              ("Access_Type", "access_type", None)),
+    "IR_M1": (("Item", "item", None),
+              ("Publisher", "publisher", None),
+              ("Publisher_ID", "publisher_id", None),
+              ("Platform", "platform", None),
+              ("DOI", "doi", None),
+              ("Proprietary_ID", "proprietary_id", None),
+              ("URI", "uri", None)),
+}
+REPORT_COLUMNS["DR_D2"] = REPORT_COLUMNS["DR_D1"]
+REPORT_COLUMNS["TR_B2"] = REPORT_COLUMNS["TR_B1"]
+REPORT_COLUMNS["TR_J2"] = REPORT_COLUMNS["TR_J1"]
+
+
+def get_report_column_indexes(report_type: str, include_all_attributes: bool,
+                              special_options: SpecialReportOptions = None) -> list:
+    """Returns the indexes in REPORT_COLUMNS of a report file's columns before Metric_Type
+
+    :param report_type: The report type
+    :param include_all_attributes: Include every optional column, ignored for special reports
+    :param special_options: The special options if this is a special report
+    """
+    column_indexes = []
+    for column_index, (column_name, row_field, option) in enumerate(REPORT_COLUMNS.get(report_type, ())):
+        if option is not None:
+            if special_options is not None:
+                if not getattr(special_options, option)[0]: continue
+            elif not include_all_attributes:
+                continue
+
+        column_indexes.append(column_index)
+
+    return column_indexes
+
+
+def get_report_columns(report_type: str, include_all_attributes: bool,
+                       special_options: SpecialReportOptions = None) -> tuple:
+    """Returns the (column names, row fields) of a report file's columns before Metric_Type
+
+    :param report_type: The report type
+    :param include_all_attributes: Include every optional column, ignored for special reports
+    :param special_options: The special options if this is a special report
+    """
+    report_columns = REPORT_COLUMNS.get(report_type, ())
+    column_indexes = get_report_column_indexes(report_type, include_all_attributes, special_options)
+    column_names = [report_columns[column_index][0] for column_index in column_indexes]
+    row_fields = [report_columns[column_index][1] for column_index in column_indexes]
+
+    return column_names, row_fields
+# endregion
 
 
 class RequestData:
@@ -645,6 +2111,171 @@ class ProcessResult:
         self.file_path = ""
         self.protected_file_path = ""
         self.year = ""
+        self.created = ""
+        self.unsynced_file_paths = []  # Files written in a report process, their directories are synced at the end
+        self.database_rows = None  # (report, rows) The protected file's rows, added to the database without reading it
+        self.is_added_to_database = False  # If the report process already added the protected file to the database
+
+
+class FetchJournal:
+    """This keeps a record of every report fetched, so a fetch can be resumed by only fetching missing or failed reports
+
+    The journal is saved to disk after every update, with one entry per vendor, report type and date range
+
+    :param file_dir: The directory of the journal file
+    :param file_name: The name of the journal file
+    """
+    def __init__(self, file_dir: str = FETCH_JOURNAL_FILE_DIR, file_name: str = FETCH_JOURNAL_FILE_NAME):
+        self.file_dir = file_dir
+        self.file_name = file_name
+        self.entries = {}  # <k = (vendor_name, report_type, begin_month, end_month), v = entry dict>
+
+        try:
+            json_list = GeneralUtils.json_loads(GeneralUtils.read_json_file(file_dir + file_name))
+        except json.JSONDecodeError as e:
+            print(f"Fetch journal could not be read, starting a new one: {e}")
+            json_list = []
+
+        for entry in json_list:
+            self.entries[self.get_key(entry["vendor"], entry["report_type"], entry["begin_date"],
+                                      entry["end_date"])] = entry
+
+    @staticmethod
+    def get_key(vendor_name: str, report_type: str, begin_month: str, end_month: str) -> tuple:
+        return vendor_name, report_type, begin_month, end_month
+
+    def record(self, process_result: ProcessResult, begin_date: QDate, end_date: QDate):
+        """Adds or replaces the journal entry of a report's fetch result
+
+        :param process_result: The result of the report's fetch process
+        :param begin_date: The begin date of the request
+        :param end_date: The end date of the request
+        """
+        begin_month = begin_date.toString("yyyy-MM")
+        end_month = end_date.toString("yyyy-MM")
+        self.entries[self.get_key(process_result.vendor.name, process_result.report_type, begin_month, end_month)] = {
+            "vendor": process_result.vendor.name,
+            "report_type": process_result.report_type,
+            "begin_date": begin_month,
+            "end_date": end_month,
+            "status": process_result.completion_status.name,
+            "created": process_result.created,
+            "file_path": process_result.file_path
+        }
+
+    def is_completed(self, vendor_name: str, report_type: str, begin_date: QDate, end_date: QDate) -> bool:
+        """Checks if a report was already fetched successfully and its file still exists. A report saved with a
+        warning, e.g. one without usage, is also completed
+
+        :param vendor_name: The vendor's name
+        :param report_type: The report type
+        :param begin_date: The begin date of the request
+        :param end_date: The end date of the request
+        """
+        entry = self.entries.get(self.get_key(vendor_name, report_type, begin_date.toString("yyyy-MM"),
+                                              end_date.toString("yyyy-MM")))
+
+        return entry is not None and entry["status"] in (CompletionStatus.SUCCESSFUL.name,
+                                                         CompletionStatus.WARNING.name) \
+            and path.isfile(entry["file_path"])
+
+    def get_missing_report_types(self, vendor_name: str, report_types: list, begin_date: QDate,
+                                 end_date: QDate) -> list:
+        """Returns the report types that have not been fetched successfully yet for a vendor
+
+        :param vendor_name: The vendor's name
+        :param report_types: The report types to check
+        :param begin_date: The begin date of the request
+        :param end_date: The end date of the request
+        """
+        return [report_type for report_type in report_types
+                if not self.is_completed(vendor_name, report_type, begin_date, end_date)]
+
+    def save(self):
+        """Saves the journal to disk"""
+        GeneralUtils.save_json_file(self.file_dir, self.file_name, json.dumps(list(self.entries.values())), True)
+
+
+class SupportedReportsCache:
+    """This keeps the report types supported by each vendor, so they don't have to be requested for every fetch
+
+    Entries expire after the supported_reports_ttl setting and are only used while the vendor's connection details are
+    unchanged. Vendor workers use the cache from their own threads.
+
+    :param file_dir: The directory of the cache file
+    :param file_name: The name of the cache file
+    """
+    def __init__(self, file_dir: str = SUPPORTED_REPORTS_FILE_DIR, file_name: str = SUPPORTED_REPORTS_FILE_NAME):
+        self.file_dir = file_dir
+        self.file_name = file_name
+        self.lock = threading.Lock()
+        self.entries = {}  # <k = vendor_name, v = entry dict>
+
+        try:
+            json_list = GeneralUtils.json_loads(GeneralUtils.read_json_file(file_dir + file_name))
+        except json.JSONDecodeError as e:
+            print(f"Supported reports cache could not be read, starting a new one: {e}")
+            json_list = []
+
+        for entry in json_list:
+            self.entries[entry["vendor"]] = entry
+
+    @staticmethod
+    def get_connection_details(vendor: Vendor) -> list:
+        return [vendor.base_url, vendor.customer_id, vendor.requestor_id, vendor.platform]
+
+    def get(self, vendor: Vendor, ttl_hours: float):
+        """Returns the cached report types supported by a vendor, or None if there are none or they have expired
+
+        :param vendor: The vendor
+        :param ttl_hours: How long the cached report types are used for (hours)
+        """
+        with self.lock:
+            entry = self.entries.get(vendor.name)
+
+        if entry is None or entry["connection"] != self.get_connection_details(vendor): return None
+        if time.time() - entry["created"] > ttl_hours * 3600: return None
+
+        return [SupportedReportModel.from_json(json_dict).report_id for json_dict in entry["reports"]]
+
+    def add(self, vendor: Vendor, report_types: list):
+        """Adds or replaces the cached report types supported by a vendor
+
+        :param vendor: The vendor
+        :param report_types: The report types supported by the vendor
+        """
+        with self.lock:
+            self.entries[vendor.name] = {
+                "vendor": vendor.name,
+                "connection": self.get_connection_details(vendor),
+                "created": time.time(),
+                "reports": [{"Report_ID": report_type} for report_type in report_types]
+            }
+
+    def remove(self, vendor_name: str):
+        """Removes the cached report types supported by a vendor
+
+        :param vendor_name: The vendor's name
+        """
+        with self.lock:
+            self.entries.pop(vendor_name, None)
+
+    def save(self):
+        """Saves the cache to disk"""
+        with self.lock:
+            json_string = json.dumps(list(self.entries.values()))
+        GeneralUtils.save_json_file(self.file_dir, self.file_name, json_string)
+
+
+_supported_reports_cache = None
+
+
+def get_supported_reports_cache() -> SupportedReportsCache:
+    """Returns the supported reports cache that's shared by all fetch operations"""
+    global _supported_reports_cache
+    if _supported_reports_cache is None: _supported_reports_cache = SupportedReportsCache()
+
+    return _supported_reports_cache
 
 
 class FetchReportsAbstract:
@@ -663,6 +2294,9 @@ class FetchReportsAbstract:
         self.selected_data = []  # List of ReportData Objects
         self.retry_data = []  # List of (Vendor, list[report_types])>
         self.vendor_workers = {}  # <k = worker_id, v = (VendorWorker, Thread)>
+        self.report_workers = {}  # <k = worker_id, v = (ReportWorker, Thread)>
+        self.vendor_results = {}  # <k = vendor name, v = (Vendor, ProcessResult, list[ProcessResult])>
+        self.fetch_scheduler: FetchScheduler = None
         self.started_processes = 0
         self.completed_processes = 0
         self.total_processes = 0
@@ -673,7 +2307,7 @@ class FetchReportsAbstract:
         self.is_cancelling = False
         self.is_yearly_fetch = False
         self.settings = settings
-        self.database_report_data = []
+        self.fetch_journal = FetchJournal()
         # endregion
 
         # region Fetch Progress Dialog
@@ -693,7 +2327,7 @@ class FetchReportsAbstract:
         self.is_updating_database = False
         self.add_to_database = True
         self.database_thread = None
-        self.database_worker = None
+        self.database_worker: DatabaseWriterWorker = None
 
         # endregion
 
@@ -719,15 +2353,29 @@ class FetchReportsAbstract:
         """Updates the UI to show vendors that support report fetching (SUSHI)"""
         raise NotImplementedError()
 
+    def start_fetching(self):
+        """Starts fetching the selected data, working on up to the max concurrent vendors at a time"""
+        self.total_processes = len(self.selected_data)
+        self.started_processes = 0
+        self.completed_processes = 0
+        start_shared_fetch()
+        self.fetch_scheduler = FetchScheduler(self.settings.max_in_flight_requests, self.settings.concurrent_reports,
+                                              self.settings.concurrent_vendors)
+        if self.is_yearly_fetch and self.add_to_database: self.start_updating_database()
+        while self.started_processes < self.total_processes and \
+                self.started_processes < self.settings.concurrent_vendors:
+            self.fetch_vendor_data(self.selected_data[self.started_processes])
+            self.started_processes += 1
+
     def fetch_vendor_data(self, request_data: RequestData):
         """Initiates the process to fetch reports from a vendor
 
-        This creates a new thread to work on this vendor
+        This creates a new thread to request the vendor's supported reports
 
         :param request_data: The request data for this vendor request
         """
         worker_id = request_data.vendor.name
-        if worker_id in self.vendor_workers: return  # Avoid processing a vendor twice
+        if worker_id in self.vendor_workers or worker_id in self.vendor_results: return  # Avoid processing a vendor twice
 
         vendor_worker = VendorWorker(worker_id, request_data)
         vendor_worker.worker_finished_signal.connect(self.on_vendor_worker_finished)
@@ -832,38 +2480,108 @@ class FetchReportsAbstract:
         return report_result_widget
 
     def on_vendor_worker_finished(self, worker_id: str):
-        """Handles the signal emmited when a vendor worker has finished
+        """Handles the signal emmited when a vendor worker has finished requesting the vendor's supported reports
+
+        The supported target reports are queued in the fetch scheduler
 
         :param worker_id: The worker ID of the vendor
         """
-        self.completed_processes += 1
-
         thread: QThread
         worker: VendorWorker
-        worker, thread = self.vendor_workers[worker_id]
-        self.update_results_ui(worker.vendor, worker.process_result, worker.report_process_results)
-
-        if self.is_yearly_fetch:
-            process_result: ProcessResult
-            for process_result in worker.report_process_results:
-                if process_result.completion_status != CompletionStatus.SUCCESSFUL:
-                    continue
-
-                self.database_report_data.append({'file': process_result.protected_file_path,
-                                                  'vendor': process_result.vendor.name,
-                                                  'year': process_result.year})
-
+        worker, thread = self.vendor_workers.pop(worker_id)
         worker.deleteLater()
         thread.quit()
         thread.wait()
-        self.vendor_workers.pop(worker_id, None)
+
+        if worker.is_supported_reports_cache_updated: worker.supported_reports_cache.save()
+        self.vendor_results[worker_id] = worker.vendor, worker.process_result, []
+        if self.is_cancelling and len(worker.reports_to_process) > 0:
+            worker.process_result.completion_status = CompletionStatus.CANCELLED
+        elif not self.is_cancelling:
+            for report_type in worker.reports_to_process:
+                self.schedule_report(worker.request_data, report_type)
+            self.fetch_scheduler.start_tasks()
 
         if self.started_processes < self.total_processes and not self.is_cancelling:
             request_data = self.selected_data[self.started_processes]
             self.fetch_vendor_data(request_data)
             self.started_processes += 1
 
-        elif len(self.vendor_workers) == 0: self.finish_fetching_reports()
+        if not self.fetch_scheduler.has_tasks(worker_id): self.on_vendor_finished(worker_id)
+
+    def schedule_report(self, request_data: RequestData, report_type: str):
+        """Queues a report in the fetch scheduler
+
+        Reports are prioritized by their size and the order of their vendor in the selected data, see the
+        small_reports_first setting
+
+        :param request_data: The request data of the report's vendor
+        :param report_type: The report type
+        """
+        vendor_rank = self.selected_data.index(request_data)
+        size_rank = get_report_size_rank(report_type)
+        priority = (size_rank, vendor_rank) if self.settings.small_reports_first else (vendor_rank, size_rank)
+
+        self.fetch_scheduler.add_task(request_data.vendor.name, priority,
+                                      lambda: self.fetch_report(request_data, report_type))
+
+    def fetch_report(self, request_data: RequestData, report_type: str):
+        """Initiates the process to fetch a report
+
+        This creates a new thread to work on this report
+
+        :param request_data: The request data of the report's vendor
+        :param report_type: The target report type
+        """
+        worker_id = f"{request_data.vendor.name}-{report_type}"
+
+        report_worker = ReportWorker(worker_id, report_type, request_data, self.fetch_scheduler, self.database_worker)
+        report_worker.worker_finished_signal.connect(self.on_report_worker_finished)
+        report_thread = QThread()
+        self.report_workers[worker_id] = report_worker, report_thread
+        report_worker.moveToThread(report_thread)
+        report_thread.started.connect(report_worker.work)
+        report_thread.finished.connect(report_thread.deleteLater)
+
+        report_thread.start()
+
+        if self.settings.show_debug_messages: print(f"{worker_id}: Started, reports in flight: "
+                                                    f"{self.fetch_scheduler.in_flight_count}")
+
+    def on_report_worker_finished(self, worker_id: str):
+        """Handles the signal emmited when a report worker has finished
+
+        :param worker_id: The report worker's worker id
+        """
+        thread: QThread
+        worker: ReportWorker
+        worker, thread = self.report_workers.pop(worker_id)
+        worker.deleteLater()
+        thread.quit()
+        thread.wait()
+
+        vendor_name = worker.vendor.name
+        self.vendor_results[vendor_name][2].append(worker.process_result)
+        self.fetch_scheduler.task_finished(vendor_name, 1 + worker.shard_slots)
+
+        if not self.fetch_scheduler.has_tasks(vendor_name): self.on_vendor_finished(vendor_name)
+
+    def on_vendor_finished(self, vendor_name: str):
+        """Handles a vendor that has no more reports to fetch
+
+        :param vendor_name: The vendor's name
+        """
+        self.completed_processes += 1
+
+        vendor, vendor_result, report_results = self.vendor_results.pop(vendor_name)
+        self.update_results_ui(vendor, vendor_result, report_results)
+
+        if self.selected_options is None and len(report_results) > 0:
+            for process_result in report_results:
+                self.fetch_journal.record(process_result, self.begin_date, self.end_date)
+            self.fetch_journal.save()
+
+        if self.completed_processes == self.total_processes: self.finish_fetching_reports()
 
     def start_progress_dialog(self, window_title: str):
         """Sets up and shows the fetch progress dialog
@@ -942,13 +2660,7 @@ class FetchReportsAbstract:
         self.start_progress_dialog(progress_window_title)
         self.retry_data = []
 
-        self.total_processes = len(self.selected_data)
-        self.started_processes = 0
-        concurrent_vendors = self.settings.concurrent_vendors
-        while self.started_processes < len(self.selected_data) and self.started_processes < concurrent_vendors:
-            request_data = self.selected_data[self.started_processes]
-            self.fetch_vendor_data(request_data)
-            self.started_processes += 1
+        self.start_fetching()
 
     def finish_fetching_reports(self):
         """Finishes up the fetch process"""
@@ -956,18 +2668,21 @@ class FetchReportsAbstract:
         self.completed_processes = 0
         self.total_processes = 0
         self.is_cancelling = False
-        self.cancel_button.setEnabled(False)
-
-        # Start updating database...
-        if self.is_yearly_fetch and len(self.database_report_data) > 0:
-            if not self.start_updating_database(): self.finish_updating_database()
+        self.fetch_scheduler = None
+        if self.cancel_button is not None: self.cancel_button.setEnabled(False)
+        finish_shared_fetch()
+        GeneralUtils.sync_written_files()
+
+        # Wait for the reports that are still queued to be added to the database...
+        if self.database_worker is not None:
+            if self.status_label is not None: self.status_label.setText("Updating database...")
+            self.database_worker.finish()
         else:
             self.finish_updating_database()
 
     def finish_updating_database(self):
         """Finishes up the database update process"""
         self.is_updating_database = False
-        self.database_report_data = []
 
         self.ok_button.setEnabled(True)
         self.retry_button.setEnabled(True)
@@ -975,12 +2690,23 @@ class FetchReportsAbstract:
         if self.settings.show_debug_messages: print("Fin!")
 
     def cancel_workers(self):
-        """Sends a cancel signal to all vendor workers, updates the UI accordingly"""
+        """Sends a cancel signal to all vendor and report workers, updates the UI accordingly
+
+        Reports that have not been started are not fetched
+        """
         self.is_cancelling = True
         self.total_processes = self.started_processes
-        self.status_label.setText(f"Cancelling... (Waiting for started requests to finish)")
+        if self.status_label is not None:
+            self.status_label.setText(f"Cancelling... (Waiting for started requests to finish)")
         for worker, thread in self.vendor_workers.values():
             worker.set_cancelling()
+        for worker, thread in self.report_workers.values():
+            worker.set_cancelling()
+
+        for vendor_name in self.fetch_scheduler.cancel_pending_tasks():
+            vendor, vendor_result, report_results = self.vendor_results[vendor_name]
+            if len(report_results) == 0: vendor_result.completion_status = CompletionStatus.CANCELLED
+            if not self.fetch_scheduler.has_tasks(vendor_name): self.on_vendor_finished(vendor_name)
 
     def is_yearly_range(self, begin_date: QDate, end_date: QDate) -> bool:
         """Checks if a date range will retrieve all available reports for one year
@@ -1003,27 +2729,28 @@ class FetchReportsAbstract:
         return False
 
     def start_updating_database(self) -> bool:
-        """Starts a thread to update the database. Returns True if successfully started"""
+        """Starts a thread that adds the fetched yearly reports to the database as soon as each one is saved. Returns
+        True if successfully started
+
+        The report workers queue their reports in the database worker, which finishes once the fetch is done
+        """
         if self.is_updating_database:
             if self.settings.show_debug_messages: print("Database is already updating")
             return False
 
         self.is_updating_database = True
-        self.status_label.setText("Updating database...")
 
         self.database_thread = QThread()
-        self.database_worker = UpdateDatabaseWorker(self.database_report_data, False)
+        self.database_worker = DatabaseWriterWorker()
         self.database_worker.moveToThread(self.database_thread)
 
-        def on_progress_changed(progress: int):
-            self.progress_bar.setValue(int((progress / len(self.database_report_data)) * 100))
-
         def on_worker_finished(code):
             self.database_thread.quit()
             self.database_thread.wait()
+            self.database_worker = None
             self.finish_updating_database()
 
-        self.database_worker.progress_changed_signal.connect(on_progress_changed)
+        self.database_worker.task_finished_signal.connect(self.on_database_file_added)
         self.database_worker.worker_finished_signal.connect(on_worker_finished)
 
         self.database_thread.started.connect(self.database_worker.work)
@@ -1031,6 +2758,13 @@ class FetchReportsAbstract:
 
         return True
 
+    def on_database_file_added(self, file_name: str):
+        """Handles the signal emitted when the database worker has added a report file to the database
+
+        :param file_name: The name of the file
+        """
+        if self.settings.show_debug_messages: print(f"{file_name}: Added to the database")
+
 
 class FetchReportsController(FetchReportsAbstract):
     """Controls the Fetch Reports tab
@@ -1061,6 +2795,7 @@ class FetchReportsController(FetchReportsAbstract):
         # region Start Fetch Buttons
         self.fetch_all_btn = fetch_reports_ui.fetch_all_data_button
         self.fetch_all_btn.clicked.connect(self.fetch_all_basic_data)
+        self.resume_fetch_check_box = fetch_reports_ui.resume_fetch_check_box
 
         self.fetch_adv_btn = fetch_reports_ui.fetch_advanced_button
         self.fetch_adv_btn.clicked.connect(self.fetch_advanced_data)
@@ -1076,6 +2811,8 @@ class FetchReportsController(FetchReportsAbstract):
         self.select_vendors_btn.clicked.connect(self.select_all_vendors)
         self.deselect_vendors_btn = fetch_reports_ui.deselect_vendors_button_fetch
         self.deselect_vendors_btn.clicked.connect(self.deselect_all_vendors)
+        self.refresh_supported_reports_btn = fetch_reports_ui.refresh_supported_reports_button_fetch
+        self.refresh_supported_reports_btn.clicked.connect(self.refresh_supported_reports)
         # endregion
 
         # region Report Types
@@ -1262,6 +2999,23 @@ class FetchReportsController(FetchReportsAbstract):
         for i in range(self.vendor_list_model.rowCount()):
             self.vendor_list_model.item(i).setCheckState(Qt.Unchecked)
 
+    def refresh_supported_reports(self):
+        """Removes the cached supported reports of the checked vendors, so they are requested on their next fetch"""
+        vendor_names = []
+        for i in range(self.vendor_list_model.rowCount()):
+            if self.vendor_list_model.item(i).checkState() == Qt.Checked:
+                vendor_names.append(self.vendors[i].name)
+        if len(vendor_names) == 0:
+            GeneralUtils.show_message("No vendor selected")
+            return
+
+        supported_reports_cache = get_supported_reports_cache()
+        for vendor_name in vendor_names:
+            supported_reports_cache.remove(vendor_name)
+        supported_reports_cache.save()
+
+        GeneralUtils.show_message("The supported reports of the selected vendors will be requested on their next fetch")
+
     def select_all_report_types(self):
         """Checks all report types in the report types list view"""
         for i in range(self.report_type_list_model.rowCount()):
@@ -1292,24 +3046,28 @@ class FetchReportsController(FetchReportsAbstract):
         self.is_yearly_fetch = True
         self.save_dir = self.settings.yearly_directory
         self.selected_data = []
+        is_resuming = self.resume_fetch_check_box.isChecked()
         for i in range(len(self.vendors)):
             if self.vendors[i].is_non_sushi: continue
 
-            request_data = RequestData(self.vendors[i], ALL_REPORTS, self.begin_date, self.end_date,
+            report_types = ALL_REPORTS
+            if is_resuming:
+                report_types = self.fetch_journal.get_missing_report_types(self.vendors[i].name, ALL_REPORTS,
+                                                                           self.begin_date, self.end_date)
+                if len(report_types) == 0: continue
+
+            request_data = RequestData(self.vendors[i], report_types, self.begin_date, self.end_date,
                                        self.save_dir, self.settings)
             self.selected_data.append(request_data)
+        if len(self.selected_data) == 0:
+            GeneralUtils.show_message("All reports have already been fetched")
+            return
 
         self.is_last_fetch_advanced = False
         self.start_progress_dialog("Fetch Reports Progress")
         self.retry_data = []
 
-        self.total_processes = len(self.selected_data)
-        self.started_processes = 0
-        concurrent_vendors = self.settings.concurrent_vendors
-        while self.started_processes < len(self.selected_data) and self.started_processes < concurrent_vendors:
-            request_data = self.selected_data[self.started_processes]
-            self.fetch_vendor_data(request_data)
-            self.started_processes += 1
+        self.start_fetching()
 
     def fetch_advanced_data(self):
         """Fetches reports based on the selected options in the advanced view of the UI"""
@@ -1354,13 +3112,7 @@ class FetchReportsController(FetchReportsAbstract):
         self.is_last_fetch_advanced = False
         self.retry_data = []
 
-        self.total_processes = len(self.selected_data)
-        self.started_processes = 0
-        concurrent_vendors = self.settings.concurrent_vendors
-        while self.started_processes < len(self.selected_data) and self.started_processes < concurrent_vendors:
-            request_data = self.selected_data[self.started_processes]
-            self.fetch_vendor_data(request_data)
-            self.started_processes += 1
+        self.start_fetching()
 
 
 class FetchSpecialReportsController(FetchReportsAbstract):
@@ -1733,17 +3485,11 @@ class FetchSpecialReportsController(FetchReportsAbstract):
         self.start_progress_dialog("Fetch Special Reports Progress")
         self.retry_data = []
 
-        self.total_processes = len(self.selected_data)
-        self.started_processes = 0
-        concurrent_vendors = self.settings.concurrent_vendors
-        while self.started_processes < len(self.selected_data) and self.started_processes < concurrent_vendors:
-            request_data = self.selected_data[self.started_processes]
-            self.fetch_vendor_data(request_data)
-            self.started_processes += 1
+        self.start_fetching()
 
 
 class VendorWorker(QObject):
-    """This does all the work for a vendor when fetching reports
+    """This requests a vendor's supported reports, finding which of the target reports to fetch
 
     :param worker_id: The ID to identify this worker (vendor_name)
     :param request_data: The request data for this request
@@ -1757,25 +3503,29 @@ class VendorWorker(QObject):
         self.vendor = request_data.vendor
         self.target_report_types = request_data.target_report_types
         self.show_debug = request_data.settings.show_debug_messages
-        self.concurrent_reports = request_data.settings.concurrent_reports
-        self.request_interval = request_data.settings.request_interval
+        self.settings = request_data.settings
         self.request_timeout = request_data.settings.request_timeout
-        self.user_agent = request_data.settings.user_agent
+        self.session = get_vendor_session(self.vendor.base_url, request_data.settings.connection_pool_size)
+        self.supported_reports_cache = get_supported_reports_cache()
         self.reports_to_process = []
-        self.started_processes = 0
-        self.completed_processes = 0
-        self.total_processes = 0
+        self.is_supported_reports_cache_updated = False
 
         self.process_result = ProcessResult(self.vendor)
-        self.report_process_results = []
-        self.report_workers = {}  # <k = worker_id, v = (ReportWorker, Thread)>
         self.is_cancelling = False
 
     def work(self):
-        """Processes the vendor's requests
+        """Requests the vendor's supported reports, unless they are cached
 
-        Requests the vendor's supported reports before requesting only the supported reports
+        Only the supported target reports are added to reports_to_process
         """
+        if self.settings.supported_reports_ttl > 0:
+            supported_report_types = self.supported_reports_cache.get(self.vendor, self.settings.supported_reports_ttl)
+            if supported_report_types is not None:
+                if self.show_debug: print(f"{self.vendor.name}: Using cached supported reports")
+                self.set_reports_to_process(supported_report_types)
+                self.notify_worker_finished()
+                return
+
         if self.show_debug: print(f"{self.vendor.name}: Fetching supported reports")
         request_query = {}
         if self.vendor.customer_id.strip(): request_query["customer_id"] = self.vendor.customer_id
@@ -1786,15 +3536,17 @@ class VendorWorker(QObject):
         request_url = self.vendor.base_url
 
         try:
-            # Some vendors only work if they think a web browser is making the request...
-            response = requests.get(request_url, request_query, headers={'User-Agent': self.user_agent},
-                                    timeout=self.request_timeout)
+            response = send_sushi_request(self.session, request_url, request_query, self.settings, self.vendor.name,
+                                          lambda: self.is_cancelling)
             if self.show_debug: print(response.url)
             if response.status_code == 200:
                 self.process_response(response)
             else:
                 self.process_result.completion_status = CompletionStatus.FAILED
                 self.process_result.message = f"Unexpected HTTP status code received: {response.status_code}"
+        except RequestCancelledException:
+            self.process_result.message = "Target reports not processed"
+            self.process_result.completion_status = CompletionStatus.CANCELLED
         except requests.exceptions.Timeout as e:
             self.process_result.completion_status = CompletionStatus.FAILED
             self.process_result.message = f"Request timed out after {self.request_timeout} second(s)"
@@ -1804,12 +3556,12 @@ class VendorWorker(QObject):
             self.process_result.message = f"Request Exception: {e}"
             if self.show_debug: print(f"{self.vendor.name}: Request Exception: {e}")
 
-        if len(self.report_workers) == 0: self.notify_worker_finished()
+        self.notify_worker_finished()
 
     def process_response(self, response: requests.Response):
         """Processes the response from a REST request
 
-        Requests the target reports that are supported by the vendor
+        Finds the target reports that are supported by the vendor
         """
         if self.is_cancelling:
             self.process_result.message = "Target reports not processed"
@@ -1817,7 +3569,7 @@ class VendorWorker(QObject):
             return
 
         try:
-            json_response = response.json()
+            json_response = GeneralUtils.json_loads(response.text, self.settings.json_backend)
             exceptions = self.check_for_exception(json_response)
             if len(exceptions) > 0:
                 self.process_result.message = exception_models_to_message(exceptions)
@@ -1835,33 +3587,13 @@ class VendorWorker(QObject):
                 raise Exception("JSON is empty")
 
             supported_report_types = []
-            self.reports_to_process = []
             for json_dict in json_dicts:
                 supported_report = SupportedReportModel.from_json(json_dict)
                 supported_report_types.append(supported_report.report_id)
 
-                if supported_report.report_id in self.target_report_types:
-                    self.reports_to_process.append(supported_report.report_id)
-
-            unsupported_report_types = list(set(self.target_report_types) - set(supported_report_types))
-
-            self.process_result.message = "Supported by vendor: "
-            self.process_result.message += ", ".join(self.reports_to_process)
-            self.process_result.message += "\nUnsupported: "
-            self.process_result.message += ", ".join(unsupported_report_types)
-
-            if len(self.reports_to_process) == 0: return
-
-            self.total_processes = len(self.reports_to_process)
-            self.started_processes = 0
-            while self.started_processes < self.total_processes and self.started_processes < self.concurrent_reports:
-                QThread.currentThread().sleep(self.request_interval)  # Avoid spamming vendor's server
-                if self.is_cancelling:
-                    self.process_result.completion_status = CompletionStatus.CANCELLED
-                    return
-
-                self.fetch_report(self.reports_to_process[self.started_processes])
-                self.started_processes += 1
+            self.set_reports_to_process(supported_report_types)
+            self.supported_reports_cache.add(self.vendor, supported_report_types)
+            self.is_supported_reports_cache_updated = True
 
         except json.JSONDecodeError as e:
             self.process_result.completion_status = CompletionStatus.FAILED
@@ -1872,23 +3604,22 @@ class VendorWorker(QObject):
             self.process_result.message = str(e)
             if self.show_debug: print(f"{self.vendor.name}: Exception: {e}")
 
-    def fetch_report(self, report_type: str):
-        """Initiates the process to fetch a report
+    def set_reports_to_process(self, supported_report_types: list):
+        """Sets the target reports that are supported by the vendor as the reports to process
 
-        :param report_type: The target report type
+        :param supported_report_types: The report types supported by the vendor
         """
-        worker_id = report_type
-        if worker_id in self.report_workers: return  # Avoid fetching a report twice, app will crash!!
+        self.reports_to_process = []
+        for report_type in supported_report_types:
+            if report_type in self.target_report_types:
+                self.reports_to_process.append(report_type)
 
-        report_worker = ReportWorker(worker_id, report_type, self.request_data)
-        report_worker.worker_finished_signal.connect(self.on_report_worker_finished)
-        report_thread = QThread()
-        self.report_workers[worker_id] = report_worker, report_thread
-        report_worker.moveToThread(report_thread)
-        report_thread.started.connect(report_worker.work)
-        report_thread.finished.connect(report_thread.deleteLater)
+        unsupported_report_types = list(set(self.target_report_types) - set(supported_report_types))
 
-        report_thread.start()
+        self.process_result.message = "Supported by vendor: "
+        self.process_result.message += ", ".join(self.reports_to_process)
+        self.process_result.message += "\nUnsupported: "
+        self.process_result.message += ", ".join(unsupported_report_types)
 
     def check_for_exception(self, json_response) -> list:
         """Checks a JSON response for exception models
@@ -1898,16 +3629,7 @@ class VendorWorker(QObject):
         exceptions = []
 
         if type(json_response) is dict:
-            if "Exception" in json_response:
-                exceptions.append(ExceptionModel.from_json(json_response["Exception"]))
-                # raise Exception(f"Code: {exception.code}, Message: {exception.message}")
-
-            code = int(json_response["Code"]) if "Code" in json_response else ""
-            message = json_response["Message"] if "Message" in json_response else ""
-            data = json_response["Data"] if "Data" in json_response else ""
-            severity = json_response["Severity"] if "Severity" in json_response else ""
-            if code:
-                exceptions.append(ExceptionModel(code, message, severity, data))
+            exceptions = get_exception_models(json_response)
 
         elif type(json_response) is list:
             for json_dict in json_response:
@@ -1921,30 +3643,6 @@ class VendorWorker(QObject):
         """Notifies any listeners that this worker has finished"""
         self.worker_finished_signal.emit(self.vendor.name)
 
-    def on_report_worker_finished(self, worker_id: str):
-        """Handles the signal emmited when a report worker has finished
-
-        :param worker_id: The report worker's worker id
-        """
-        self.completed_processes += 1
-
-        thread: QThread
-        worker: ReportWorker
-        worker, thread = self.report_workers[worker_id]
-
-        self.report_process_results.append(worker.process_result)
-        worker.deleteLater()
-        thread.quit()
-        thread.wait()
-        self.report_workers.pop(worker_id, None)
-
-        if self.started_processes < self.total_processes and not self.is_cancelling:
-            QThread.currentThread().sleep(self.request_interval)  # Avoid spamming vendor's server
-            self.fetch_report(self.reports_to_process[self.started_processes])
-            self.started_processes += 1
-
-        if len(self.report_workers) == 0: self.notify_worker_finished()
-
     def set_cancelling(self):
         """Sets the worker to a cancelling state"""
         self.is_cancelling = True
@@ -1956,47 +3654,168 @@ class ReportWorker(QObject):
     :param worker_id: The ID to identify this worker (vendor_name-report_type)
     :param report_type: The report type to be processed
     :param request_data: The request data for this request
+    :param fetch_scheduler: The scheduler that started this report, the report's date range shards take their slots
+        from it
+    :param database_writer: The worker that adds the fetched yearly reports to the database, the report is queued in
+        it once saved
     """
     worker_finished_signal = pyqtSignal(str)
 
-    def __init__(self, worker_id: str, report_type: str, request_data: RequestData):
+    def __init__(self, worker_id: str, report_type: str, request_data: RequestData,
+                 fetch_scheduler: FetchScheduler = None, database_writer: DatabaseWriterWorker = None):
         super().__init__()
         self.worker_id = worker_id
         self.report_type = report_type
         self.vendor = request_data.vendor
+        self.request_data = request_data
         self.begin_date = request_data.begin_date
         self.end_date = request_data.end_date
+        self.month_index = get_month_index(self.begin_date, self.end_date)
+        self.value_pool = ValuePool()
         self.show_debug = request_data.settings.show_debug_messages
+        self.settings = request_data.settings
         self.request_timeout = request_data.settings.request_timeout
-        self.user_agent = request_data.settings.user_agent
+        self.session = get_vendor_session(self.vendor.base_url, request_data.settings.connection_pool_size)
         self.save_dir = request_data.save_location
         self.special_options = request_data.special_options
+        self.fetch_scheduler = fetch_scheduler
+        self.shard_slots = 0  # The slots taken from the fetch scheduler for the report's other shards
+        self.shard_results = {}  # The results of the fetched shards by date range index, kept across retries
+        self.database_writer = database_writer
 
         self.is_yearly = self.save_dir == request_data.settings.yearly_directory
         self.is_special = self.special_options is not None
         self.is_master = self.report_type in MASTER_REPORTS
 
         self.process_result = ProcessResult(self.vendor, self.report_type)
-        self.retried_request = False
+        self.queued_retries = 0
+        self.is_cancelling = False
 
     def work(self):
         """Processes the report request"""
         if self.show_debug: print(f"{self.vendor.name}-{self.report_type}: Fetching Report")
 
         self.make_request()
+        self.shard_results = {}
+        if self.database_writer is not None: self.add_to_database()
 
         if self.show_debug: print(f"{self.vendor.name}-{self.report_type}: Done")
         self.notify_worker_finished()
 
+    def add_to_database(self):
+        """Queues the report's protected file in the database writer if the report was saved
+
+        The report's rows are handed over with the file, so the database writer inserts them without reading the file.
+        A file that the report process already added is only reported by the database writer
+        """
+        database_file = self.get_database_file()
+        if database_file is None: return
+
+        if self.process_result.is_added_to_database: database_file['is_added'] = True
+        self.database_writer.add_file(database_file)
+
+    def get_database_file(self) -> dict:
+        """Returns the report's protected file to add to the database, as in ManageDB.UpdateDatabaseWorker's files,
+        or None if the report wasn't saved
+
+        The report's rows are moved from the process result to the file
+        """
+        if self.process_result.completion_status != CompletionStatus.SUCCESSFUL or \
+                not self.process_result.protected_file_path:
+            return None
+
+        database_file = {'file': self.process_result.protected_file_path,
+                         'vendor': self.vendor.name,
+                         'year': self.process_result.year}
+        if self.process_result.database_rows is not None:
+            database_file['report'], database_file['rows'] = self.process_result.database_rows
+            self.process_result.database_rows = None  # The result is kept by the UI, the rows are not needed there
+        return database_file
+
     def make_request(self):
-        """Sends the request fetch a report"""
+        """Fetches the report and saves it as TSV files
+
+        If sharding is enabled for this report type, the date range is fetched as concurrent month range shards that
+        are merged into one report
+        """
+        try:
+            date_ranges = self.get_shard_date_ranges()
+            if self.settings.use_report_processes and not self.settings.stream_report_items:
+                self.process_in_report_process(date_ranges)
+            else:
+                if len(date_ranges) > 1:
+                    report_header, exceptions, has_report_items, report_rows = self.fetch_sharded_report(date_ranges)
+                else:
+                    report_header, exceptions, has_report_items, report_rows = \
+                        self.fetch_report_rows(self.begin_date, self.end_date)
+
+                self.save_report(report_header, exceptions, has_report_items, report_rows)
+        except RequestCancelledException:
+            self.process_result.message = "Target report not processed"
+            self.process_result.completion_status = CompletionStatus.CANCELLED
+        except RequestFailedException as e:
+            self.process_result.completion_status = CompletionStatus.FAILED
+            self.process_result.message = e.message
+        except json.JSONDecodeError as e:
+            self.process_result.completion_status = CompletionStatus.FAILED
+            if e.msg == "Expecting value":
+                self.process_result.message = f"Vendor did not return any data"
+            else:
+                self.process_result.message = f"JSON Exception: {e.msg}"
+            if self.show_debug: print(
+                f"{self.vendor.name}-{self.report_type}: JSON Exception: {e.msg}")
+        except RetryLaterException as e:
+            self.queued_retries += 1
+            delay = get_queued_report_retry_policy(self.settings).get_delay(self.queued_retries, e.retry_after)
+            if delay is not None:
+                if self.show_debug:
+                    print(f"{self.vendor.name}-{self.report_type}: Retry Later Exception: {e}")
+                    print(f"{self.vendor.name}-{self.report_type}: Retrying in {delay:.1f} seconds...")
+                if sleep_unless_cancelled(delay, lambda: self.is_cancelling):  # Wait for the vendor to prepare it
+                    self.make_request()
+                else:
+                    self.process_result.message = "Target report not processed"
+                    self.process_result.completion_status = CompletionStatus.CANCELLED
+            else:
+                self.process_result.message = "Retry later exception received"
+                message = exception_models_to_message(e.exceptions)
+                if message: self.process_result.message += "\n\n" + message
+                self.process_result.completion_status = CompletionStatus.FAILED
+                self.process_result.retry = True
+                if self.show_debug: print(
+                    f"{self.vendor.name}-{self.report_type}: Retry Later Exception: {e}")
+        except ReportHeaderMissingException as e:
+            self.process_result.message = "Report_Header not received, no file was created"
+            message = exception_models_to_message(e.exceptions)
+            if message: self.process_result.message += "\n\n" + message
+            self.process_result.completion_status = CompletionStatus.FAILED
+            if self.show_debug: print(
+                f"{self.vendor.name}-{self.report_type}: Report Header Missing Exception: {e}")
+        except UnacceptableCodeException as e:
+            self.process_result.message = "Unsupported exception code received"
+            message = exception_models_to_message(e.exceptions)
+            if message: self.process_result.message += "\n\n" + message
+            self.process_result.completion_status = CompletionStatus.FAILED
+            if self.show_debug: print(
+                f"{self.vendor.name}-{self.report_type}: Unsupported Code Exception: {e}")
+        except Exception as e:
+            self.process_result.completion_status = CompletionStatus.FAILED
+            self.process_result.message = str(e)
+            if self.show_debug: print(f"{self.vendor.name}-{self.report_type}: Exception: {e}")
+
+    def get_request_query(self, begin_date: QDate, end_date: QDate) -> dict:
+        """Returns the query parameters of a report request
+
+        :param begin_date: The begin date of the request
+        :param end_date: The end date of the request
+        """
         request_query = {}
         if self.vendor.customer_id.strip(): request_query["customer_id"] = self.vendor.customer_id
         if self.vendor.requestor_id.strip(): request_query["requestor_id"] = self.vendor.requestor_id
         if self.vendor.api_key.strip(): request_query["api_key"] = self.vendor.api_key
         if self.vendor.platform.strip(): request_query["platform"] = self.vendor.platform
-        request_query["begin_date"] = self.begin_date.toString("yyyy-MM")
-        request_query["end_date"] = self.end_date.toString("yyyy-MM")
+        request_query["begin_date"] = begin_date.toString("yyyy-MM")
+        request_query["end_date"] = end_date.toString("yyyy-MM")
 
         attributes_to_show = ""
         if self.is_special:
@@ -2038,405 +3857,587 @@ class ReportWorker(QObject):
 
         if attributes_to_show: request_query["attributes_to_show"] = attributes_to_show
 
+        return request_query
+
+    def send_request(self, begin_date: QDate, end_date: QDate, stream: bool = False) -> requests.Response:
+        """Sends a request for the report, waiting for the vendor's rate limit first
+
+        :param begin_date: The begin date of the request
+        :param end_date: The end date of the request
+        :param stream: Only download the response's body when it's read
+        :raises RequestCancelledException: When the worker is cancelled before a response is received
+        :raises RequestFailedException: When the request fails or an unexpected HTTP status code is received
+        """
+        request_query = self.get_request_query(begin_date, end_date)
         request_url = f"{self.vendor.base_url}/{self.report_type.lower()}"
 
         try:
-            # Some vendors only work if they think a web browser is making the request...
-            response = requests.get(request_url, request_query, headers={'User-Agent': self.user_agent},
-                                    timeout=self.request_timeout)
-            if self.show_debug: print(response.url)
-            if response.status_code == 200:
-                self.process_response(response)
-            else:
-                self.process_result.completion_status = CompletionStatus.FAILED
-                self.process_result.message = f"Unexpected HTTP status code received: {response.status_code}"
+            response = send_sushi_request(self.session, request_url, request_query, self.settings, self.vendor.name,
+                                          lambda: self.is_cancelling, stream)
         except requests.exceptions.Timeout as e:
-            self.process_result.completion_status = CompletionStatus.FAILED
-            self.process_result.message = f"Request timed out after {self.request_timeout} second(s)"
             if self.show_debug: print(f"{self.vendor.name}: Request timed out")
+            raise RequestFailedException(f"Request timed out after {self.request_timeout} second(s)")
         except requests.exceptions.RequestException as e:
-            self.process_result.completion_status = CompletionStatus.FAILED
-            self.process_result.message = f"Request Exception: {e}"
             if self.show_debug: print(
                 f"{self.vendor.name}-{self.report_type}: Request Exception: {e}")
+            raise RequestFailedException(f"Request Exception: {e}")
 
-    def process_response(self, response: requests.Response):
-        """Processes the response from a request
+        if self.show_debug: print(response.url)
+        if response.status_code != 200 and response.status_code != 202:  # Queued reports may be 202 Accepted
+            response.close()
+            raise RequestFailedException(f"Unexpected HTTP status code received: {response.status_code}")
 
-        Converts the receoved JSON to a SUSHI Report Model
+        return response
 
-        :param response: The received response
+    def fetch_report_rows(self, begin_date: QDate, end_date: QDate, json_file_suffix: str = "") -> tuple:
+        """Fetches the report for a date range and converts it to report rows
+
+        Returns (report_header, exceptions, has_report_items, report_rows), the report rows cover the whole date range
+        of this worker
+
+        :param begin_date: The begin date of the request
+        :param end_date: The end date of the request
+        :param json_file_suffix: Added to the name of the saved raw JSON file
         """
+        response = self.send_request(begin_date, end_date, self.settings.stream_report_items)
         try:
-            json_string = response.text
-            if self.is_yearly: self.save_json_file(json_string)
-
-            json_dict = json.loads(json_string)
-            report_model = ReportModel.from_json(json_dict)
-            self.process_report_model(report_model)
-            if len(report_model.report_items) > 0 or len(report_model.exceptions) > 0:
-                self.process_result.message = exception_models_to_message(report_model.exceptions)
-            else:
-                self.process_result.message = "Report items not received. No exception received."
-        except json.JSONDecodeError as e:
-            self.process_result.completion_status = CompletionStatus.FAILED
-            if e.msg == "Expecting value":
-                self.process_result.message = f"Vendor did not return any data"
-            else:
-                self.process_result.message = f"JSON Exception: {e.msg}"
-            if self.show_debug: print(
-                f"{self.vendor.name}-{self.report_type}: JSON Exception: {e.msg}")
+            if self.settings.stream_report_items: return self.stream_report_rows(response, json_file_suffix)
+
+            return self.read_report_rows(self.read_response_text(response, json_file_suffix))
         except RetryLaterException as e:
-            if not self.retried_request:
-                if self.show_debug:
-                    print(f"{self.vendor.name}-{self.report_type}: Retry Later Exception: {e}")
-                    print(f"{self.vendor.name}-{self.report_type}: Retrying in {RETRY_WAIT_TIME} seconds...")
-                QThread.currentThread().sleep(RETRY_WAIT_TIME)  # Wait some time before retrying request
-                self.retried_request = True
-                self.make_request()
-            else:
-                self.process_result.message = "Retry later exception received"
-                message = exception_models_to_message(e.exceptions)
-                if message: self.process_result.message += "\n\n" + message
-                self.process_result.completion_status = CompletionStatus.FAILED
-                self.process_result.retry = True
-                if self.show_debug: print(
-                    f"{self.vendor.name}-{self.report_type}: Retry Later Exception: {e}")
-        except ReportHeaderMissingException as e:
-            self.process_result.message = "Report_Header not received, no file was created"
-            message = exception_models_to_message(e.exceptions)
-            if message: self.process_result.message += "\n\n" + message
-            self.process_result.completion_status = CompletionStatus.FAILED
-            if self.show_debug: print(
-                f"{self.vendor.name}-{self.report_type}: Report Header Missing Exception: {e}")
-        except UnacceptableCodeException as e:
-            self.process_result.message = "Unsupported exception code received"
-            message = exception_models_to_message(e.exceptions)
-            if message: self.process_result.message += "\n\n" + message
-            self.process_result.completion_status = CompletionStatus.FAILED
-            if self.show_debug: print(
-                f"{self.vendor.name}-{self.report_type}: Unsupported Code Exception: {e}")
-        except Exception as e:
-            self.process_result.completion_status = CompletionStatus.FAILED
-            self.process_result.message = str(e)
-            if self.show_debug: print(f"{self.vendor.name}-{self.report_type}: Exception: {e}")
+            e.retry_after = RetryPolicy.parse_retry_after(response)
+            raise
 
-    def process_report_model(self, report_model: ReportModel):
-        """Processes the report model into a TSV report
+    def fetch_report_json(self, begin_date: QDate, end_date: QDate, json_file_suffix: str = "") -> tuple:
+        """Fetches the report for a date range without processing it
 
-        :param report_model: The report model
+        Returns (json_string, retry_after), retry_after is the response's Retry-After header in seconds or None
+
+        :param begin_date: The begin date of the request
+        :param end_date: The end date of the request
+        :param json_file_suffix: Added to the name of the saved raw JSON file
         """
-        report_type = report_model.report_header.report_id
-        major_report_type = report_model.report_header.major_report_type
-        report_items = report_model.report_items
-        report_rows = []
-        file_dir = f"{self.save_dir}{self.begin_date.toString('yyyy')}/{self.vendor.name}/"
-        file_name = f"{self.begin_date.toString('yyyy')}_{self.vendor.name}_{report_type}.tsv"
-        file_path = f"{file_dir}{file_name}"
+        response = self.send_request(begin_date, end_date)
+        return self.read_response_text(response, json_file_suffix), RetryPolicy.parse_retry_after(response)
+
+    def fetch_report_json_file(self, begin_date: QDate, end_date: QDate, json_file_suffix: str = "") -> tuple:
+        """Fetches a yearly report for a date range and saves it as a raw JSON file without processing it
+
+        Returns (json_file_path, retry_after) like fetch_report_json, the path is without the compression's extension
+
+        :param begin_date: The begin date of the request
+        :param end_date: The end date of the request
+        :param json_file_suffix: Added to the name of the saved raw JSON file
+        """
+        json_string, retry_after = self.fetch_report_json(begin_date, end_date, json_file_suffix)
+        return self.get_json_file_path(json_file_suffix), retry_after
+
+    def read_response_text(self, response: requests.Response, json_file_suffix: str = "") -> str:
+        """Returns the text of a report response, saving it as a raw JSON file for yearly reports
+
+        :param response: The report response
+        :param json_file_suffix: Added to the name of the saved raw JSON file
+        """
+        json_string = response.text
+        if self.is_yearly: self.save_json_file(json_string, json_file_suffix)
+
+        return json_string
+
+    def read_report_rows(self, json_string: str) -> tuple:
+        """Converts a report JSON string into report rows
+
+        Returns (report_header, exceptions, has_report_items, report_rows) like fetch_report_rows
+
+        :param json_string: The report JSON string
+        """
+        json_dict = GeneralUtils.json_loads(json_string, self.settings.json_backend)
+        report_header, exceptions = ReportModel.process_report_header(json_dict)
 
         if self.show_debug: print(f"{self.vendor.name}-{self.report_type}: Processing report")
 
-        for report_item in report_items:
-            metric_row_dict = {}  # <k = metric_type, v = ReportRow> Some metric_types have a list of components
-            # Some Item report metric_types have a list of components
-            components = []  # list({component_values_as_dict})
-
-            performance: PerformanceModel
-            for performance in report_item.performances:
-                begin_month = QDate.fromString(performance.period.begin_date, "yyyy-MM-dd").toString("MMM-yyyy")
-
-                instance: InstanceModel
-                for instance in performance.instances:
-                    metric_type = instance.metric_type
-                    if metric_type not in metric_row_dict:
-                        metric_row = ReportRow(self.begin_date, self.end_date)
-                        metric_row.metric_type = metric_type
-
-                        metric_row_dict[metric_type] = metric_row
-                    else:
-                        metric_row = metric_row_dict[metric_type]
-
-                    if major_report_type == MajorReportType.PLATFORM:
-                        report_item: PlatformReportItemModel
-                        if report_item.platform: metric_row.platform = report_item.platform
-                        if report_item.data_type: metric_row.data_type = report_item.data_type
-                        if report_item.access_method: metric_row.access_method = report_item.access_method
-
-                    elif major_report_type == MajorReportType.DATABASE:
-                        report_item: DatabaseReportItemModel
-                        if report_item.database: metric_row.database = report_item.database
-                        if report_item.publisher: metric_row.publisher = report_item.publisher
-                        if report_item.platform: metric_row.platform = report_item.platform
-                        if report_item.data_type: metric_row.data_type = report_item.data_type
-                        if report_item.access_method: metric_row.access_method = report_item.access_method
-
-                        pub_id_str = ""
-                        for pub_id in report_item.publisher_ids:
-                            if pub_id.item_type == "Proprietary":
-                                continue
-                            pub_id_str += f"{pub_id.item_type}:{pub_id.value}; "
-                        if pub_id_str: metric_row.publisher_id = pub_id_str.rstrip("; ")
-
-                        for item_id in report_item.item_ids:
-                            if item_id.item_type == "Proprietary" or item_id.item_type == "Proprietary_ID":
-                                metric_row.proprietary_id = item_id.value
-
-                    elif major_report_type == MajorReportType.TITLE:
-                        report_item: TitleReportItemModel
-                        if report_item.title: metric_row.title = report_item.title
-                        if report_item.publisher: metric_row.publisher = report_item.publisher
-                        if report_item.platform: metric_row.platform = report_item.platform
-                        if report_item.data_type: metric_row.data_type = report_item.data_type
-                        if report_item.section_type: metric_row.section_type = report_item.section_type
-                        if report_item.yop: metric_row.yop = report_item.yop
-                        if report_item.access_type: metric_row.access_type = report_item.access_type
-                        if report_item.access_method: metric_row.access_method = report_item.access_method
-
-                        pub_id_str = ""
-                        for pub_id in report_item.publisher_ids:
-                            if pub_id.item_type == "Proprietary":
-                                continue
-                            pub_id_str += f"{pub_id.item_type}:{pub_id.value}; "
-                        if pub_id_str: metric_row.publisher_id = pub_id_str.rstrip("; ")
-
-                        item_id: TypeValueModel
-                        for item_id in report_item.item_ids:
-                            item_type = item_id.item_type
-
-                            if item_type == "DOI":
-                                metric_row.doi = item_id.value
-                            elif item_type == "Proprietary" or item_type == "Proprietary_ID":
-                                metric_row.proprietary_id = item_id.value
-                            elif item_type == "ISBN":
-                                metric_row.isbn = item_id.value
-                            elif item_type == "Print_ISSN":
-                                metric_row.print_issn = item_id.value
-                            elif item_type == "Online_ISSN":
-                                metric_row.online_issn = item_id.value
-                            elif item_type == "Linking_ISSN":
-                                metric_row.linking_issn = item_id.value
-                            elif item_type == "URI":
-                                metric_row.uri = item_id.value
-
-                    elif major_report_type == MajorReportType.ITEM:
-                        report_item: ItemReportItemModel
-                        if report_item.item: metric_row.item = report_item.item
-                        if report_item.publisher: metric_row.publisher = report_item.publisher
-                        if report_item.platform: metric_row.platform = report_item.platform
-                        if report_item.data_type: metric_row.data_type = report_item.data_type
-                        if report_item.yop: metric_row.yop = report_item.yop
-                        if report_item.access_type: metric_row.access_type = report_item.access_type
-                        if report_item.access_method: metric_row.access_method = report_item.access_method
-
-                        # Publisher ID
-                        pub_id_str = ""
-                        for pub_id in report_item.publisher_ids:
-                            if pub_id.item_type == "Proprietary":
-                                continue
-                            pub_id_str += f"{pub_id.item_type}:{pub_id.value}; "
-                        if pub_id_str: metric_row.publisher_id = pub_id_str.rstrip("; ")
-
-                        # Authors
-                        authors_str = ""
-                        item_contributor: ItemContributorModel
-                        for item_contributor in report_item.item_contributors:
-                            if item_contributor.item_type == "Author":
-                                authors_str += f"{item_contributor.name}"
-                                if item_contributor.identifier:
-                                    authors_str += f" ({item_contributor.identifier})"
-                                authors_str += "; "
-                        if authors_str: metric_row.authors = authors_str.rstrip("; ")
-
-                        # Publication date
-                        item_date: TypeValueModel
-                        for item_date in report_item.item_dates:
-                            if item_date.item_type == "Publication_Date":
-                                metric_row.publication_date = item_date.value
-
-                        # Article version
-                        item_attribute: TypeValueModel
-                        for item_attribute in report_item.item_attributes:
-                            if item_attribute.item_type == "Article_Version":
-                                metric_row.article_version = item_attribute.value
-
-                        # Base IDs
-                        item_id: TypeValueModel
-                        for item_id in report_item.item_ids:
-                            item_type = item_id.item_type
-
-                            if item_type == "DOI":
-                                metric_row.doi = item_id.value
-                            elif item_type == "Proprietary" or item_type == "Proprietary_ID":
-                                metric_row.proprietary_id = item_id.value
-                            elif item_type == "ISBN":
-                                metric_row.isbn = item_id.value
-                            elif item_type == "Print_ISSN":
-                                metric_row.print_issn = item_id.value
-                            elif item_type == "Online_ISSN":
-                                metric_row.online_issn = item_id.value
-                            elif item_type == "Linking_ISSN":
-                                metric_row.linking_issn = item_id.value
-                            elif item_type == "URI":
-                                metric_row.uri = item_id.value
-
-                        # Parent
-                        if report_item.item_parent is not None:
-                            item_parent: ItemParentModel
-                            item_parent = report_item.item_parent
-                            if item_parent.item_name: metric_row.parent_title = item_parent.item_name
-                            if item_parent.data_type: metric_row.parent_data_type = item_parent.data_type
-
-                            # Authors
-                            authors_str = ""
-                            item_contributor: ItemContributorModel
-                            for item_contributor in report_item.item_contributors:
-                                if item_contributor.item_type == "Author":
-                                    authors_str += f"{item_contributor.name}"
-                                    if item_contributor.identifier:
-                                        authors_str += f" ({item_contributor.identifier})"
-                                    authors_str += "; "
-                            authors_str.rstrip("; ")
-                            if authors_str: metric_row.authors = authors_str
-
-                            # Publication date
-                            item_date: TypeValueModel
-                            for item_date in item_parent.item_dates:
-                                if item_date.item_type == "Publication_Date" or item_date.item_type == "Pub_Date":
-                                    metric_row.parent_publication_date = item_date.value
-
-                            # Article version
-                            item_attribute: TypeValueModel
-                            for item_attribute in item_parent.item_attributes:
-                                if item_attribute.item_type == "Article_Version":
-                                    metric_row.parent_article_version = item_attribute.value
-
-                            # Parent IDs
-                            item_id: TypeValueModel
-                            for item_id in item_parent.item_ids:
-                                item_type = item_id.item_type
-
-                                if item_type == "DOI":
-                                    metric_row.parent_doi = item_id.value
-                                elif item_type == "Proprietary" or item_type == "Proprietary_ID":
-                                    metric_row.parent_proprietary_id = item_id.value
-                                elif item_type == "ISBN":
-                                    metric_row.parent_isbn = item_id.value
-                                elif item_type == "Print_ISSN":
-                                    metric_row.parent_print_issn = item_id.value
-                                elif item_type == "Online_ISSN":
-                                    metric_row.parent_online_issn = item_id.value
-                                elif item_type == "URI":
-                                    metric_row.parent_uri = item_id.value
-
-                    else:
-                        if self.show_debug: print(
-                            f"{self.vendor.name}-{self.report_type}: Unexpected report type")
-
-                    month_counts = metric_row.month_counts
-                    month_counts[begin_month] += instance.count
-
-                    metric_row.total_count += instance.count
+        report_rows = []
+        has_report_items = self.add_report_item_dicts_rows(self.get_report_item_dicts(json_dict),
+                                                           report_header.major_report_type, report_rows)
+        return report_header, exceptions, has_report_items, report_rows
+
+    def stream_report_rows(self, response: requests.Response, json_file_suffix: str = "") -> tuple:
+        """Reads a streamed report response in chunks, converting each report item to rows as soon as it's received
+
+        Returns (report_header, exceptions, has_report_items, report_rows) like fetch_report_rows. Only the report
+        rows and the chunk being parsed are kept in memory, not the whole JSON document or report model.
+
+        :param response: The streamed response
+        :param json_file_suffix: Added to the name of the saved raw JSON file
+        """
+        parser = ReportJsonStreamParser()
+        text_decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+        json_file = self.open_json_file(json_file_suffix) if self.is_yearly else None
+
+        report_header = None
+        major_report_type = None
+        early_report_item_dicts = []  # Report items received before the Report_Header
+        report_rows = []
+        has_report_items = False
+
+        def add_report_item_dicts(report_item_dicts: list):
+            nonlocal report_header, major_report_type, early_report_item_dicts, has_report_items
+            if len(report_item_dicts) == 0: return
+
+            if major_report_type is None and "Report_Header" in parser.json_value:
+                report_header = ReportHeaderModel.from_json(parser.json_value["Report_Header"])
+                report_header.major_report_type = GeneralUtils.get_major_report_type(report_header.report_id)
+                major_report_type = report_header.major_report_type
+                report_item_dicts = early_report_item_dicts + report_item_dicts
+                early_report_item_dicts = []
+
+            if major_report_type is None:
+                early_report_item_dicts += report_item_dicts
+                return
+
+            if self.add_report_item_dicts_rows(report_item_dicts, major_report_type, report_rows):
+                has_report_items = True
+
+        try:
+            for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+                text = text_decoder.decode(chunk)
+                if json_file is not None: json_file.write(text)
+                add_report_item_dicts(parser.feed(text))
+
+            text = text_decoder.decode(b"", True)
+            if json_file is not None: json_file.write(text)
+            parser.feed(text)
+            add_report_item_dicts(parser.close())
+        except BaseException:
+            if json_file is not None: json_file.discard()  # Don't leave a truncated raw JSON file
+            raise
+        finally:
+            response.close()
+            if json_file is not None: json_file.close()
+
+        # Process the rest of the document like a normal report, with the report items that couldn't be streamed
+        json_dict = parser.json_value
+        if type(json_dict) is dict and "Report_Items" not in json_dict:
+            json_dict["Report_Items"] = early_report_item_dicts
+        report_header, exceptions = ReportModel.process_report_header(json_dict, report_header)
+        if self.add_report_item_dicts_rows(self.get_report_item_dicts(json_dict), report_header.major_report_type,
+                                           report_rows):
+            has_report_items = True
+
+        return report_header, exceptions, has_report_items, report_rows
+
+    def get_shard_date_ranges(self) -> list:
+        """Returns the (begin_date, end_date) ranges to request this report in
+
+        The whole date range is returned as one range unless sharding is enabled for this report type
+        """
+        shard_months = self.settings.report_shard_months
+        if shard_months <= 0 or self.report_type not in SHARDED_REPORTS:
+            return [(self.begin_date, self.end_date)]
+
+        date_ranges = []
+        shard_begin_date = QDate(self.begin_date.year(), self.begin_date.month(), 1)
+        while shard_begin_date <= self.end_date:
+            shard_end_date = shard_begin_date.addMonths(shard_months - 1)
+            if shard_end_date > self.end_date: shard_end_date = QDate(self.end_date)
+            date_ranges.append((shard_begin_date, shard_end_date))
+            shard_begin_date = shard_begin_date.addMonths(shard_months)
+
+        return date_ranges
+
+    def fetch_sharded_report(self, date_ranges: list) -> tuple:
+        """Fetches the report's date range shards concurrently and merges them into one report
+
+        Returns (report_header, exceptions, has_report_items, report_rows) like fetch_report_rows. Each shard's
+        response is converted to rows as soon as it's received, so only one shard's JSON is held at a time per thread.
+
+        :param date_ranges: The (begin_date, end_date) ranges of the shards
+        """
+        return self.merge_shard_results(self.fetch_shards(self.fetch_report_rows, date_ranges))
+
+    def fetch_shards(self, fetch_function, date_ranges: list) -> list:
+        """Fetches the report's date range shards concurrently, returning the result of each shard in date order
+
+        The report's own slot fetches one shard at a time, the others are only fetched concurrently in the slots taken
+        from the fetch scheduler, so shards count towards the reports in flight. Without a fetch scheduler, up to the
+        max concurrent reports per vendor are fetched at a time. The results are kept in shard_results, so when a shard
+        fails and the report is retried later, only the shards without a result are fetched again
+
+        :param fetch_function: Fetches a shard, called with (begin_date, end_date, json_file_suffix)
+        :param date_ranges: The (begin_date, end_date) ranges of the shards
+        """
+        if self.fetch_scheduler is not None:
+            missing_slots = len(date_ranges) - 1 - self.shard_slots
+            if missing_slots > 0: self.shard_slots += self.fetch_scheduler.take_slots(self.vendor.name, missing_slots)
+            max_workers = min(self.shard_slots + 1, len(date_ranges))
+        else:
+            max_workers = max(min(self.settings.concurrent_reports, len(date_ranges)), 1)
+
+        if self.show_debug: print(f"{self.vendor.name}-{self.report_type}: Fetching {len(date_ranges)} shards, "
+                                  f"{max_workers} at a time")
+
+        error = None
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {i: executor.submit(fetch_function, begin_date, end_date,
+                                          f"_{begin_date.toString('yyyy-MM')}_{end_date.toString('yyyy-MM')}")
+                       for i, (begin_date, end_date) in enumerate(date_ranges) if i not in self.shard_results}
+            for i, future in futures.items():
+                try:
+                    self.shard_results[i] = future.result()
+                except CancelledError:
+                    pass
+                except Exception as e:
+                    if error is None:
+                        error = e
+                        for other_future in futures.values():
+                            other_future.cancel()
+        if error is not None: raise error
+
+        return [self.shard_results[i] for i in range(len(date_ranges))]
+
+    def merge_shard_results(self, shard_results: list) -> tuple:
+        """Merges the results of the report's date range shards into one report
+
+        Returns (report_header, exceptions, has_report_items, report_rows) like fetch_report_rows
+
+        :param shard_results: The (report_header, exceptions, has_report_items, report_rows) of each shard, in date
+            order
+        """
+        report_header = self.merge_report_headers([shard_result[0] for shard_result in shard_results])
+        exceptions = []
+        for shard_result in shard_results:
+            add_unique_exceptions(exceptions, shard_result[1])
+        has_report_items = any(shard_result[2] for shard_result in shard_results)
+        report_rows = self.merge_report_rows([shard_result[3] for shard_result in shard_results])
+
+        return report_header, exceptions, has_report_items, report_rows
+
+    def process_in_report_process(self, date_ranges: list):
+        """Fetches the report, then converts it to rows and saves it as TSV files in a report process
+
+        Only the report's JSON is sent to the report process and only the process result is sent back, so the CPU
+        heavy work of concurrent reports isn't limited to one CPU core. Yearly reports are read from their raw JSON
+        files and added to the database by the report process, so neither their JSON nor their rows are sent
+
+        :param date_ranges: The (begin_date, end_date) ranges to request the report in
+        """
+        fetch_function = self.fetch_report_json_file if self.is_yearly else self.fetch_report_json
+        if len(date_ranges) > 1:
+            json_results = self.fetch_shards(fetch_function, date_ranges)
+        else:
+            json_results = [fetch_function(self.begin_date, self.end_date)]
+
+        if self.show_debug: print(f"{self.vendor.name}-{self.report_type}: Processing report in a report process")
+
+        report_process_pool = get_report_process_pool(self.settings.report_processes)
+        future = report_process_pool.submit(process_report_json, self.worker_id, self.report_type, self.request_data,
+                                            [json_source for json_source, retry_after in json_results],
+                                            self.database_writer is not None)
+        try:
+            process_result = future.result()
+        except RetryLaterException as e:
+            retry_afters = [retry_after for json_source, retry_after in json_results if retry_after is not None]
+            e.retry_after = max(retry_afters) if len(retry_afters) > 0 else None
+            if e.shard_index is not None: self.shard_results.pop(e.shard_index, None)  # Only fetch it again
+            raise
+
+        for name, value in vars(process_result).items():
+            if name != "vendor": setattr(self.process_result, name, value)
+        GeneralUtils.add_unsynced_files(process_result.unsynced_file_paths)
+
+    def save_report(self, report_header: ReportHeaderModel, exceptions: list, has_report_items: bool,
+                    report_rows: list):
+        """Sorts the report rows and saves them as TSV files, setting the process result's message
+
+        :param report_header: The report header model
+        :param exceptions: The report's exception models
+        :param has_report_items: If any report items were received
+        :param report_rows: The report's rows
+        """
+        self.process_result.created = report_header.created
+        report_rows = self.sort_rows(report_rows, report_header.major_report_type)
+        self.save_tsv_files(report_header, report_rows)
+        if has_report_items or len(exceptions) > 0:
+            self.process_result.message = exception_models_to_message(exceptions)
+        else:
+            self.process_result.message = "Report items not received. No exception received."
+
+    @staticmethod
+    def merge_report_headers(report_headers: list) -> ReportHeaderModel:
+        """Merges the report headers of date range shards into a header for the whole date range
+
+        :param report_headers: The report headers of the shards, in date order
+        """
+        report_header = copy.copy(report_headers[0])
+
+        end_date_filter = None
+        for report_filter in report_headers[-1].report_filters:
+            if report_filter.name == "End_Date": end_date_filter = report_filter
+
+        report_header.report_filters = []
+        for report_filter in report_headers[0].report_filters:
+            if report_filter.name == "End_Date" and end_date_filter is not None: report_filter = end_date_filter
+            report_header.report_filters.append(report_filter)
+
+        report_header.exceptions = []
+        for shard_report_header in report_headers:
+            add_unique_exceptions(report_header.exceptions, shard_report_header.exceptions)
+
+        return report_header
+
+    @staticmethod
+    def merge_report_rows(shard_report_rows: list) -> list:
+        """Merges the report rows of date range shards, summing the counts of matching rows
+
+        Rows match when all their values other than counts are the same. If a shard has several matching rows, the
+        n-th one is merged with the n-th one of the other shards.
+
+        :param shard_report_rows: The report rows of each shard, in date order
+        """
+        merged_rows = []
+        merged_row_indexes = {}  # <k = (row values, occurrence), v = index in merged_rows>
+        for report_rows in shard_report_rows:
+            occurrences = {}
+            row: ReportRow
+            for row in report_rows:
+                row_values = row.get_values_key()
+                occurrence = occurrences.get(row_values, 0)
+                occurrences[row_values] = occurrence + 1
+
+                merged_row_index = merged_row_indexes.get((row_values, occurrence))
+                if merged_row_index is None:
+                    merged_row = row.expand() if type(row) is ComponentRow else copy.copy(row)
+                    merged_row.month_counts = row.month_counts.copy()  # Item component rows share month_counts
+                    merged_row_indexes[row_values, occurrence] = len(merged_rows)
+                    merged_rows.append(merged_row)
+                else:
+                    merged_row = merged_rows[merged_row_index]
+                    merged_row.month_counts.add_counts(row.month_counts)
+                    merged_row.total_count += row.total_count
+
+        return merged_rows
+
+    @staticmethod
+    def get_report_item_dicts(json_dict: dict) -> list:
+        """Returns the Report_Items JSON dicts of a report JSON dict
+
+        :param json_dict: The report's JSON dict
+        """
+        if "Report_Items" in json_dict and json_dict["Report_Items"]:
+            return json_dict["Report_Items"]
+
+        return []
+
+    def add_report_item_dicts_rows(self, report_item_dicts: list, major_report_type: MajorReportType,
+                                   report_rows: list) -> bool:
+        """Converts Report_Items JSON dicts into report rows, adding them to a list of report rows
+
+        The JSON dicts are converted straight into rows, unless the build_report_models setting is on. Then each
+        report item is converted into its report model first, which is slower but easier to debug.
+
+        :param report_item_dicts: The Report_Items JSON dicts
+        :param major_report_type: The major report type of the report
+        :param report_rows: The list of report rows to add to
+        :returns: True if any report items were converted
+        """
+        has_report_items = False
+        if self.settings.build_report_models:
+            for report_item_dict in report_item_dicts:
+                report_item = ReportModel.report_item_from_json(major_report_type, report_item_dict)
+                if report_item is None: continue
+                self.add_report_item_rows(report_item, major_report_type, report_rows)
+                has_report_items = True
+
+        elif major_report_type in (MajorReportType.PLATFORM, MajorReportType.DATABASE, MajorReportType.TITLE,
+                                   MajorReportType.ITEM):
+            for report_item_dict in report_item_dicts:
+                self.add_report_item_dict_rows(report_item_dict, major_report_type, report_rows)
+                has_report_items = True
+
+        return has_report_items
+
+    def add_report_item_dict_rows(self, report_item_dict: dict, major_report_type: MajorReportType,
+                                  report_rows: list):
+        """Converts a Report_Items JSON dict into report rows, adding them to a list of report rows
+
+        This gives the same rows as add_report_item_rows, without building the report item model
+
+        :param report_item_dict: The report item's JSON dict
+        :param major_report_type: The major report type of the report
+        :param report_rows: The list of report rows to add to
+        """
+        metric_row_dict = {}  # <k = metric_type, v = ReportRow>
+        month_index = self.month_index
+        value_pool = self.value_pool
+        field_values = tuple(value_pool.intern_field_values(
+            get_report_item_json_field_values(report_item_dict, major_report_type)).items())
+        sort_key = None  # The same for all of the item's rows
+
+        for performance_dict in get_json_dicts("Performance", report_item_dict):
+            period_dict = performance_dict["Period"]
+            month_slot = month_index.get_period_slot(period_dict["Begin_Date"] if "Begin_Date" in period_dict else "")
+
+            for instance_dict in get_json_dicts("Instance", performance_dict):
+                metric_type = instance_dict["Metric_Type"] if "Metric_Type" in instance_dict else ""
+                count = int(instance_dict["Count"]) if "Count" in instance_dict else 0
+
+                metric_row = metric_row_dict.get(metric_type)
+                if metric_row is None:
+                    metric_row = ReportRow(self.begin_date, self.end_date)
+                    metric_row.metric_type = value_pool.intern(metric_type)
+                    for field, value in field_values:
+                        setattr(metric_row, field, value)
+                    if sort_key is None: sort_key = self.get_sort_key(metric_row, major_report_type)
+                    metric_row.sort_key = sort_key
+
+                    metric_row_dict[metric_type] = metric_row
+
+                metric_row.month_counts.counts[month_slot] += count
+
+                metric_row.total_count += count
+
+        components = []  # list(component values, ordered like COMPONENT_FIELDS)
+        if major_report_type == MajorReportType.ITEM:
+            for component_dict in get_json_dicts("Item_Component", report_item_dict):
+                component = dict.fromkeys(COMPONENT_FIELDS, "")
+                get_scope_json_field_values(component_dict, "component", component)
+                value_pool.intern_field_values(component)
+                components.append(tuple(component[field] for field in COMPONENT_FIELDS))
+
+        self.add_metric_rows(metric_row_dict, components, major_report_type, report_rows)
+
+    def add_report_item_rows(self, report_item, major_report_type: MajorReportType, report_rows: list):
+        """Converts a report item into report rows, adding them to a list of report rows
+
+        :param report_item: The report item model
+        :param major_report_type: The major report type of the report
+        :param report_rows: The list of report rows to add to
+        """
+        metric_row_dict = {}  # <k = metric_type, v = ReportRow> Some metric_types have a list of components
+        # Some Item report metric_types have a list of components
+        components = []  # list(component values, ordered like COMPONENT_FIELDS)
+        month_index = self.month_index
+        value_pool = self.value_pool
+        sort_key = None  # The same for all of the item's rows
+
+        if major_report_type in (MajorReportType.PLATFORM, MajorReportType.DATABASE, MajorReportType.TITLE,
+                                 MajorReportType.ITEM):
+            field_values = tuple(value_pool.intern_field_values(
+                get_report_item_field_values(report_item, major_report_type)).items())
+        else:
+            field_values = ()
+            if self.show_debug: print(
+                f"{self.vendor.name}-{self.report_type}: Unexpected report type")
+
+        performance: PerformanceModel
+        for performance in report_item.performances:
+            month_slot = month_index.get_period_slot(performance.period.begin_date)
+
+            instance: InstanceModel
+            for instance in performance.instances:
+                metric_type = instance.metric_type
+                if metric_type not in metric_row_dict:
+                    metric_row = ReportRow(self.begin_date, self.end_date)
+                    metric_row.metric_type = value_pool.intern(metric_type)
+                    for field, value in field_values:
+                        setattr(metric_row, field, value)
+                    if sort_key is None: sort_key = self.get_sort_key(metric_row, major_report_type)
+                    metric_row.sort_key = sort_key
+
+                    metric_row_dict[metric_type] = metric_row
+                else:
+                    metric_row = metric_row_dict[metric_type]
+
+                metric_row.month_counts.counts[month_slot] += instance.count
+
+                metric_row.total_count += instance.count
+
+        if major_report_type == MajorReportType.ITEM:
+            # Item Components
+            item_component: ItemComponentModel
+            for item_component in report_item.item_components:
+                component_dict = dict.fromkeys(COMPONENT_FIELDS, "")
+                get_scope_field_values(item_component, "component", component_dict)
+                value_pool.intern_field_values(component_dict)
+                components.append(tuple(component_dict[field] for field in COMPONENT_FIELDS))
+
+        self.add_metric_rows(metric_row_dict, components, major_report_type, report_rows)
+
+    @staticmethod
+    def add_metric_rows(metric_row_dict: dict, components: list, major_report_type: MajorReportType,
+                        report_rows: list):
+        """Adds a report item's metric rows to a list of report rows, with a ComponentRow per item component
+
+        :param metric_row_dict: The report item's metric rows, <k = metric_type, v = ReportRow>
+        :param components: The values of the report item's components, ordered like COMPONENT_FIELDS
+        :param major_report_type: The major report type of the report
+        :param report_rows: The list of report rows to add to
+        """
+        for metric_type in metric_row_dict:
+            metric_row = metric_row_dict[metric_type]
 
             if major_report_type == MajorReportType.ITEM:
-                # Item Components
-                item_component: ItemComponentModel
-                for item_component in report_item.item_components:
-                    component_dict = {
-                        "component_title": "",
-                        "component_authors": "",
-                        "component_publication_date": "",
-                        "component_data_type": "",
-                        "component_doi": "",
-                        "component_proprietary_id": "",
-                        "component_isbn": "",
-                        "component_print_issn": "",
-                        "component_online_issn": "",
-                        "component_uri": ""
-                    }
-
-                    if item_component.item_name: component_dict["component_title"] = item_component.item_name
-                    if item_component.data_type: component_dict["component_data_type"] = item_component.data_type
-
-                    # Authors
-                    authors_str = ""
-                    item_contributor: ItemContributorModel
-                    for item_contributor in item_component.item_contributors:
-                        if item_contributor.item_type == "Author":
-                            authors_str += f"{item_contributor.name}"
-                            if item_contributor.identifier:
-                                authors_str += f" ({item_contributor.identifier})"
-                            authors_str += "; "
-                    authors_str.rstrip("; ")
-                    if authors_str: component_dict["component_authors"] = authors_str
-
-                    # Publication date
-                    item_date: TypeValueModel
-                    for item_date in item_component.item_dates:
-                        if item_date.item_type == "Publication_Date" or item_date.item_type == "Pub_Date":
-                            component_dict["component_publication_date"] = item_date.value
-
-                    # Component IDs
-                    item_id: TypeValueModel
-                    for item_id in item_component.item_ids:
-                        item_type = item_id.item_type
-
-                        if item_type == "DOI":
-                            component_dict["component_doi"] = item_id.value
-                        elif item_type == "Proprietary" or item_type == "Proprietary_ID":
-                            component_dict["component_proprietary_id"] = item_id.value
-                        elif item_type == "ISBN":
-                            component_dict["component_isbn"] = item_id.value
-                        elif item_type == "Print_ISSN":
-                            component_dict["component_print_issn"] = item_id.value
-                        elif item_type == "Online_ISSN":
-                            component_dict["component_online_issn"] = item_id.value
-                        elif item_type == "URI":
-                            component_dict["component_uri"] = item_id.value
-
-                    components.append(component_dict)
-
-            for metric_type in metric_row_dict:
-                metric_row = metric_row_dict[metric_type]
-
-                if major_report_type == MajorReportType.ITEM:
-                    if len(components) > 0 and \
-                            (metric_type == "Total_Item_Investigations" or metric_type == "Total_Item_Requests"):
-                        for component in components:
-                            row = copy.copy(metric_row)
-                            row.component_title = component["component_title"]
-                            row.component_authors = component["component_authors"]
-                            row.component_publication_date = component["component_publication_date"]
-                            row.component_data_type = component["component_data_type"]
-                            row.component_doi = component["component_doi"]
-                            row.component_proprietary_id = component["component_proprietary_id"]
-                            row.component_isbn = component["component_isbn"]
-                            row.component_print_issn = component["component_print_issn"]
-                            row.component_online_issn = component["component_online_issn"]
-                            row.component_uri = component["component_uri"]
-                            report_rows.append(row)
-                    else:
-                        report_rows.append(metric_row)
+                if len(components) > 0 and \
+                        (metric_type == "Total_Item_Investigations" or metric_type == "Total_Item_Requests"):
+                    for component in components:
+                        report_rows.append(ComponentRow(metric_row, component))
                 else:
                     report_rows.append(metric_row)
+            else:
+                report_rows.append(metric_row)
+
+    @staticmethod
+    def get_sort_key(report_row, major_report_type: MajorReportType):
+        """Returns the key that a report row is sorted by
+
+        The key is set as the row's sort_key when the row is built, once for all the rows of a report item
 
-        report_rows = self.sort_rows(report_rows, major_report_type)
-        self.save_tsv_files(report_model.report_header, report_rows)
+        :param report_row: The report row
+        :param major_report_type: The major report type of the row's report
+        """
+        if major_report_type == MajorReportType.PLATFORM:
+            return report_row.platform.lower()
+        elif major_report_type == MajorReportType.DATABASE:
+            return report_row.database.lower()
+        elif major_report_type == MajorReportType.TITLE:
+            return report_row.title.lower(), report_row.yop
+        elif major_report_type == MajorReportType.ITEM:
+            return report_row.item.lower()
 
     @staticmethod
     def sort_rows(report_rows: list, major_report_type: MajorReportType) -> list:
         """Sorts the rows of the report
 
+        Rows are sorted by their sort_key, rows without one get theirs from get_sort_key. Lists made of sorted runs,
+        like the ones joined by merge_sorted_rows, are sorted by merging the runs
+
         :param report_rows: The report's rows
         :param major_report_type: The major report type of this report type
         """
-        if major_report_type == MajorReportType.PLATFORM:
-            return sorted(report_rows, key=lambda row: row.platform.lower())
-        elif major_report_type == MajorReportType.DATABASE:
-            return sorted(report_rows, key=lambda row: row.database.lower())
-        elif major_report_type == MajorReportType.TITLE:
-            return sorted(report_rows, key=lambda row: (row.title.lower(), row.yop))
-        elif major_report_type == MajorReportType.ITEM:
-            return sorted(report_rows, key=lambda row: row.item.lower())
+        if major_report_type not in (MajorReportType.PLATFORM, MajorReportType.DATABASE, MajorReportType.TITLE,
+                                     MajorReportType.ITEM):
+            return None
+
+        def get_row_sort_key(report_row):
+            sort_key = report_row.sort_key
+            return sort_key if sort_key is not None else ReportWorker.get_sort_key(report_row, major_report_type)
+
+        return sorted(report_rows, key=get_row_sort_key)
+
+    @staticmethod
+    def merge_sorted_rows(sorted_report_rows: list, major_report_type: MajorReportType) -> list:
+        """Merges lists of report rows that are already sorted into one sorted list
+
+        The lists are joined and sorted again: the sort finds each list as a sorted run and merges the runs, in linear
+        time for a few lists. Rows with the same key keep the order of their lists
+
+        :param sorted_report_rows: The lists of report rows, each sorted by sort_rows
+        :param major_report_type: The major report type of the rows' report
+        """
+        report_rows = []
+        for rows in sorted_report_rows:
+            report_rows += rows
+
+        return ReportWorker.sort_rows(report_rows, major_report_type)
 
     def save_tsv_files(self, report_header, report_rows: list):
         """Saves the TSV file in the target directories
@@ -2460,43 +4461,52 @@ class ReportWorker(QObject):
                                                          self.end_date)
 
         # Save user tsv file
-        if not path.isdir(file_dir):
-            makedirs(file_dir)
+        makedirs(file_dir, exist_ok=True)
 
+        # The files are written atomically and synced to disk before replacing the old files, their directories are
+        # synced at the end of the fetch, so a crash or cancel never leaves a truncated report file to be added to the
+        # database
         file_path = f"{file_dir}{file_name}"
-        file = open(file_path, 'w', encoding="utf-8", newline='')
-        if self.is_special:
-            self.add_report_header_to_file(report_header, file, True)
-        else:
-            self.add_report_header_to_file(report_header, file, False)
+        with GeneralUtils.AtomicFile(file_path, 'w', sync_later=True, encoding="utf-8", newline='') as file:
+            if self.is_special:
+                self.add_report_header_to_file(report_header, file, True)
+            else:
+                self.add_report_header_to_file(report_header, file, False)
+
+            if self.is_yearly:
+                # Save protected tsv file, its rows are written with the user tsv file's rows
+                protected_file_dir = GeneralUtils.get_yearly_file_dir(PROTECTED_DATABASE_FILE_DIR, self.vendor.name,
+                                                                      self.begin_date)
+                if not path.isdir(protected_file_dir):
+                    makedirs(protected_file_dir, exist_ok=True)
+                    if platform.system() == "Windows":
+                        ctypes.windll.kernel32.SetFileAttributesW(PROTECTED_DATABASE_FILE_DIR, 2)  # Hide folder
+
+                protected_file_path = f"{protected_file_dir}{file_name}"
+                with GeneralUtils.AtomicFile(protected_file_path, 'w', sync_later=True, encoding="utf-8",
+                                             newline='') as protected_file:
+                    self.add_report_header_to_file(report_header, protected_file, True)
+
+                    has_report_rows = self.add_report_rows_to_files(report_type, report_rows, self.begin_date,
+                                                                    self.end_date, file, protected_file,
+                                                                    self.is_special, self.special_options)
+
+                self.process_result.protected_file_path = protected_file_path
+                if has_report_rows:
+                    self.process_result.database_rows = self.get_database_rows(report_header, report_rows, file_name)
+            else:
+                has_report_rows = self.add_report_rows_to_file(report_type, report_rows, self.begin_date,
+                                                               self.end_date, file, False, self.is_special,
+                                                               self.special_options)
 
-        if not self.add_report_rows_to_file(report_type, report_rows, self.begin_date, self.end_date, file, False,
-                                            self.is_special, self.special_options):
+        if not has_report_rows:
             self.process_result.completion_status = CompletionStatus.WARNING
 
-        file.close()
         self.process_result.file_name = file_name
         self.process_result.file_dir = file_dir
         self.process_result.file_path = file_path
         self.process_result.year = self.begin_date.toString('yyyy')
 
-        # Save protected tsv file
-        if self.is_yearly:
-            protected_file_dir = GeneralUtils.get_yearly_file_dir(PROTECTED_DATABASE_FILE_DIR, self.vendor.name,
-                                                                  self.begin_date)
-            if not path.isdir(protected_file_dir):
-                makedirs(protected_file_dir)
-                if platform.system() == "Windows":
-                    ctypes.windll.kernel32.SetFileAttributesW(PROTECTED_DATABASE_FILE_DIR, 2)  # Hide folder
-
-            protected_file_path = f"{protected_file_dir}{file_name}"
-            protected_file = open(protected_file_path, 'w', encoding="utf-8", newline='')
-            self.add_report_header_to_file(report_header, protected_file, True)
-            self.add_report_rows_to_file(report_type, report_rows, self.begin_date, self.end_date, protected_file, True)
-
-            protected_file.close()
-            self.process_result.protected_file_path = protected_file_path
-
     @staticmethod
     def add_report_header_to_file(report_header: ReportHeaderModel, file, include_attributes: bool):
         """Adds the report header to a TSV file
@@ -2516,17 +4526,16 @@ class ReportWorker(QObject):
             institution_ids_str += f"{institution_id.value}; "
         tsv_writer.writerow(["Institution_ID", institution_ids_str.rstrip("; ")])
 
-        metric_types_str = ""
         reporting_period_str = ""
         report_filters_str = ""
         for report_filter in report_header.report_filters:
             if report_filter.name == "Metric_Type":
-                metric_types_str += f"{report_filter.value}; "
+                continue
             elif report_filter.name == "Begin_Date" or report_filter.name == "End_Date":
                 reporting_period_str += f"{report_filter.name}={report_filter.value}; "
             else:
                 report_filters_str += f"{report_filter.name}={report_filter.value}; "
-        tsv_writer.writerow(["Metric_Types", metric_types_str.replace("|", "; ").rstrip("; ")])
+        tsv_writer.writerow(["Metric_Types", ReportWorker.get_metric_types_str(report_header)])
         tsv_writer.writerow(["Report_Filters", report_filters_str.rstrip("; ")])
 
         report_attributes_str = ""
@@ -2545,12 +4554,28 @@ class ReportWorker(QObject):
         tsv_writer.writerow(["Created_By", report_header.created_by])
         tsv_writer.writerow([])
 
+    @staticmethod
+    def get_metric_types_str(report_header: ReportHeaderModel) -> str:
+        """Returns the Metric_Types value of a report file's header
+
+        :param report_header: The report header model
+        """
+        metric_types_str = ""
+        for report_filter in report_header.report_filters:
+            if report_filter.name == "Metric_Type":
+                metric_types_str += f"{report_filter.value}; "
+
+        return metric_types_str.replace("|", "; ").rstrip("; ")
+
     @staticmethod
     def add_report_rows_to_file(report_type: str, report_rows: list, begin_date: QDate, end_date: QDate, file,
                                 include_all_attributes: bool, is_special: bool = False,
                                 special_options: SpecialReportOptions = None) -> bool:
         """Adds the report's rows to a TSV file
 
+        The report type's columns are looked up once in REPORT_COLUMNS, then each row is written as a tuple of its
+        values without building a dict per row
+
         :param report_type: The report type
         :param report_rows: The report's rows
         :param begin_date: The first date in the report
@@ -2560,480 +4585,225 @@ class ReportWorker(QObject):
         :param is_special: If this is a special report
         :param special_options: The special options if this is a special report
         """
-        column_names = []
-        row_dicts = []
-
-        if report_type == "PR":
-            column_names += ["Platform"]
-            if is_special:
-                special_options_dict = special_options.__dict__
-                if special_options_dict["data_type"][0]: column_names.append("Data_Type")
-                if special_options_dict["access_method"][0]: column_names.append("Access_Method")
-            elif include_all_attributes:
-                column_names.append("Data_Type")
-                column_names.append("Access_Method")
-
-            row: ReportRow
-            for row in report_rows:
-                row_dict = {"Platform": row.platform}
-                if is_special:
-                    special_options_dict = special_options.__dict__
-                    if special_options_dict["data_type"][0]: row_dict["Data_Type"] = row.data_type
-                    if special_options_dict["access_method"][0]: row_dict["Access_Method"] = row.access_method
-
-                    if not special_options_dict["exclude_monthly_details"][0]:
-                        row_dict.update(row.month_counts)
-                else:
-                    if include_all_attributes:
-                        row_dict["Data_Type"] = row.data_type
-                        row_dict["Access_Method"] = row.access_method
-                    row_dict.update(row.month_counts)
-
-                row_dict.update({"Metric_Type": row.metric_type,
-                                 "Reporting_Period_Total": row.total_count})
-                row_dicts.append(row_dict)
-
-        elif report_type == "PR_P1":
-            column_names += ["Platform"]
+        column_names, row_fields = get_report_columns(report_type, include_all_attributes,
+                                                      special_options if is_special else None)
+        column_names += ["Metric_Type", "Reporting_Period_Total"]
+        include_months = not is_special or not special_options.exclude_monthly_details[0]
+        if include_months:
+            column_names += get_month_index(begin_date, end_date).month_years
 
-            row: ReportRow
-            for row in report_rows:
-                row_dict = {"Platform": row.platform,
-                            "Metric_Type": row.metric_type,
-                            "Reporting_Period_Total": row.total_count}
-                row_dict.update(row.month_counts)
-
-                row_dicts.append(row_dict)
-
-        elif report_type == "DR":
-            column_names += ["Database", "Publisher", "Publisher_ID", "Platform", "Proprietary_ID"]
-            if is_special:
-                special_options_dict = special_options.__dict__
-                if special_options_dict["data_type"][0]: column_names.append("Data_Type")
-                if special_options_dict["access_method"][0]: column_names.append("Access_Method")
-            elif include_all_attributes:
-                column_names.append("Data_Type")
-                column_names.append("Access_Method")
+        tsv_writer = csv.writer(file, delimiter='\t')
+        tsv_writer.writerow(column_names)
 
-            row: ReportRow
-            for row in report_rows:
-                row_dict = {"Database": row.database,
-                            "Publisher": row.publisher,
-                            "Publisher_ID": row.publisher_id,
-                            "Platform": row.platform,
-                            "Proprietary_ID": row.proprietary_id}
-
-                if is_special:
-                    special_options_dict = special_options.__dict__
-                    if special_options_dict["data_type"][0]: row_dict["Data_Type"] = row.data_type
-                    if special_options_dict["access_method"][0]: row_dict["Access_Method"] = row.access_method
-
-                    if not special_options_dict["exclude_monthly_details"][0]:
-                        row_dict.update(row.month_counts)
-                else:
-                    if include_all_attributes:
-                        row_dict["Data_Type"] = row.data_type
-                        row_dict["Access_Method"] = row.access_method
-                    row_dict.update(row.month_counts)
+        if report_type not in REPORT_COLUMNS or len(report_rows) == 0:
+            return False
 
-                row_dict.update({"Metric_Type": row.metric_type,
-                                 "Reporting_Period_Total": row.total_count})
-                row_dicts.append(row_dict)
+        # The row's values in column order, the month counts are added from the row's counts array
+        get_row_values = attrgetter(*row_fields, "metric_type", "total_count")
+        if include_months:
+            tsv_writer.writerows(get_row_values(row) + tuple(row.month_counts.counts) for row in report_rows)
+        else:
+            tsv_writer.writerows(map(get_row_values, report_rows))
+        return True
 
-        elif report_type == "DR_D1" or report_type == "DR_D2":
-            column_names += ["Database", "Publisher", "Publisher_ID", "Platform", "Proprietary_ID"]
+    @staticmethod
+    def add_report_rows_to_files(report_type: str, report_rows: list, begin_date: QDate, end_date: QDate, file,
+                                 protected_file, is_special: bool = False,
+                                 special_options: SpecialReportOptions = None) -> bool:
+        """Adds the report's rows to a user TSV file and to its protected copy with all attributes, in one pass
 
-            row: ReportRow
-            for row in report_rows:
-                row_dict = {"Database": row.database,
-                            "Publisher": row.publisher,
-                            "Publisher_ID": row.publisher_id,
-                            "Platform": row.platform,
-                            "Proprietary_ID": row.proprietary_id,
-                            "Metric_Type": row.metric_type,
-                            "Reporting_Period_Total": row.total_count}
-                row_dict.update(row.month_counts)
-
-                row_dicts.append(row_dict)
-
-        elif report_type == "TR":
-            column_names += ["Title", "Publisher", "Publisher_ID", "Platform", "DOI", "Proprietary_ID", "ISBN",
-                             "Print_ISSN", "Online_ISSN", "URI"]
-            if is_special:
-                special_options_dict = special_options.__dict__
-                if special_options_dict["data_type"][0]: column_names.append("Data_Type")
-                if special_options_dict["section_type"][0]: column_names.append("Section_Type")
-                if special_options_dict["yop"][0]: column_names.append("YOP")
-                if special_options_dict["access_type"][0]: column_names.append("Access_Type")
-                if special_options_dict["access_method"][0]: column_names.append("Access_Method")
-            elif include_all_attributes:
-                column_names.append("Data_Type")
-                column_names.append("Section_Type")
-                column_names.append("YOP")
-                column_names.append("Access_Type")
-                column_names.append("Access_Method")
+        Each row's values are read and converted to text once for both files: the user file's columns are some of the
+        protected file's columns, so its line is joined from the same fields. Rows with values that csv.writer would
+        quote (tabs, quotes and line breaks) or write as empty (None) are written by csv.writer instead
 
-            row: ReportRow
-            for row in report_rows:
-                row_dict = {"Title": row.title,
-                            "Publisher": row.publisher,
-                            "Publisher_ID": row.publisher_id,
-                            "Platform": row.platform,
-                            "DOI": row.doi,
-                            "Proprietary_ID": row.proprietary_id,
-                            "ISBN": row.isbn,
-                            "Print_ISSN": row.print_issn,
-                            "Online_ISSN": row.online_issn,
-                            "URI": row.uri}
-
-                if is_special:
-                    special_options_dict = special_options.__dict__
-                    if special_options_dict["data_type"][0]: row_dict["Data_Type"] = row.data_type
-                    if special_options_dict["section_type"][0]: row_dict["Section_Type"] = row.section_type
-                    if special_options_dict["yop"][0]: row_dict["YOP"] = row.yop
-                    if special_options_dict["access_type"][0]: row_dict["Access_Type"] = row.access_type
-                    if special_options_dict["access_method"][0]: row_dict["Access_Method"] = row.access_method
-
-                    if not special_options_dict["exclude_monthly_details"][0]:
-                        row_dict.update(row.month_counts)
-                else:
-                    if include_all_attributes:
-                        row_dict["Data_Type"] = row.data_type
-                        row_dict["Section_Type"] = row.section_type
-                        row_dict["YOP"] = row.yop
-                        row_dict["Access_Type"] = row.access_type
-                        row_dict["Access_Method"] = row.access_method
-                    row_dict.update(row.month_counts)
-
-                row_dict.update({"Metric_Type": row.metric_type,
-                                 "Reporting_Period_Total": row.total_count})
-                row_dicts.append(row_dict)
-
-        elif report_type == "TR_B1" or report_type == "TR_B2":
-            column_names += ["Title", "Publisher", "Publisher_ID", "Platform", "DOI", "Proprietary_ID", "ISBN",
-                             "Print_ISSN", "Online_ISSN", "URI", "YOP"]
+        :param report_type: The report type
+        :param report_rows: The report's rows
+        :param begin_date: The first date in the report
+        :param end_date: The last date in the report
+        :param file: The user TSV file to write to
+        :param protected_file: The protected TSV file to write to
+        :param is_special: If this is a special report
+        :param special_options: The special options if this is a special report
+        """
+        month_years = get_month_index(begin_date, end_date).month_years
+        column_indexes = get_report_column_indexes(report_type, False, special_options if is_special else None)
+        all_column_names, all_row_fields = get_report_columns(report_type, True)
+        include_months = not is_special or not special_options.exclude_monthly_details[0]
+
+        # The user file's fields, as indexes in the protected file's fields
+        column_count = len(all_row_fields)
+        field_count = column_count + 2 + len(month_years)
+        user_field_indexes = column_indexes + [column_count, column_count + 1]
+        if include_months: user_field_indexes += range(column_count + 2, field_count)
+        is_same_fields = user_field_indexes == list(range(field_count))
 
-            row: ReportRow
-            for row in report_rows:
-                row_dict = {"Title": row.title,
-                            "Publisher": row.publisher,
-                            "Publisher_ID": row.publisher_id,
-                            "Platform": row.platform,
-                            "DOI": row.doi,
-                            "Proprietary_ID": row.proprietary_id,
-                            "ISBN": row.isbn,
-                            "Print_ISSN": row.print_issn,
-                            "Online_ISSN": row.online_issn,
-                            "URI": row.uri,
-                            "YOP": row.yop,
-                            "Metric_Type": row.metric_type,
-                            "Reporting_Period_Total": row.total_count}
-                row_dict.update(row.month_counts)
-
-                row_dicts.append(row_dict)
-
-        elif report_type == "TR_B3":
-            column_names += ["Title", "Publisher", "Publisher_ID", "Platform", "DOI", "Proprietary_ID", "ISBN",
-                             "Print_ISSN", "Online_ISSN", "URI", "YOP", "Access_Type"]
+        tsv_writer = csv.writer(file, delimiter='\t')
+        protected_tsv_writer = csv.writer(protected_file, delimiter='\t')
+        column_names = all_column_names + ["Metric_Type", "Reporting_Period_Total"] + list(month_years)
+        tsv_writer.writerow([column_names[field_index] for field_index in user_field_indexes])
+        protected_tsv_writer.writerow(column_names)
 
-            row: ReportRow
-            for row in report_rows:
-                row_dict = {"Title": row.title,
-                            "Publisher": row.publisher,
-                            "Publisher_ID": row.publisher_id,
-                            "Platform": row.platform,
-                            "DOI": row.doi,
-                            "Proprietary_ID": row.proprietary_id,
-                            "ISBN": row.isbn,
-                            "Print_ISSN": row.print_issn,
-                            "Online_ISSN": row.online_issn,
-                            "URI": row.uri,
-                            "YOP": row.yop,
-                            "Access_Type": row.access_type,
-                            "Metric_Type": row.metric_type,
-                            "Reporting_Period_Total": row.total_count}
-                row_dict.update(row.month_counts)
-
-                row_dicts.append(row_dict)
-
-        elif report_type == "TR_J1" or report_type == "TR_J2":
-            column_names += ["Title", "Publisher", "Publisher_ID", "Platform", "DOI", "Proprietary_ID", "Print_ISSN",
-                             "Online_ISSN", "URI"]
+        if report_type not in REPORT_COLUMNS or len(report_rows) == 0:
+            return False
 
-            row: ReportRow
-            for row in report_rows:
-                row_dict = {"Title": row.title,
-                            "Publisher": row.publisher,
-                            "Publisher_ID": row.publisher_id,
-                            "Platform": row.platform,
-                            "DOI": row.doi,
-                            "Proprietary_ID": row.proprietary_id,
-                            "Print_ISSN": row.print_issn,
-                            "Online_ISSN": row.online_issn,
-                            "URI": row.uri,
-                            "Metric_Type": row.metric_type,
-                            "Reporting_Period_Total": row.total_count}
-                row_dict.update(row.month_counts)
-
-                row_dicts.append(row_dict)
-
-        elif report_type == "TR_J3":
-            column_names += ["Title", "Publisher", "Publisher_ID", "Platform", "DOI", "Proprietary_ID", "Print_ISSN",
-                             "Online_ISSN", "URI", "Access_Type"]
+        get_row_values = attrgetter(*all_row_fields, "metric_type", "total_count")
+        get_user_values = itemgetter(*user_field_indexes)
+        for row in report_rows:
+            values = get_row_values(row) + tuple(row.month_counts.counts)
+            fields = tuple(map(str, values))
+            line = "\t".join(fields)
 
-            row: ReportRow
-            for row in report_rows:
-                row_dict = {"Title": row.title,
-                            "Publisher": row.publisher,
-                            "Publisher_ID": row.publisher_id,
-                            "Platform": row.platform,
-                            "DOI": row.doi,
-                            "Proprietary_ID": row.proprietary_id,
-                            "Print_ISSN": row.print_issn,
-                            "Online_ISSN": row.online_issn,
-                            "URI": row.uri,
-                            "Access_Type": row.access_type,
-                            "Metric_Type": row.metric_type,
-                            "Reporting_Period_Total": row.total_count}
-                row_dict.update(row.month_counts)
-
-                row_dicts.append(row_dict)
-
-        elif report_type == "TR_J4":
-            column_names += ["Title", "Publisher", "Publisher_ID", "Platform", "DOI", "Proprietary_ID", "Print_ISSN",
-                             "Online_ISSN", "URI", "YOP"]
+            if None in values or '"' in line or "\r" in line or "\n" in line or line.count("\t") != field_count - 1:
+                protected_tsv_writer.writerow(values)
+                tsv_writer.writerow(get_user_values(values))
+                continue
 
-            row: ReportRow
-            for row in report_rows:
-                row_dict = {"Title": row.title,
-                            "Publisher": row.publisher,
-                            "Publisher_ID": row.publisher_id,
-                            "Platform": row.platform,
-                            "DOI": row.doi,
-                            "Proprietary_ID": row.proprietary_id,
-                            "Print_ISSN": row.print_issn,
-                            "Online_ISSN": row.online_issn,
-                            "URI": row.uri,
-                            "YOP": row.yop,
-                            "Metric_Type": row.metric_type,
-                            "Reporting_Period_Total": row.total_count}
-                row_dict.update(row.month_counts)
-
-                row_dicts.append(row_dict)
-
-        elif report_type == "IR":
-            column_names += ["Item", "Publisher", "Publisher_ID", "Platform"]
-            if is_special:
-                special_options_dict = special_options.__dict__
-                if special_options_dict["authors"][0]: column_names.append("Authors")
-                if special_options_dict["publication_date"][0]: column_names.append("Publication_Date")
-                if special_options_dict["article_version"][0]: column_names.append("Article_version")
-            elif include_all_attributes:
-                column_names.append("Authors")
-                column_names.append("Publication_Date")
-                column_names.append("Article_version")
-            column_names += ["DOI", "Proprietary_ID", "ISBN", "Print_ISSN", "Online_ISSN", "URI"]
-            if is_special:
-                special_options_dict = special_options.__dict__
-                if special_options_dict["include_parent_details"][0]:
-                    column_names += ["Parent_Title", "Parent_Authors", "Parent_Publication_Date",
-                                     "Parent_Article_Version", "Parent_Data_Type", "Parent_DOI",
-                                     "Parent_Proprietary_ID", "Parent_ISBN", "Parent_Print_ISSN", "Parent_Online_ISSN",
-                                     "Parent_URI"]
-                if special_options_dict["include_component_details"][0]:
-                    column_names += ["Component_Title", "Component_Authors", "Component_Publication_Date",
-                                     "Component_Data_Type", "Component_DOI", "Component_Proprietary_ID",
-                                     "Component_ISBN", "Component_Print_ISSN", "Component_Online_ISSN", "Component_URI"]
-                if special_options_dict["data_type"][0]: column_names.append("Data_Type")
-                if special_options_dict["yop"][0]: column_names.append("YOP")
-                if special_options_dict["access_type"][0]: column_names.append("Access_Type")
-                if special_options_dict["access_method"][0]: column_names.append("Access_Method")
-            elif include_all_attributes:
-                column_names += ["Parent_Title", "Parent_Authors", "Parent_Publication_Date", "Parent_Article_Version",
-                                 "Parent_Data_Type", "Parent_DOI", "Parent_Proprietary_ID", "Parent_ISBN",
-                                 "Parent_Print_ISSN", "Parent_Online_ISSN", "Parent_URI"]
-                column_names += ["Component_Title", "Component_Authors", "Component_Publication_Date",
-                                 "Component_Data_Type", "Component_DOI", "Component_Proprietary_ID", "Component_ISBN",
-                                 "Component_Print_ISSN", "Component_Online_ISSN", "Component_URI"]
-                column_names.append("Data_Type")
-                column_names.append("YOP")
-                column_names.append("Access_Type")
-                column_names.append("Access_Method")
+            protected_file.write(line + "\r\n")
+            file.write(line + "\r\n" if is_same_fields else "\t".join(get_user_values(fields)) + "\r\n")
 
-            row: ReportRow
-            for row in report_rows:
-                row_dict = {"Item": row.item,
-                            "Publisher": row.publisher,
-                            "Publisher_ID": row.publisher_id,
-                            "Platform": row.platform,
-                            "DOI": row.doi,
-                            "Proprietary_ID": row.proprietary_id,
-                            "ISBN": row.isbn,
-                            "Print_ISSN": row.print_issn,
-                            "Online_ISSN": row.online_issn,
-                            "URI": row.uri}
-
-                if is_special:
-                    special_options_dict = special_options.__dict__
-                    if special_options_dict["authors"][0]: row_dict["Authors"] = row.authors
-                    if special_options_dict["publication_date"][0]: row_dict["Publication_Date"] = row.publication_date
-                    if special_options_dict["article_version"][0]: row_dict["Article_version"] = row.article_version
-                    if special_options_dict["include_parent_details"][0]:
-                        row_dict.update({"Parent_Title": row.parent_title,
-                                         "Parent_Authors": row.parent_authors,
-                                         "Parent_Publication_Date": row.parent_publication_date,
-                                         "Parent_Article_Version": row.parent_article_version,
-                                         "Parent_Data_Type": row.parent_data_type,
-                                         "Parent_DOI": row.parent_doi,
-                                         "Parent_Proprietary_ID": row.parent_proprietary_id,
-                                         "Parent_ISBN": row.parent_isbn,
-                                         "Parent_Print_ISSN": row.parent_print_issn,
-                                         "Parent_Online_ISSN": row.parent_online_issn,
-                                         "Parent_URI": row.parent_uri})
-                    if special_options_dict["include_component_details"][0]:
-                        row_dict.update({"Component_Title": row.component_title,
-                                         "Component_Authors": row.component_authors,
-                                         "Component_Publication_Date": row.component_publication_date,
-                                         "Component_Data_Type": row.component_data_type,
-                                         "Component_DOI": row.component_doi,
-                                         "Component_Proprietary_ID": row.component_proprietary_id,
-                                         "Component_ISBN": row.component_isbn,
-                                         "Component_Print_ISSN": row.component_print_issn,
-                                         "Component_Online_ISSN": row.component_online_issn,
-                                         "Component_URI": row.component_uri})
-                    if special_options_dict["data_type"][0]: row_dict["Data_Type"] = row.data_type
-                    if special_options_dict["yop"][0]: row_dict["YOP"] = row.yop
-                    if special_options_dict["access_type"][0]: row_dict["Access_Type"] = row.access_type
-                    if special_options_dict["access_method"][0]: row_dict["Access_Method"] = row.access_method
-
-                    if not special_options_dict["exclude_monthly_details"][0]:
-                        row_dict.update(row.month_counts)
-                else:
-                    if include_all_attributes:
-                        row_dict["Authors"] = row.authors
-                        row_dict["Publication_Date"] = row.publication_date
-                        row_dict["Article_version"] = row.article_version
-                        row_dict.update({"Parent_Title": row.parent_title,
-                                         "Parent_Authors": row.parent_authors,
-                                         "Parent_Publication_Date": row.parent_publication_date,
-                                         "Parent_Article_Version": row.parent_article_version,
-                                         "Parent_Data_Type": row.parent_data_type,
-                                         "Parent_DOI": row.parent_doi,
-                                         "Parent_Proprietary_ID": row.parent_proprietary_id,
-                                         "Parent_ISBN": row.parent_isbn,
-                                         "Parent_Print_ISSN": row.parent_print_issn,
-                                         "Parent_Online_ISSN": row.parent_online_issn,
-                                         "Parent_URI": row.parent_uri})
-                        row_dict.update({"Component_Title": row.component_title,
-                                         "Component_Authors": row.component_authors,
-                                         "Component_Publication_Date": row.component_publication_date,
-                                         "Component_Data_Type": row.component_data_type,
-                                         "Component_DOI": row.component_doi,
-                                         "Component_Proprietary_ID": row.component_proprietary_id,
-                                         "Component_ISBN": row.component_isbn,
-                                         "Component_Print_ISSN": row.component_print_issn,
-                                         "Component_Online_ISSN": row.component_online_issn,
-                                         "Component_URI": row.component_uri})
-                        row_dict["Data_Type"] = row.data_type
-                        row_dict["YOP"] = row.yop
-                        row_dict["Access_Type"] = row.access_type
-                        row_dict["Access_Method"] = row.access_method
-                    row_dict.update(row.month_counts)
-
-                row_dict.update({"Metric_Type": row.metric_type,
-                                 "Reporting_Period_Total": row.total_count})
-                row_dicts.append(row_dict)
-
-        elif report_type == "IR_A1":
-            column_names += ["Item", "Publisher", "Publisher_ID", "Platform", "Authors", "Publication_Date",
-                             "Article_version", "DOI", "Proprietary_ID", "Print_ISSN", "Online_ISSN", "URI",
-                             "Parent_Title", "Parent_Authors", "Parent_Article_Version", "Parent_DOI",
-                             "Parent_Proprietary_ID", "Parent_Print_ISSN", "Parent_Online_ISSN", "Parent_URI",
-                             "Access_Type"]
+        return True
 
-            row: ReportRow
-            for row in report_rows:
-                row_dict = {"Item": row.item,
-                            "Publisher": row.publisher,
-                            "Publisher_ID": row.publisher_id,
-                            "Platform": row.platform,
-                            "Authors": row.authors,
-                            "Publication_Date": row.publication_date,
-                            "Article_version": row.article_version,
-                            "DOI": row.doi,
-                            "Proprietary_ID": row.proprietary_id,
-                            "Print_ISSN": row.print_issn,
-                            "Online_ISSN": row.online_issn,
-                            "URI": row.uri,
-                            "Parent_Title": row.parent_title,
-                            "Parent_Authors": row.parent_authors,
-                            "Parent_Article_Version": row.parent_article_version,
-                            "Parent_DOI": row.parent_doi,
-                            "Parent_Proprietary_ID": row.parent_proprietary_id,
-                            "Parent_Print_ISSN": row.parent_print_issn,
-                            "Parent_Online_ISSN": row.parent_online_issn,
-                            "Parent_URI": row.parent_uri,
-                            "Access_Type": row.access_type,
-                            "Metric_Type": row.metric_type,
-                            "Reporting_Period_Total": row.total_count}
-                row_dict.update(row.month_counts)
-
-                row_dicts.append(row_dict)
-
-        elif report_type == "IR_M1":
-            column_names += ["Item", "Publisher", "Publisher_ID", "Platform", "DOI", "Proprietary_ID", "URI"]
+    def get_database_rows(self, report_header: ReportHeaderModel, report_rows: list, file_name: str) -> tuple:
+        """Returns (report, rows) with the database rows of the report's protected file, or None if they can't be made
 
-            row: ReportRow
-            for row in report_rows:
-                row_dict = {"Item": row.item,
-                            "Publisher": row.publisher,
-                            "Publisher_ID": row.publisher_id,
-                            "Platform": row.platform,
-                            "DOI": row.doi,
-                            "Proprietary_ID": row.proprietary_id,
-                            "URI": row.uri,
-                            "Metric_Type": row.metric_type,
-                            "Reporting_Period_Total": row.total_count}
-                row_dict.update(row.month_counts)
-
-                row_dicts.append(row_dict)
+        The rows are the values ManageDB.read_report_file would read from the file, as tuples in the order of the
+        report table's fields: one row per report row and month with a count. The database is updated with them
+        after the fetch without reading and parsing the file again
 
-        column_names += ["Metric_Type", "Reporting_Period_Total"]
+        :param report_header: The report header model
+        :param report_rows: The report's sorted rows, as written to the protected file
+        :param file_name: The name of the protected file
+        """
+        report = str(report_header.report_id).strip()
+        if report not in ALL_REPORTS or report not in REPORT_COLUMNS: return None
+
+        # The fields after the report's own fields, their order is used to fill in each row's values below
+        table_field_names = [field[NAME_KEY] for field in ManageDB.get_report_fields_list(report)]
+        if table_field_names[-len(ALL_REPORT_FIELDS):] != \
+                ["metric_type", "vendor", "year", "month", "metric", "updated_on", "file"]:
+            return None
+
+        # The report's own fields, from the protected file's columns. Fields without a column are empty
+        column_row_fields = {column_name.lower(): row_field for column_name, row_field, option
+                             in REPORT_COLUMNS[report]}
+        row_fields = [column_row_fields[field_name] for field_name in table_field_names[:-len(ALL_REPORT_FIELDS)]
+                      if field_name in column_row_fields]
+        get_row_values = attrgetter(*row_fields, "metric_type")
+        value_indexes = []
+        for field_name in table_field_names[:-len(ALL_REPORT_FIELDS) + 1]:
+            if field_name == "metric_type":
+                value_indexes.append(len(row_fields))
+            elif field_name in column_row_fields:
+                value_indexes.append(row_fields.index(column_row_fields[field_name]))
+            else:
+                value_indexes.append(len(row_fields) + 1)  # The "" added to the values
+        get_table_values = itemgetter(*value_indexes)
+        is_same_order = value_indexes == list(range(len(row_fields) + 1))
+
+        # The months of the file's year, by their slot in the rows' counts
+        year = self.begin_date.toString('yyyy')
+        month_numbers = []
+        month_date = QDate(self.begin_date.year(), self.begin_date.month(), 1)
+        for slot in range(len(get_month_index(self.begin_date, self.end_date).month_years)):
+            month_numbers.append(month_date.month() if month_date.year() == self.begin_date.year() else None)
+            month_date = month_date.addMonths(1)
+
+        metric_types_str = self.get_metric_types_str(report_header).strip()
+        updated_on = "" if report_header.created is None else str(report_header.created).strip()
+        vendor_name = self.vendor.name
+
+        database_rows = []
+        for row in report_rows:
+            values = tuple(["" if value is None else value if type(value) is str else str(value)
+                            for value in get_row_values(row)])
+            if not values[-1]:  # Rows without a metric type use the header's metric types
+                values = values[:-1] + (metric_types_str,)
+            if not is_same_order:
+                values = get_table_values(values + ("",))
+
+            for month_number, count in zip(month_numbers, row.month_counts.counts):
+                if count > 0 and month_number is not None:
+                    database_rows.append(values + (vendor_name, year, month_number, count, updated_on, file_name))
+
+        return report, database_rows
+
+    def get_json_file_path(self, file_name_suffix: str = "") -> str:
+        """Returns the path of the report's raw JSON file, creating its directory if needed
+
+        :param file_name_suffix: Added to the end of the file name, e.g. to tell date range shards apart
+        """
+        file_dir = f"{JSON_ARCHIVE_FILE_DIR}{self.begin_date.toString('yyyy')}/{self.vendor.name}/"
+        file_name = f"{self.begin_date.toString('yyyy')}_{self.vendor.name}_{self.report_type}{file_name_suffix}.json"
 
-        if is_special:
-            special_options_dict = special_options.__dict__
-            if not special_options_dict["exclude_monthly_details"][0]:
-                column_names += get_month_years(begin_date, end_date)
-        else:
-            column_names += get_month_years(begin_date, end_date)
+        makedirs(file_dir, exist_ok=True)
 
-        tsv_dict_writer = csv.DictWriter(file, column_names, delimiter='\t')
-        tsv_dict_writer.writeheader()
+        return f"{file_dir}{file_name}"
 
-        if len(row_dicts) == 0:
-            return False
+    def open_json_file(self, file_name_suffix: str = ""):
+        """Opens the report's raw JSON file for writing, compressed according to the json_archive_compression setting
 
-        tsv_dict_writer.writerows(row_dicts)
-        return True
+        :param file_name_suffix: Added to the end of the file name, e.g. to tell date range shards apart
+        """
+        return open_archived_json_file(self.get_json_file_path(file_name_suffix),
+                                       self.settings.json_archive_compression,
+                                       self.settings.json_archive_compression_level)
 
-    def save_json_file(self, json_string: str):
+    def save_json_file(self, json_string: str, file_name_suffix: str = ""):
         """Saves a raw JSON file of the report
 
         :param json_string: The JSON string
+        :param file_name_suffix: Added to the end of the file name, e.g. to tell date range shards apart
         """
-        file_dir = f"{PROTECTED_DATABASE_FILE_DIR}_json/{self.begin_date.toString('yyyy')}/{self.vendor.name}/"
-        file_name = f"{self.begin_date.toString('yyyy')}_{self.vendor.name}_{self.report_type}.json"
-        file_path = f"{file_dir}{file_name}"
-
-        if not path.isdir(file_dir):
-            makedirs(file_dir)
-
-        json_file = open(file_path, 'w', encoding="utf-8")
-        json_file.write(json_string)
-        json_file.close()
+        with self.open_json_file(file_name_suffix) as json_file:
+            json_file.write(json_string)
 
     def notify_worker_finished(self):
         """Notifies any listeners that this worker has finished"""
         self.worker_finished_signal.emit(self.worker_id)
 
+    def set_cancelling(self):
+        """Sets the worker to a cancelling state, stopping it if it's still waiting to send its request"""
+        self.is_cancelling = True
+
+
+def process_report_json(worker_id: str, report_type: str, request_data: RequestData, json_sources: list,
+                        add_to_database: bool = False) -> ProcessResult:
+    """Converts fetched report JSON into report rows and saves them as TSV files. This runs in a report process
+
+    Exceptions are raised to the report worker that sent the report, which handles them like its own
+
+    :param worker_id: The ID of the report worker that fetched the report
+    :param report_type: The report type
+    :param request_data: The request data of the report worker
+    :param json_sources: One per date range shard in date order, the report's JSON string, or the path of its raw JSON
+        file for yearly reports
+    :param add_to_database: Add a yearly report's protected file to the database, taking turns with the fetch's
+        database writer
+    :returns: The report's process result, with the files written that the fetch syncs to disk when it finishes. It
+        has no rows, only the report's status and file paths are sent back
+    """
+    report_worker = ReportWorker(worker_id, report_type, request_data)
+    shard_results = []
+    for shard_index, json_source in enumerate(json_sources):
+        json_string = read_archived_json(json_source) if report_worker.is_yearly else json_source
+        try:
+            shard_results.append(report_worker.read_report_rows(json_string))
+        except RetryLaterException as e:
+            e.shard_index = shard_index
+            raise
+    if len(shard_results) > 1:
+        report_worker.save_report(*report_worker.merge_shard_results(shard_results))
+    else:
+        report_worker.save_report(*shard_results[0])
+
+    database_file = report_worker.get_database_file()
+    if add_to_database and database_file is not None:
+        ManageDB.update_settings(request_data.settings)
+        with ManageDB.database_write_lock:
+            ManageDB.insert_database_file(database_file, emit_signal=False)
+        report_worker.process_result.is_added_to_database = True
+
+    report_worker.process_result.unsynced_file_paths = GeneralUtils.take_unsynced_files()
+    return report_worker.process_result
+
 # El Psy Kongroo
@@ -3,12 +3,29 @@ import shlex
 import subprocess
 import platform
 import csv
-from typing import Sequence, Any
+import json
+import os
+import threading
+from typing import Sequence, Any, Callable
 from os import path, makedirs, system
 from PyQt5.QtWidgets import QWidget, QMessageBox, QFileDialog
 from PyQt5.QtCore import QDate
 from Constants import *
 
+# The faster JSON backends are only available if their packages are installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
 main_window: QWidget = None
 
 
@@ -17,13 +34,125 @@ class JsonModel:
         raise NotImplementedError("from_json method is not implemented")
 
 
-def save_json_file(file_dir: str, file_name: str, json_string: str):
+class AtomicFile:
+    """A file opened for writing that replaces the file at its path only when it's closed
+
+    The data is written to a temporary file next to the target, which is renamed over the target when the file is
+    closed. A crash or cancel while writing leaves the old file (or no file) at the path, never a truncated one. Use it
+    as a context manager, the temporary file is discarded if the block raises an exception.
+
+    :param file_path: The path of the file
+    :param mode: The mode to open the temporary file in, a write mode
+    :param open_file: Opens the temporary file, called with its path, the mode and open_kwargs
+    :param sync_later: Leave syncing the file's directory to sync_written_files, e.g. once per fetch, instead of
+        syncing it when closed. The file itself is still synced before it replaces the file at its path
+    :param open_kwargs: Passed to open_file, e.g. encoding and newline
+    """
+    def __init__(self, file_path: str, mode: str = 'w', open_file: Callable = open, sync_later: bool = False,
+                 **open_kwargs):
+        self.file_path = file_path
+        self.temp_file_path = f"{file_path}.{os.getpid()}-{threading.get_ident()}.tmp"
+        self.sync_later = sync_later
+        self.file = open_file(self.temp_file_path, mode, **open_kwargs)
+        self.is_finished = False
+
+    def __getattr__(self, name: str):
+        return getattr(self.file, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+    def close(self):
+        """Closes the file, replacing the file at its path"""
+        if self.is_finished: return
+        self.is_finished = True
+
+        self.file.close()
+        sync_file(self.temp_file_path)
+        os.replace(self.temp_file_path, self.file_path)
+        if self.sync_later:
+            add_unsynced_files([self.file_path])
+        else:
+            sync_file(path.dirname(path.abspath(self.file_path)), True)
+
+    def discard(self):
+        """Closes the file and removes its temporary file, leaving the file at its path unchanged"""
+        if self.is_finished: return
+        self.is_finished = True
+
+        try:
+            self.file.close()
+        finally:
+            if path.isfile(self.temp_file_path): os.remove(self.temp_file_path)
+
+
+_unsynced_file_paths = set()  # Files written with sync_later whose directories sync_written_files has not synced yet
+_unsynced_file_paths_lock = threading.Lock()
+
+
+def add_unsynced_files(file_paths: Sequence[str]):
+    """Adds files whose directories are to be synced to disk by sync_written_files, e.g. files written by another
+    process
+
+    :param file_paths: The paths of the files
+    """
+    with _unsynced_file_paths_lock:
+        _unsynced_file_paths.update(file_paths)
+
+
+def take_unsynced_files() -> list:
+    """Returns the files whose directories wait to be synced by sync_written_files, removing them from the waiting
+    files"""
+    with _unsynced_file_paths_lock:
+        file_paths = list(_unsynced_file_paths)
+        _unsynced_file_paths.clear()
+    return file_paths
+
+
+def sync_file(file_path: str, is_dir: bool = False):
+    """Flushes a file or directory to disk. Directories are only synced where they can be opened, not on Windows
+
+    :param file_path: The path of the file or directory
+    :param is_dir: If the path is a directory, syncing it makes the renames in it durable
+    """
+    if is_dir and platform.system() == "Windows": return
+
+    file_descriptor = os.open(file_path, os.O_RDONLY if is_dir else os.O_RDWR)
     try:
-        if not path.isdir(file_dir):
-            makedirs(file_dir)
-        file = open(file_dir + file_name, 'w')
-        file.write(json_string)
-        file.close()
+        os.fsync(file_descriptor)
+    finally:
+        os.close(file_descriptor)
+
+
+def sync_written_files():
+    """Flushes the directories of the files written with sync_later to disk, so the renames of the files, which were
+    synced when closed, survive a power loss. Each directory is synced once however many files were written in it"""
+    file_dirs = {path.dirname(path.abspath(file_path)) for file_path in take_unsynced_files()}
+    for file_dir in file_dirs:
+        try:
+            sync_file(file_dir, True)
+        except OSError as e:
+            print(e)
+
+
+def save_json_file(file_dir: str, file_name: str, json_string: str, sync_later: bool = False):
+    """Saves a JSON file atomically
+
+    :param file_dir: The directory of the file, created if missing
+    :param file_name: The name of the file
+    :param json_string: The JSON string
+    :param sync_later: Leave syncing the file to disk to sync_written_files
+    """
+    try:
+        makedirs(file_dir, exist_ok=True)
+        with AtomicFile(file_dir + file_name, 'w', sync_later=sync_later) as file:
+            file.write(json_string)
     except IOError as e:
         print(e)
 
@@ -40,6 +169,39 @@ def read_json_file(file_path: str) -> str:
         return json_string
 
 
+_json_loaders = {"json": json.loads}  # <k = JSON backend, v = loads function> Only the installed backends
+if orjson is not None: _json_loaders["orjson"] = orjson.loads
+if simdjson is not None: _json_loaders["simdjson"] = simdjson.loads
+if ujson is not None: _json_loaders["ujson"] = ujson.loads
+_json_loaders["auto"] = next(_json_loaders[json_backend] for json_backend in JSON_BACKENDS
+                             if json_backend in _json_loaders)
+
+
+def get_json_backends() -> list:
+    """Returns the names of the installed JSON backends, fastest first"""
+    return [json_backend for json_backend in JSON_BACKENDS if json_backend != "auto" and json_backend in _json_loaders]
+
+
+def json_loads(json_string, json_backend: str = JSON_BACKEND) -> Any:
+    """Decodes a JSON document with a JSON backend, like json.loads
+
+    Falls back to the json module if the backend is not installed. Documents that a faster backend rejects, e.g.
+    with NaN values, are decoded again with the json module, so invalid documents give the json module's error
+    whatever backend is used.
+
+    :param json_string: The JSON document, as str or UTF-8 bytes
+    :param json_backend: One of JSON_BACKENDS
+    """
+    loads = _json_loaders.get(json_backend, json.loads)
+
+    if loads is json.loads: return json.loads(json_string)
+
+    try:
+        return loads(json_string)
+    except (ValueError, OverflowError):
+        return json.loads(json_string)
+
+
 def show_message(message: str):
     message_box = QMessageBox(main_window)
     message_box.setMinimumSize(800, 800)
@@ -159,11 +321,7 @@ def save_data_as_tsv(file_name: str, data: Sequence[Any]):
 
     :param file_name: the name and location to save the results at
     :param data: the data to save in the file"""
-    file = open(file_name, 'w', newline="", encoding='utf-8')
-    if file.mode == 'w':
+    with AtomicFile(file_name, 'w', newline="", encoding='utf-8') as file:
         output = csv.writer(file, delimiter='\t', quotechar='\"')
         for row in data:
-            output.writerow(row)
-        file.close()
-    else:
-        print('Error: could not open file ' + file_name)
\ No newline at end of file
+            output.writerow(row)
\ No newline at end of file
@@ -0,0 +1,240 @@
+"""This module fetches reports without the GUI, e.g. from cron on a server without a display.
+
+It loads the saved vendors and settings and runs the same vendor and report workers as the Fetch Reports tab. Reports
+are saved as TSV (and raw JSON) files, and yearly reports are added to the database. Progress is written to stdout as
+one JSON object per line, and the exit code tells if every report was fetched.
+
+Example, run from the program's directory::
+
+    python HeadlessFetch.py --year 2019 --vendors "Vendor A" "Vendor B"
+    python HeadlessFetch.py --begin-date 2020-01 --end-date 2020-06 --reports PR TR_J1 --output-dir ./other_reports/
+
+Exit codes:
+
+- 0: All reports were fetched (some may have warnings, e.g. no usage available)
+- 1: Some vendors or reports failed or were cancelled
+- 2: Invalid arguments, vendors or report types
+"""
+
+import argparse
+import json
+import signal
+import sys
+from os import path
+from PyQt5.QtCore import QCoreApplication, QDate, QTimer
+
+import GeneralUtils
+import ManageDB
+from Constants import *
+from FetchData import FetchReportsAbstract, ProcessResult, RequestData
+from ManageVendors import Vendor
+from Settings import SettingsModel
+
+
+class HeadlessFetchRunner(FetchReportsAbstract):
+    """This fetches reports using the fetch workers, writing progress as JSON lines instead of updating the UI
+
+    :param vendors: The vendors to fetch reports from
+    :param settings: The system's user settings
+    :param add_to_database: Add the fetched yearly reports to the database
+    """
+    def __init__(self, vendors: list, settings: SettingsModel, add_to_database: bool = True):
+        super().__init__(vendors, settings, None)
+        self.add_to_database = add_to_database
+        self.exit_code = HEADLESS_EXIT_SUCCESS
+
+    def update_vendors_ui(self):
+        pass
+
+    def start_progress_dialog(self, window_title: str):
+        self.write_progress("started", vendors=self.total_processes, begin_date=self.begin_date.toString("yyyy-MM"),
+                            end_date=self.end_date.toString("yyyy-MM"), save_dir=self.save_dir)
+
+    def fetch(self, request_data_list: list, begin_date: QDate, end_date: QDate, save_dir: str):
+        """Starts fetching reports, the results are written as progress lines
+
+        :param request_data_list: The request data of each vendor
+        :param begin_date: The begin date of the requests
+        :param end_date: The end date of the requests
+        :param save_dir: The directory where the reports are saved
+        """
+        self.begin_date = begin_date
+        self.end_date = end_date
+        self.save_dir = save_dir
+        self.is_yearly_fetch = save_dir == self.settings.yearly_directory
+        self.selected_data = request_data_list
+        self.total_processes = len(request_data_list)
+
+        self.start_progress_dialog("")
+        self.start_fetching()
+
+    def update_results_ui(self, vendor: Vendor, vendor_result: ProcessResult = None, report_results: list = None):
+        if vendor_result is None:
+            self.write_progress("vendor_started", vendor=vendor.name)
+            return
+
+        if vendor_result.completion_status in (CompletionStatus.FAILED, CompletionStatus.CANCELLED):
+            self.exit_code = HEADLESS_EXIT_FAILED
+
+        reports = []
+        process_result: ProcessResult
+        for process_result in report_results:
+            if process_result.completion_status in (CompletionStatus.FAILED, CompletionStatus.CANCELLED):
+                self.exit_code = HEADLESS_EXIT_FAILED
+            reports.append({"report_type": process_result.report_type,
+                            "status": process_result.completion_status.name,
+                            "message": process_result.message,
+                            "file": process_result.file_path})
+
+        self.write_progress("vendor_finished", vendor=vendor.name, status=vendor_result.completion_status.name,
+                            message=vendor_result.message, reports=reports, completed=self.completed_processes,
+                            total=self.total_processes)
+
+    def start_updating_database(self) -> bool:
+        self.write_progress("database_started")
+        return super().start_updating_database()
+
+    def on_database_file_added(self, file_name: str):
+        self.write_progress("database_file_added", file=file_name)
+
+    def finish_updating_database(self):
+        """Finishes up the fetch, quitting the application with the exit code"""
+        self.is_updating_database = False
+
+        self.write_progress("finished", exit_code=self.exit_code)
+        QCoreApplication.exit(self.exit_code)
+
+    def cancel_workers(self):
+        """Stops starting new requests, waiting for the started requests to finish"""
+        if self.total_processes == 0: return
+
+        self.write_progress("cancelling")
+        self.exit_code = HEADLESS_EXIT_FAILED
+        super().cancel_workers()
+
+    @staticmethod
+    def write_progress(event: str, **values):
+        """Writes a progress event to stdout as one JSON object per line
+
+        :param event: The name of the event
+        :param values: The event's values
+        """
+        print(json.dumps({"event": event, **values}), flush=True)
+
+
+def load_settings() -> SettingsModel:
+    """Loads the saved settings, using the default settings if none are saved"""
+    json_dict = json.loads(GeneralUtils.read_json_file(SETTINGS_FILE_DIR + SETTINGS_FILE_NAME))
+    return SettingsModel.from_json(json_dict)
+
+
+def load_vendors() -> list:
+    """Loads the saved vendors"""
+    return [Vendor.from_json(json_dict) for json_dict in json.loads(GeneralUtils.read_json_file(VENDORS_FILE_PATH))]
+
+
+def parse_arguments(arguments: list) -> argparse.Namespace:
+    """Parses the command line arguments
+
+    :param arguments: The command line arguments, without the program name
+    """
+    parser = argparse.ArgumentParser(description="Fetches COUNTER 5 reports from the saved SUSHI vendors without the "
+                                                 "GUI. Progress is written to stdout as JSON lines.")
+    date_group = parser.add_mutually_exclusive_group(required=True)
+    date_group.add_argument("--year", type=int, help="Fetch all the available reports for one year")
+    date_group.add_argument("--begin-date", help="The first month to fetch, yyyy-MM")
+    parser.add_argument("--end-date", help="The last month to fetch, yyyy-MM. Required with --begin-date")
+    parser.add_argument("--vendors", nargs="+", metavar="VENDOR", help="The vendors to fetch, all SUSHI vendors if "
+                                                                       "not set")
+    parser.add_argument("--reports", nargs="+", metavar="REPORT_TYPE", choices=ALL_REPORTS,
+                        help="The report types to fetch, all report types if not set")
+    parser.add_argument("--output-dir", help="Where to save non-yearly reports, the other directory setting if not "
+                                             "set. Yearly reports are always saved in the yearly directory")
+    parser.add_argument("--only-missing", action="store_true", help="Only fetch reports that are missing or failed "
+                                                                    "in the last fetches of the same date range")
+    parser.add_argument("--no-database", action="store_true", help="Don't add the fetched yearly reports to the "
+                                                                   "database")
+    parser.add_argument("--debug", action="store_true", help="Show debug messages, mixed with the progress lines")
+
+    args = parser.parse_args(arguments)
+    if args.begin_date is not None and args.end_date is None:
+        parser.error("--end-date is required with --begin-date")
+
+    return args
+
+
+def main(arguments: list = None) -> int:
+    """Runs a headless fetch, returning the exit code
+
+    :param arguments: The command line arguments, without the program name
+    """
+    args = parse_arguments(sys.argv[1:] if arguments is None else arguments)
+
+    app = QCoreApplication(sys.argv)
+
+    settings = load_settings()
+    settings.show_debug_messages = args.debug
+    ManageDB.update_settings(settings)
+    ManageDB.first_time_setup()
+
+    runner = HeadlessFetchRunner(load_vendors(), settings, not args.no_database)
+
+    if args.year is not None:
+        begin_date = QDate(args.year, 1, 1)
+        end_date = QDate(args.year, 12, 1)
+        current_date = QDate.currentDate()
+        if args.year == current_date.year(): end_date = QDate(args.year, max(current_date.month() - 1, 1), 1)
+    else:
+        begin_date = QDate.fromString(args.begin_date, "yyyy-MM")
+        end_date = QDate.fromString(args.end_date, "yyyy-MM")
+    if not begin_date.isValid() or not end_date.isValid() or begin_date > end_date:
+        runner.write_progress("error", message="Invalid date range")
+        return HEADLESS_EXIT_INVALID_ARGUMENTS
+
+    vendors = runner.vendors
+    if args.vendors is not None:
+        vendors = [vendor for vendor in runner.vendors if vendor.name in args.vendors]
+        unknown_vendor_names = set(args.vendors) - set(vendor.name for vendor in vendors)
+        if len(unknown_vendor_names) > 0:
+            runner.write_progress("error", message="Unknown or non-SUSHI vendors",
+                                  vendors=sorted(unknown_vendor_names))
+            return HEADLESS_EXIT_INVALID_ARGUMENTS
+    if len(vendors) == 0:
+        runner.write_progress("error", message="Vendor list is empty")
+        return HEADLESS_EXIT_INVALID_ARGUMENTS
+
+    report_types = args.reports if args.reports is not None else ALL_REPORTS
+    if runner.is_yearly_range(begin_date, end_date):
+        save_dir = settings.yearly_directory
+    elif args.output_dir:
+        save_dir = path.abspath(args.output_dir) + path.sep
+    else:
+        save_dir = settings.other_directory
+
+    request_data_list = []
+    for vendor in vendors:
+        vendor_report_types = report_types
+        if args.only_missing:
+            vendor_report_types = runner.fetch_journal.get_missing_report_types(vendor.name, report_types,
+                                                                                begin_date, end_date)
+            if len(vendor_report_types) == 0: continue
+
+        request_data_list.append(RequestData(vendor, vendor_report_types, begin_date, end_date, save_dir, settings))
+    if len(request_data_list) == 0:
+        runner.write_progress("finished", exit_code=HEADLESS_EXIT_SUCCESS,
+                              message="All reports have already been fetched")
+        return HEADLESS_EXIT_SUCCESS
+
+    # Finish the started requests on Ctrl+C or when cron's job is terminated
+    signal.signal(signal.SIGINT, lambda signal_number, frame: runner.cancel_workers())
+    signal.signal(signal.SIGTERM, lambda signal_number, frame: runner.cancel_workers())
+    signal_timer = QTimer()  # Python only handles signals while it's running, not while waiting in Qt's event loop
+    signal_timer.timeout.connect(lambda: None)
+    signal_timer.start(500)
+
+    runner.fetch(request_data_list, begin_date, end_date, save_dir)
+    return app.exec_()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""This module compares the speed of the installed JSON backends on recorded vendor responses.
+
+The recorded responses are the raw JSON files saved in the JSON archive when yearly reports are fetched. Each backend
+decodes every file, and its result is checked against the json module's.
+
+Example, run from the program's directory::
+
+    python JsonBenchmark.py
+    python JsonBenchmark.py --year 2019 --vendor "Vendor A" --repeat 5
+    python JsonBenchmark.py path/to/2019_Vendor_TR.json path/to/2019_Vendor_IR.json.gz
+"""
+
+import argparse
+import sys
+import time
+
+import GeneralUtils
+from Constants import *
+from FetchData import get_archived_json_files, read_archived_json
+
+
+def benchmark_json_backend(json_backend: str, json_strings: list, repeat: int) -> float:
+    """Returns the best time of a JSON backend to decode all the JSON documents (seconds)
+
+    :param json_backend: One of JSON_BACKENDS
+    :param json_strings: The JSON documents
+    :param repeat: The number of times to decode the documents, the fastest time is used
+    """
+    best_time = None
+    for i in range(repeat):
+        start_time = time.perf_counter()
+        for json_string in json_strings:
+            GeneralUtils.json_loads(json_string, json_backend)
+        elapsed_time = time.perf_counter() - start_time
+        if best_time is None or elapsed_time < best_time: best_time = elapsed_time
+
+    return best_time
+
+
+def parse_arguments(arguments: list) -> argparse.Namespace:
+    """Parses the command line arguments
+
+    :param arguments: The command line arguments, without the program name
+    """
+    parser = argparse.ArgumentParser(description="Compares the speed of the installed JSON backends on the raw JSON "
+                                                 "files of fetched reports.")
+    parser.add_argument("files", nargs="*", metavar="FILE", help="The JSON files to decode, all the files in the JSON "
+                                                                 "archive if not set")
+    parser.add_argument("--year", type=int, help="Only use the archived files of this year")
+    parser.add_argument("--vendor", help="Only use the archived files of this vendor")
+    parser.add_argument("--repeat", type=int, default=3, help="How many times to decode the files, the fastest time "
+                                                              "is shown")
+
+    return parser.parse_args(arguments)
+
+
+def main(arguments: list = None) -> int:
+    """Runs the benchmark, returning the exit code
+
+    :param arguments: The command line arguments, without the program name
+    """
+    args = parse_arguments(sys.argv[1:] if arguments is None else arguments)
+
+    file_paths = args.files if args.files else get_archived_json_files(args.year, args.vendor)
+    if len(file_paths) == 0:
+        print(f"No JSON files found in {JSON_ARCHIVE_FILE_DIR}")
+        return 1
+
+    json_strings = [read_archived_json(file_path) for file_path in file_paths]
+    total_mb = sum(len(json_string.encode("utf-8")) for json_string in json_strings) / 1024 / 1024
+    print(f"{len(json_strings)} files, {total_mb:.1f} MB, best of {args.repeat}")
+
+    expected_values = [GeneralUtils.json_loads(json_string, "json") for json_string in json_strings]
+    json_time = None
+    for json_backend in reversed(GeneralUtils.get_json_backends()):  # The json module first, to compare against
+        is_same = all(GeneralUtils.json_loads(json_string, json_backend) == expected_value
+                      for json_string, expected_value in zip(json_strings, expected_values))
+        backend_time = benchmark_json_backend(json_backend, json_strings, args.repeat)
+        if json_time is None: json_time = backend_time
+
+        print(f"{json_backend:>10}: {backend_time:8.3f} s {total_mb / backend_time:8.1f} MB/s "
+              f"{json_time / backend_time:6.2f}x" + ("" if is_same else "  DIFFERENT RESULTS"))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,5 @@
 import locale
+import multiprocessing
 import sys
 from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import QApplication, QMainWindow, QWidget, QFrame, QHBoxLayout, QPushButton
@@ -37,6 +38,7 @@ if hasattr(Qt, 'AA_UseHighDpiPixmaps'):
     QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps, True)
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # Report processes start the executable again when it's frozen by pyinstaller
     locale.setlocale(locale.LC_ALL, 'en_US.UTF-8')
 
     app = QApplication(sys.argv)
@@ -1,5 +1,10 @@
 import sqlite3
 import os
+import multiprocessing
+import queue
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from typing import Tuple, Dict, Union
 from PyQt5.QtCore import Qt, QObject, QThread, pyqtSignal
 from PyQt5.QtWidgets import QDialog, QVBoxLayout, QLabel
@@ -24,6 +29,17 @@ class ManageDBSignalHandler(QObject):
 
 managedb_signal_handler = ManageDBSignalHandler()
 
+# Held while adding fetched reports to the database. The report processes share it, so only one writes at a time
+database_write_lock = multiprocessing.get_context("spawn").Lock()
+
+
+def set_database_write_lock(lock):
+    """Sets the database write lock, e.g. to the fetch's lock in a report process
+
+    :param lock: the lock"""
+    global database_write_lock
+    database_write_lock = lock
+
 
 class ManageDBSettingsHandler:
     """Class for holding the settings for ManageDB"""
@@ -501,11 +517,24 @@ def insert_single_file(file_path: str, vendor: str, year: int, emit_signal: bool
     :param emit_signal: whether to emit a signal upon completion"""
     file, report, read_data = read_report_file(file_path, vendor, year)
     delete, delete_data, replace, replace_data = replace_sql_text(file, report, read_data)
+    insert_report_rows(file, report, replace_data, emit_signal)
+
+
+def insert_report_rows(file_name: str, report: str, rows: Sequence[Sequence[Any]], emit_signal: bool = True):
+    """Inserts a report file's rows into the database, replacing the rows from the same file
+
+    The rows of freshly fetched reports are inserted this way without reading their file
+
+    :param file_name: the name of the file the rows are from
+    :param report: the kind of the report
+    :param rows: the values of each row, in the order of the report table's fields
+    :param emit_signal: whether to emit a signal upon completion"""
+    delete, delete_data, replace, replace_data = replace_sql_text(file_name, report, ())
 
     connection = create_connection(DATABASE_LOCATION)
     if connection is not None:
         run_sql(connection, delete, delete_data, emit_signal=False)
-        run_sql(connection, replace, replace_data, emit_signal=False)
+        run_sql(connection, replace, rows, emit_signal=False)
         connection.close()
         if emit_signal:  # only emit the signal after the delete and replace operations both finish
             managedb_signal_handler.emit_database_changed_signal()
@@ -513,6 +542,41 @@ def insert_single_file(file_path: str, vendor: str, year: int, emit_signal: bool
         print('Error, no connection')
 
 
+def insert_database_file(file: Dict[str, Any], emit_signal: bool = True):
+    """Inserts a report or cost file's data into the database
+
+    :param file: a file to insert into the database, as in UpdateDatabaseWorker's files
+    :param emit_signal: whether to emit a signal upon completion"""
+    file_name = os.path.basename(file['file'])
+    if file.get('rows') is not None:  # rows of a fetched report, the file doesn't need to be read
+        insert_report_rows(file_name, file['report'], file['rows'], emit_signal)
+    elif not file_name[:-4].endswith(COST_TABLE_SUFFIX):
+        insert_single_file(file['file'], file['vendor'], file['year'], emit_signal)
+    else:
+        insert_single_cost_file(file['report'], file['file'], emit_signal)
+
+
+def read_database_file(file: Dict[str, Any]) -> Tuple[Sequence[Tuple[str, Sequence[Sequence[Any]]]], int]:
+    """Reads a report or cost file and makes the SQL statements to insert its data into the database
+
+    This runs in a database rebuild process, only the statements and their values are sent back
+
+    :param file: a file to insert into the database, as in UpdateDatabaseWorker's files
+    :returns: (sql_statements, row_count) a Tuple with the (sql_text, values) statements to run in order, and the
+        number of rows they insert"""
+    file_name = os.path.basename(file['file'])
+    if file.get('rows') is not None:
+        delete, delete_data, replace, replace_data = replace_sql_text(file_name, file['report'], ())
+        return ((delete, delete_data), (replace, file['rows'])), len(file['rows'])
+    elif not file_name[:-4].endswith(COST_TABLE_SUFFIX):
+        file_name, report, read_data = read_report_file(file['file'], file['vendor'], file['year'])
+        delete, delete_data, replace, replace_data = replace_sql_text(file_name, report, read_data)
+        return ((delete, delete_data), (replace, replace_data)), len(replace_data)
+    else:
+        sql_text, data = replace_costs_sql_text(file['report'], read_costs_file(file['file']))
+        return ((sql_text, data),), len(data)
+
+
 def insert_single_cost_file(report_type: str, file_path: str, emit_signal: bool = True):
     """Inserts a single file's data into the database
 
@@ -957,11 +1021,14 @@ class UpdateDatabaseProgressDialogController:
 
         self.is_updating_database = False
 
-    def update_database(self, files: Sequence[Dict[str, Any]], recreate_tables: bool):
+    def update_database(self, files: Sequence[Dict[str, Any]], recreate_tables: bool, parallel: bool = False,
+                        processes: int = 0):
         """Updates the database with the given files
 
         :param files: a list of files to insert into the database
-        :param recreate_tables: whether or not to drop the tables and recreated the tables before inserting"""
+        :param recreate_tables: whether or not to drop the tables and recreated the tables before inserting
+        :param parallel: whether to parse the files in a pool of processes, loading them in large transactions
+        :param processes: the number of processes parsing the files if parallel, 0 for one per CPU core"""
         self.update_database_progress_dialog = QDialog(self.parent_widget)
 
         dialog_ui = UpdateDatabaseProgressDialog.Ui_update_database_dialog()
@@ -982,7 +1049,7 @@ class UpdateDatabaseProgressDialogController:
 
         self.update_database_thread = QThread()
 
-        self.database_worker = UpdateDatabaseWorker(files, recreate_tables)
+        self.database_worker = UpdateDatabaseWorker(files, recreate_tables, parallel, processes)
 
         self.database_worker.status_changed_signal.connect(lambda status: self.on_status_changed(status))
         self.database_worker.progress_changed_signal.connect(lambda progress: self.on_progress_changed(progress))
@@ -1028,17 +1095,24 @@ class UpdateDatabaseProgressDialogController:
 class UpdateDatabaseWorker(QObject):
     """The worker that updates the database
 
-    :param files: a list of files to insert into the database
-    :param recreate_tables: whether or not to drop the tables and recreated the tables before inserting"""
+    :param files: a list of files to insert into the database. Files with 'report' and 'rows' (e.g. from a fetch) have
+        their rows inserted without reading the file
+    :param recreate_tables: whether or not to drop the tables and recreated the tables before inserting
+    :param parallel: whether to parse the files in a pool of processes, with one connection loading the parsed rows
+        in large transactions, instead of reading, inserting and committing the files one after another
+    :param processes: the number of processes parsing the files if parallel, 0 for one per CPU core"""
     worker_finished_signal = pyqtSignal(int)
     status_changed_signal = pyqtSignal(str)
     progress_changed_signal = pyqtSignal(int)
     task_finished_signal = pyqtSignal(str)
 
-    def __init__(self, files: Sequence[Dict[str, Any]], recreate_tables: bool):
+    def __init__(self, files: Sequence[Dict[str, Any]], recreate_tables: bool, parallel: bool = False,
+                 processes: int = 0):
         super().__init__()
         self.recreate_tables = recreate_tables
         self.files = files
+        self.parallel = parallel
+        self.processes = processes
 
     def work(self):
         """Performs the work of the worker"""
@@ -1052,15 +1126,136 @@ class UpdateDatabaseWorker(QObject):
         else:
             self.progress_changed_signal.emit(len(self.files))
         self.status_changed_signal.emit('Filling tables...')
-        for file in self.files:
-            filename = os.path.basename(file['file'])
-            if not filename[:-4].endswith(COST_TABLE_SUFFIX):
-                insert_single_file(file['file'], file['vendor'], file['year'], emit_signal=False)
-            else:
-                insert_single_cost_file(file['report'], file['file'], emit_signal=False)
-            self.task_finished_signal.emit(filename)
-            current += 1
-            self.progress_changed_signal.emit(current)
+        if self.parallel:
+            self.fill_tables_in_parallel(current)
+        else:
+            for file in self.files:
+                insert_database_file(file, emit_signal=False)
+                self.task_finished_signal.emit(os.path.basename(file['file']))
+                current += 1
+                self.progress_changed_signal.emit(current)
         managedb_signal_handler.emit_database_changed_signal()
         self.status_changed_signal.emit('Done')
         self.worker_finished_signal.emit(0)
+
+    def fill_tables_in_parallel(self, current: int):
+        """Fills the tables with the files' data, parsing the files in a pool of processes
+
+        One connection loads the parsed rows in the files' order, committing every DATABASE_REBUILD_TRANSACTION_ROWS
+        rows instead of after every file. Each file is loaded in a savepoint, so a file that fails to load is left out
+        without losing the rest of the transaction. The progress is shown in bytes and rows
+
+        :param current: the progress completed before filling the tables"""
+        file_sizes = []
+        for file in self.files:
+            try:
+                file_sizes.append(os.path.getsize(file['file']))
+            except OSError:
+                file_sizes.append(0)
+        total_mb = sum(file_sizes) / 1024 / 1024
+        loaded_bytes = 0
+        loaded_rows = 0
+        uncommitted_rows = 0
+
+        connection = create_connection(DATABASE_LOCATION)
+        if connection is None:
+            print('Error, no connection')
+            return
+
+        process_count = self.processes if self.processes > 0 else os.cpu_count() or 1
+        process_pool = ProcessPoolExecutor(process_count, multiprocessing.get_context("spawn"),
+                                           initializer=update_settings,
+                                           initargs=(ManageDBSettingsHandler.settings,))
+
+        def submit(file: Dict[str, Any]):  # Fetched rows are already parsed, they are not sent to a process
+            return None if file.get('rows') is not None else process_pool.submit(read_database_file, file)
+
+        # Only a few files per process are parsed ahead, so the parsed rows waiting to be loaded stay small
+        file_iterator = iter(zip(self.files, file_sizes))
+        pending_files = deque()
+        try:
+            for file, file_size in islice(file_iterator, process_count * 2):
+                pending_files.append((file, file_size, submit(file)))
+            while len(pending_files) > 0:
+                file, file_size, future = pending_files.popleft()
+                next_file = next(file_iterator, None)
+                if next_file is not None: pending_files.append(next_file + (submit(next_file[0]),))
+
+                filename = os.path.basename(file['file'])
+                try:
+                    sql_statements, row_count = read_database_file(file) if future is None else future.result()
+                except Exception as error:  # an unreadable file is left out, like a file that fails to load
+                    print(f'Error reading {filename}: {error!r}')
+                    sql_statements, row_count = (), 0
+
+                if not connection.in_transaction: connection.execute('BEGIN')
+                connection.execute('SAVEPOINT file')
+                try:
+                    for sql_text, values in sql_statements:
+                        connection.executemany(sql_text, values)
+                    connection.execute('RELEASE file')
+                except sqlite3.Error as error:
+                    print(error)
+                    connection.execute('ROLLBACK TO file')
+                    connection.execute('RELEASE file')
+                    row_count = 0
+
+                uncommitted_rows += row_count
+                if uncommitted_rows >= DATABASE_REBUILD_TRANSACTION_ROWS:
+                    connection.commit()
+                    uncommitted_rows = 0
+
+                loaded_bytes += file_size
+                loaded_rows += row_count
+                self.status_changed_signal.emit(f'Filling tables... {loaded_bytes / 1024 / 1024:.1f} of '
+                                                f'{total_mb:.1f} MB, {loaded_rows:,} rows')
+                self.task_finished_signal.emit(filename)
+                current += 1
+                self.progress_changed_signal.emit(current)
+
+            connection.commit()
+        finally:
+            connection.close()
+            for file, file_size, future in pending_files:
+                if future is not None: future.cancel()
+            process_pool.shutdown()
+
+
+class DatabaseWriterWorker(QObject):
+    """The worker that adds fetched reports to the database while the fetch goes on
+
+    Files are queued with add_file as soon as their report is saved and inserted one at a time, in the order they were
+    queued, by this worker's thread. Only this thread and the report processes, which take turns with it through
+    database_write_lock, write to the database during the fetch. The rows of a file are freed once they are in the
+    database instead of being kept until the fetch ends. Files with 'is_added', already added by a report process, are
+    only reported. The worker finishes once finish is called and all the queued files are inserted"""
+    worker_finished_signal = pyqtSignal(int)
+    task_finished_signal = pyqtSignal(str)
+
+    def __init__(self):
+        super().__init__()
+        self.file_queue = queue.Queue()
+
+    def add_file(self, file: Dict[str, Any]):
+        """Queues a file to insert into the database. This can be called from any thread
+
+        :param file: a file to insert into the database, as in UpdateDatabaseWorker's files"""
+        self.file_queue.put(file)
+
+    def finish(self):
+        """Finishes the worker once the files queued so far are inserted"""
+        self.file_queue.put(None)
+
+    def work(self):
+        """Performs the work of the worker"""
+        while True:
+            file = self.file_queue.get()
+            if file is None: break
+
+            if not file.get('is_added'):
+                with database_write_lock:
+                    insert_database_file(file, emit_signal=False)
+            self.task_finished_signal.emit(os.path.basename(file['file']))
+            del file  # the rows are freed while waiting for the next file
+        managedb_signal_handler.emit_database_changed_signal()
+        self.worker_finished_signal.emit(0)
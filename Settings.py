@@ -33,10 +33,61 @@ class SettingsModel(JsonModel):
     :param concurrent_vendors: The max number of vendors to work on at a time.
     :param concurrent_reports: The max number of reports to work on at a time, per vendor.
     :param user_agent: The user-agent that's included in the header when making requests.
+    :param default_currency: The default currency used for costs.
+    :param connection_pool_size: The max number of kept-alive connections to reuse, per vendor host.
+    :param request_rate: The max requests per second, per vendor. 0 uses request_interval instead.
+    :param request_burst: The max requests that can be sent back to back before the rate limits apply.
+    :param global_request_rate: The max requests per second across all vendors. 0 for no limit.
+    :param report_shard_months: The number of months to request at a time for large (IR and TR) reports. The shards
+        are fetched concurrently and merged into one report. 0 to request the whole date range at once.
+    :param stream_report_items: Parse received reports in chunks, one report item at a time, instead of loading the
+        whole response at once. This lowers memory use for large reports.
+    :param request_retries: The max number of retries for a request that fails with a connection error, a timeout or
+        a temporary HTTP error (429 or 5xx).
+    :param retry_delay: The average wait before the first retry of a failed request (seconds), doubled for each retry.
+    :param queued_report_retries: The max number of retries for a report that the vendor has queued for processing.
+    :param queued_report_retry_delay: The average wait before the first retry of a queued report (seconds), doubled
+        for each retry.
+    :param retry_max_delay: The longest wait before a retry (seconds). Requests are not retried if the vendor asks to
+        wait longer.
+    :param max_in_flight_requests: The max number of reports to work on at a time, across all vendors. Defaults to
+        concurrent_vendors * concurrent_reports.
+    :param small_reports_first: Fetch the smallest report types of all vendors first, instead of fetching the reports
+        in the order of the selected vendors.
+    :param supported_reports_ttl: How long to use a vendor's cached supported reports for (hours). 0 to request them
+        for every fetch.
+    :param json_archive_compression: The compression of the raw JSON files saved for yearly reports, "none", "gzip"
+        or "zstd".
+    :param json_archive_compression_level: The compression level of the raw JSON files, higher is smaller but slower.
+    :param build_report_models: Convert each received report item into its report model before converting it into
+        report rows, instead of converting the JSON straight into rows. This is slower, for debugging.
+    :param json_backend: The JSON parser used for vendor responses, "auto" for the fastest installed one, or "orjson",
+        "simdjson", "ujson" or "json". Falls back to "json" if the chosen parser is not installed.
+    :param use_report_processes: Convert received reports into rows and save them as TSV files in separate processes,
+        so concurrent reports are processed on several CPU cores. Not used when stream_report_items is on.
+    :param report_processes: The number of report processes, 0 for one per CPU core.
+    :param parallel_database_rebuild: Parse the files in separate processes when the database is rebuilt, with one
+        connection loading the parsed rows in large transactions.
+    :param database_rebuild_processes: The number of processes parsing files when the database is rebuilt, 0 for one
+        per CPU core.
     """
     def __init__(self, show_debug_messages: bool, yearly_directory: str, other_directory: str, request_interval: int,
                  request_timeout: int, concurrent_vendors: int, concurrent_reports: int, user_agent: str,
-                 default_currency: str):
+                 default_currency: str, connection_pool_size: int = CONNECTION_POOL_SIZE,
+                 request_rate: float = REQUEST_RATE, request_burst: int = REQUEST_BURST,
+                 global_request_rate: float = GLOBAL_REQUEST_RATE, report_shard_months: int = REPORT_SHARD_MONTHS,
+                 stream_report_items: bool = STREAM_REPORT_ITEMS, request_retries: int = REQUEST_RETRIES,
+                 retry_delay: float = RETRY_DELAY, queued_report_retries: int = QUEUED_REPORT_RETRIES,
+                 queued_report_retry_delay: float = QUEUED_REPORT_RETRY_DELAY,
+                 retry_max_delay: float = RETRY_MAX_DELAY, max_in_flight_requests: int = MAX_IN_FLIGHT_REQUESTS,
+                 small_reports_first: bool = SMALL_REPORTS_FIRST,
+                 supported_reports_ttl: float = SUPPORTED_REPORTS_TTL,
+                 json_archive_compression: str = JSON_ARCHIVE_COMPRESSION,
+                 json_archive_compression_level: int = JSON_ARCHIVE_COMPRESSION_LEVEL,
+                 build_report_models: bool = BUILD_REPORT_MODELS, json_backend: str = JSON_BACKEND,
+                 use_report_processes: bool = USE_REPORT_PROCESSES, report_processes: int = REPORT_PROCESSES,
+                 parallel_database_rebuild: bool = PARALLEL_DATABASE_REBUILD,
+                 database_rebuild_processes: int = DATABASE_REBUILD_PROCESSES):
         self.show_debug_messages = show_debug_messages
         self.yearly_directory = path.abspath(yearly_directory) + path.sep
         self.other_directory = path.abspath(other_directory) + path.sep
@@ -46,6 +97,28 @@ class SettingsModel(JsonModel):
         self.concurrent_reports = concurrent_reports
         self.user_agent = user_agent
         self.default_currency = default_currency
+        self.connection_pool_size = connection_pool_size
+        self.request_rate = request_rate
+        self.request_burst = request_burst
+        self.global_request_rate = global_request_rate
+        self.report_shard_months = report_shard_months
+        self.stream_report_items = stream_report_items
+        self.request_retries = request_retries
+        self.retry_delay = retry_delay
+        self.queued_report_retries = queued_report_retries
+        self.queued_report_retry_delay = queued_report_retry_delay
+        self.retry_max_delay = retry_max_delay
+        self.max_in_flight_requests = max_in_flight_requests
+        self.small_reports_first = small_reports_first
+        self.supported_reports_ttl = supported_reports_ttl
+        self.json_archive_compression = json_archive_compression
+        self.json_archive_compression_level = json_archive_compression_level
+        self.build_report_models = build_report_models
+        self.json_backend = json_backend
+        self.use_report_processes = use_report_processes
+        self.report_processes = report_processes
+        self.parallel_database_rebuild = parallel_database_rebuild
+        self.database_rebuild_processes = database_rebuild_processes
 
     @classmethod
     def from_json(cls, json_dict: dict):
@@ -67,9 +140,58 @@ class SettingsModel(JsonModel):
             if "user_agent" in json_dict else USER_AGENT
         default_currency = json_dict["default_currency"]\
             if "default_currency" in json_dict else DEFAULT_CURRENCY
+        connection_pool_size = int(json_dict["connection_pool_size"])\
+            if "connection_pool_size" in json_dict else CONNECTION_POOL_SIZE
+        request_rate = float(json_dict["request_rate"])\
+            if "request_rate" in json_dict else REQUEST_RATE
+        request_burst = int(json_dict["request_burst"])\
+            if "request_burst" in json_dict else REQUEST_BURST
+        global_request_rate = float(json_dict["global_request_rate"])\
+            if "global_request_rate" in json_dict else GLOBAL_REQUEST_RATE
+        report_shard_months = int(json_dict["report_shard_months"])\
+            if "report_shard_months" in json_dict else REPORT_SHARD_MONTHS
+        stream_report_items = json_dict["stream_report_items"]\
+            if "stream_report_items" in json_dict else STREAM_REPORT_ITEMS
+        request_retries = int(json_dict["request_retries"])\
+            if "request_retries" in json_dict else REQUEST_RETRIES
+        retry_delay = float(json_dict["retry_delay"])\
+            if "retry_delay" in json_dict else RETRY_DELAY
+        queued_report_retries = int(json_dict["queued_report_retries"])\
+            if "queued_report_retries" in json_dict else QUEUED_REPORT_RETRIES
+        queued_report_retry_delay = float(json_dict["queued_report_retry_delay"])\
+            if "queued_report_retry_delay" in json_dict else QUEUED_REPORT_RETRY_DELAY
+        retry_max_delay = float(json_dict["retry_max_delay"])\
+            if "retry_max_delay" in json_dict else RETRY_MAX_DELAY
+        max_in_flight_requests = int(json_dict["max_in_flight_requests"])\
+            if "max_in_flight_requests" in json_dict else concurrent_vendors * concurrent_reports
+        small_reports_first = json_dict["small_reports_first"]\
+            if "small_reports_first" in json_dict else SMALL_REPORTS_FIRST
+        supported_reports_ttl = float(json_dict["supported_reports_ttl"])\
+            if "supported_reports_ttl" in json_dict else SUPPORTED_REPORTS_TTL
+        json_archive_compression = json_dict["json_archive_compression"]\
+            if "json_archive_compression" in json_dict else JSON_ARCHIVE_COMPRESSION
+        json_archive_compression_level = int(json_dict["json_archive_compression_level"])\
+            if "json_archive_compression_level" in json_dict else JSON_ARCHIVE_COMPRESSION_LEVEL
+        build_report_models = json_dict["build_report_models"]\
+            if "build_report_models" in json_dict else BUILD_REPORT_MODELS
+        json_backend = json_dict["json_backend"]\
+            if "json_backend" in json_dict else JSON_BACKEND
+        use_report_processes = json_dict["use_report_processes"]\
+            if "use_report_processes" in json_dict else USE_REPORT_PROCESSES
+        report_processes = int(json_dict["report_processes"])\
+            if "report_processes" in json_dict else REPORT_PROCESSES
+        parallel_database_rebuild = json_dict["parallel_database_rebuild"]\
+            if "parallel_database_rebuild" in json_dict else PARALLEL_DATABASE_REBUILD
+        database_rebuild_processes = int(json_dict["database_rebuild_processes"])\
+            if "database_rebuild_processes" in json_dict else DATABASE_REBUILD_PROCESSES
 
         return cls(show_debug_messages, yearly_directory, other_directory, request_interval, request_timeout,
-                   concurrent_vendors, concurrent_reports, user_agent, default_currency)
+                   concurrent_vendors, concurrent_reports, user_agent, default_currency, connection_pool_size,
+                   request_rate, request_burst, global_request_rate, report_shard_months, stream_report_items,
+                   request_retries, retry_delay, queued_report_retries, queued_report_retry_delay, retry_max_delay,
+                   max_in_flight_requests, small_reports_first, supported_reports_ttl, json_archive_compression,
+                   json_archive_compression_level, build_report_models, json_backend, use_report_processes,
+                   report_processes, parallel_database_rebuild, database_rebuild_processes)
 
 
 class SettingsController(QObject):
@@ -100,7 +222,13 @@ class SettingsController(QObject):
         self.request_timeout_spin_box = settings_ui.request_timeout_spin_box
         self.concurrent_vendors_spin_box = settings_ui.concurrent_vendors_spin_box
         self.concurrent_reports_spin_box = settings_ui.concurrent_reports_spin_box
+        self.max_in_flight_requests_spin_box = settings_ui.max_in_flight_requests_spin_box
         self.user_agent_edit = settings_ui.user_agent_edit
+        self.supported_reports_ttl_spin_box = settings_ui.supported_reports_ttl_spin_box
+        self.json_backend_combobox = settings_ui.json_backend_combobox
+        self.json_archive_compression_combobox = settings_ui.json_archive_compression_combobox
+        self.json_archive_compression_level_spin_box = settings_ui.json_archive_compression_level_spin_box
+        self.use_report_processes_checkbox = settings_ui.use_report_processes_check_box
 
         self.yearly_dir_edit.setText(self.settings.yearly_directory)
         self.other_dir_edit.setText(self.settings.other_directory)
@@ -108,7 +236,15 @@ class SettingsController(QObject):
         self.request_timeout_spin_box.setValue(self.settings.request_timeout)
         self.concurrent_vendors_spin_box.setValue(self.settings.concurrent_vendors)
         self.concurrent_reports_spin_box.setValue(self.settings.concurrent_reports)
+        self.max_in_flight_requests_spin_box.setValue(self.settings.max_in_flight_requests)
         self.user_agent_edit.setText(self.settings.user_agent)
+        self.supported_reports_ttl_spin_box.setValue(self.settings.supported_reports_ttl)
+        self.json_backend_combobox.addItems(JSON_BACKENDS)
+        self.json_backend_combobox.setCurrentText(self.settings.json_backend)
+        self.json_archive_compression_combobox.addItems(JSON_ARCHIVE_EXTENSIONS.keys())
+        self.json_archive_compression_combobox.setCurrentText(self.settings.json_archive_compression)
+        self.json_archive_compression_level_spin_box.setValue(self.settings.json_archive_compression_level)
+        self.use_report_processes_checkbox.setChecked(self.settings.use_report_processes)
 
         settings_ui.yearly_directory_button.clicked.connect(
             lambda: self.on_directory_setting_clicked(Setting.YEARLY_DIR))
@@ -135,11 +271,35 @@ class SettingsController(QObject):
             lambda: GeneralUtils.show_message("The maximum number of reports to work on at the same time (per vendor). "
                                               "If set too high, the UI might freeze while fetching reports but the "
                                               "fetch process will continue"))
+        settings_ui.max_in_flight_requests_help_button.clicked.connect(
+            lambda: GeneralUtils.show_message("The maximum number of reports to work on at the same time, across all "
+                                              "vendors. "
+                                              "If set too high, the UI might freeze while fetching reports but the "
+                                              "fetch process will continue"))
         settings_ui.user_agent_help_button.clicked.connect(
             lambda: GeneralUtils.show_message("How program identifies itself to the SUSHI servers. Some vendors will "
                                               "reject some particular user agents. Only change this if there is a "
                                               "known problem as it will affect all requests to all vendors. "
                                               "See Help for more information."))
+        settings_ui.supported_reports_ttl_help_button.clicked.connect(
+            lambda: GeneralUtils.show_message("The number of hours the program will reuse the list of reports a vendor "
+                                              "supports before requesting it again. Set to 0 to request it for every "
+                                              "fetch"))
+        settings_ui.json_backend_help_button.clicked.connect(
+            lambda: GeneralUtils.show_message("The parser used to read the reports received from vendors. 'auto' uses "
+                                              "the fastest one that is installed. If the chosen parser is not "
+                                              "installed, Python's json module is used"))
+        settings_ui.json_archive_compression_help_button.clicked.connect(
+            lambda: GeneralUtils.show_message("How the raw JSON responses saved with the yearly reports are "
+                                              "compressed. 'zstd' needs the zstandard package, 'gzip' is used if it "
+                                              "is not installed"))
+        settings_ui.json_archive_compression_level_help_button.clicked.connect(
+            lambda: GeneralUtils.show_message("Higher levels make smaller raw JSON files but take longer to save. "
+                                              "gzip uses levels 1 to 9, zstd uses levels 1 to 22"))
+        settings_ui.use_report_processes_help_button.clicked.connect(
+            lambda: GeneralUtils.show_message("Convert the received reports and save their files in separate "
+                                              "processes, so several reports can be processed on different CPU cores. "
+                                              "This is not used when reports are parsed one report item at a time"))
         settings_ui.default_currency_help_button.clicked.connect(
             lambda: GeneralUtils.show_message("The currency shown first in the Costs pulldown and also by Visual to "
                                               "label the local currency in the spreadsheets generated with the Cost "
@@ -160,6 +320,12 @@ class SettingsController(QObject):
         self.update_database_dialog = ManageDB.UpdateDatabaseProgressDialogController(self.settings_widget)
         self.rebuild_database_button = settings_ui.settings_rebuild_database_button
         self.rebuild_database_button.clicked.connect(self.on_rebuild_database_clicked)
+
+        self.parallel_database_rebuild_checkbox = settings_ui.parallel_database_rebuild_check_box
+        self.parallel_database_rebuild_checkbox.setChecked(self.settings.parallel_database_rebuild)
+        settings_ui.parallel_database_rebuild_help_button.clicked.connect(
+            lambda: GeneralUtils.show_message("Read the report files in separate processes when rebuilding the "
+                                              "database, so several files can be read on different CPU cores"))
         # endregion
 
         settings_ui.save_button.clicked.connect(self.on_save_button_clicked)
@@ -190,7 +356,8 @@ class SettingsController(QObject):
                 self.is_rebuilding_database = True
                 self.update_database_dialog.update_database(ManageDB.get_all_report_files() +
                                                             ManageDB.get_all_cost_files(),
-                                                            True)
+                                                            True, self.parallel_database_rebuild_checkbox.isChecked(),
+                                                            self.settings.database_rebuild_processes)
                 self.is_rebuilding_database = False
         else:
             if self.settings.show_debug_messages: print('Database is already being rebuilt')
@@ -204,8 +371,15 @@ class SettingsController(QObject):
         self.settings.request_timeout = self.request_timeout_spin_box.value()
         self.settings.concurrent_vendors = self.concurrent_vendors_spin_box.value()
         self.settings.concurrent_reports = self.concurrent_reports_spin_box.value()
+        self.settings.max_in_flight_requests = self.max_in_flight_requests_spin_box.value()
         self.settings.user_agent = self.user_agent_edit.text()
         self.settings.default_currency = self.default_currency_combobox.currentText()
+        self.settings.supported_reports_ttl = self.supported_reports_ttl_spin_box.value()
+        self.settings.json_backend = self.json_backend_combobox.currentText()
+        self.settings.json_archive_compression = self.json_archive_compression_combobox.currentText()
+        self.settings.json_archive_compression_level = self.json_archive_compression_level_spin_box.value()
+        self.settings.use_report_processes = self.use_report_processes_checkbox.isChecked()
+        self.settings.parallel_database_rebuild = self.parallel_database_rebuild_checkbox.isChecked()
 
     def save_settings_to_disk(self):
         """Saves all settings to disk"""
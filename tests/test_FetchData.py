@@ -0,0 +1,630 @@
+import unittest
+import sys
+import copy
+import io
+import json
+import pickle
+import sqlite3
+import tempfile
+import importlib.util
+import requests
+import urllib3.response
+from os import path, makedirs
+from PyQt5.QtCore import QDate
+from PyQt5.QtWidgets import QApplication
+
+import FetchData
+import ManageDB
+import Settings
+from Constants import CompletionStatus, MajorReportType
+from ManageVendors import Vendor
+
+app = QApplication(sys.argv)
+
+
+class VendorSessionTests(unittest.TestCase):
+    def tearDown(self):
+        FetchData.close_vendor_sessions()
+
+    def test_session_shared_per_host(self):
+        '''Test that requests to the same host reuse one session'''
+        session = FetchData.get_vendor_session("https://sushi.example.com/counter/r5/reports", 4)
+        self.assertIs(session, FetchData.get_vendor_session("https://SUSHI.example.com/other/r5", 4))
+        self.assertIsNot(session, FetchData.get_vendor_session("https://other.example.com/counter/r5", 4))
+
+    def test_session_pool_size(self):
+        session = FetchData.get_vendor_session("https://sushi.example.com/counter/r5", 7)
+        self.assertEqual(session.get_adapter("https://sushi.example.com/")._pool_maxsize, 7)
+
+    def test_accept_encoding(self):
+        '''Test that sessions accept every compressed encoding with an installed decoder'''
+        session = FetchData.get_vendor_session("https://sushi.example.com/counter/r5", 4)
+        encodings = session.headers["Accept-Encoding"].split(", ")
+        self.assertEqual(encodings[:2], ["gzip", "deflate"])
+        self.assertEqual("br" in encodings, importlib.util.find_spec("brotli") is not None or
+                         importlib.util.find_spec("brotlicffi") is not None)
+        self.assertEqual("zstd" in encodings, getattr(urllib3.response, "HAS_ZSTD", False))
+
+    def test_close_sessions(self):
+        session = FetchData.get_vendor_session("https://sushi.example.com/counter/r5", 4)
+        FetchData.close_vendor_sessions()
+        self.assertIsNot(session, FetchData.get_vendor_session("https://sushi.example.com/counter/r5", 4))
+
+    def test_shared_until_last_fetch_finishes(self):
+        '''Test that the sessions and rate limiters are kept until every running fetch has finished'''
+        FetchData.start_shared_fetch()
+        FetchData.start_shared_fetch()
+        session = FetchData.get_vendor_session("https://sushi.example.com/counter/r5", 4)
+        limiter = FetchData.get_rate_limiter("Vendor", 1, 1)
+
+        FetchData.finish_shared_fetch()
+        self.assertIs(session, FetchData.get_vendor_session("https://sushi.example.com/counter/r5", 4))
+        self.assertIs(limiter, FetchData.get_rate_limiter("Vendor", 1, 1))
+
+        FetchData.finish_shared_fetch()
+        self.assertIsNot(session, FetchData.get_vendor_session("https://sushi.example.com/counter/r5", 4))
+        self.assertIsNot(limiter, FetchData.get_rate_limiter("Vendor", 1, 1))
+        FetchData.reset_rate_limiters()
+
+
+class TokenBucketTests(unittest.TestCase):
+    def test_burst_then_wait(self):
+        '''Test that requests only wait once the burst is used up'''
+        bucket = FetchData.TokenBucket(4, 2)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertAlmostEqual(bucket.reserve(), 0.25, places=2)
+        self.assertAlmostEqual(bucket.reserve(), 0.5, places=2)
+
+    def test_no_limit(self):
+        bucket = FetchData.TokenBucket(0)
+        for i in range(10):
+            self.assertEqual(bucket.reserve(), 0)
+
+
+class RetryPolicyTests(unittest.TestCase):
+    def test_exponential_backoff(self):
+        '''Test that the wait doubles with each retry, with jitter, up to the max delay'''
+        retry_policy = FetchData.RetryPolicy(4, 2, 5)
+        for retry_number, max_delay in ((1, 2), (2, 4), (3, 5), (4, 5)):
+            delay = retry_policy.get_delay(retry_number)
+            self.assertGreaterEqual(delay, max_delay / 2)
+            self.assertLessEqual(delay, max_delay)
+        self.assertIsNone(retry_policy.get_delay(5))
+
+    def test_retry_after(self):
+        retry_policy = FetchData.RetryPolicy(2, 2, 60)
+        self.assertEqual(retry_policy.get_delay(1, 30), 30)
+        self.assertIsNone(retry_policy.get_delay(1, 90))
+
+        response = requests.Response()
+        self.assertIsNone(FetchData.RetryPolicy.parse_retry_after(response))
+        response.headers["Retry-After"] = "120"
+        self.assertEqual(FetchData.RetryPolicy.parse_retry_after(response), 120)
+        response.headers["Retry-After"] = "Wed, 21 Oct 2015 07:28:00 GMT"
+        self.assertEqual(FetchData.RetryPolicy.parse_retry_after(response), 0)
+
+
+class FetchSchedulerTests(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = FetchData.FetchScheduler(3, 2)
+        self.started_tasks = []
+
+    def add_task(self, vendor_name: str, priority: tuple, task_name: str):
+        self.scheduler.add_task(vendor_name, priority, lambda: self.started_tasks.append(task_name))
+
+    def test_limits_and_priority(self):
+        '''Test that tasks start in priority order within the global and per-vendor limits'''
+        self.add_task("A", (2,), "A-IR")
+        self.add_task("A", (0,), "A-PR_P1")
+        self.add_task("A", (1,), "A-PR")
+        self.add_task("B", (1,), "B-PR")
+        self.add_task("B", (2,), "B-IR")
+        self.scheduler.start_tasks()
+        self.assertEqual(self.started_tasks, ["A-PR_P1", "A-PR", "B-PR"])
+
+        self.scheduler.task_finished("B")
+        self.assertEqual(self.started_tasks[3:], ["B-IR"])
+        self.scheduler.task_finished("B")
+        self.assertEqual(self.started_tasks[4:], [])  # Vendor A is still at its limit
+
+        self.scheduler.task_finished("A")
+        self.assertEqual(self.started_tasks[4:], ["A-IR"])
+        self.assertTrue(self.scheduler.has_tasks("A"))
+        self.assertFalse(self.scheduler.has_tasks("B"))
+
+    def test_vendor_limit(self):
+        '''Test that the tasks of a vendor only start once a vendor slot is free'''
+        self.scheduler = FetchData.FetchScheduler(3, 2, 1)
+        self.add_task("A", (1,), "A-PR")
+        self.add_task("B", (0,), "B-PR")
+        self.add_task("B", (2,), "B-IR")
+        self.scheduler.start_tasks()
+        self.assertEqual(self.started_tasks, ["B-PR", "B-IR"])
+
+        self.scheduler.task_finished("B")
+        self.assertEqual(self.started_tasks[2:], [])
+        self.scheduler.task_finished("B")
+        self.assertEqual(self.started_tasks[2:], ["A-PR"])
+
+    def test_take_slots(self):
+        '''Test that extra slots are only taken within the limits and are freed with their task'''
+        self.add_task("A", (0,), "A-IR")
+        self.add_task("B", (1,), "B-PR")
+        self.scheduler.start_tasks()
+        self.assertEqual(self.scheduler.take_slots("A", 3), 1)  # Vendor A is at its limit
+        self.assertEqual(self.scheduler.take_slots("B", 1), 0)  # All slots are in flight
+
+        self.add_task("B", (2,), "B-DR")
+        self.scheduler.task_finished("A", 2)
+        self.assertEqual(self.started_tasks[2:], ["B-DR"])
+        self.assertFalse(self.scheduler.has_tasks("A"))
+
+    def test_cancel_pending_tasks(self):
+        for i in range(4):
+            self.add_task("A", (i,), f"A-{i}")
+        self.add_task("B", (0,), "B-0")
+        self.scheduler.start_tasks()
+
+        self.assertEqual(self.scheduler.cancel_pending_tasks(), {"A"})
+        self.scheduler.task_finished("A")
+        self.assertEqual(self.started_tasks, ["A-0", "B-0", "A-1"])
+        self.assertTrue(self.scheduler.has_tasks("A"))
+
+    def test_report_size_rank(self):
+        self.assertEqual(sorted(["IR", "TR_J1", "PR", "TR", "DR"], key=FetchData.get_report_size_rank),
+                         ["TR_J1", "PR", "DR", "TR", "IR"])
+
+
+class FetchJournalTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.journal_dir = self.temp_dir.name + "/journal/"
+        self.begin_date = QDate(2020, 1, 1)
+        self.end_date = QDate(2020, 12, 1)
+        self.vendor = Vendor("Vendor", "https://sushi.example.com/r5", "customer", "", "", "", False, "", "")
+
+        self.report_file = path.join(self.temp_dir.name, "2020_Vendor_PR.tsv")
+        open(self.report_file, 'w').close()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_resume_only_missing_or_failed(self):
+        '''Test that only reports saved with existing files are skipped after reloading the journal'''
+        journal = FetchData.FetchJournal(self.journal_dir, "journal.dat")
+        successful_result = FetchData.ProcessResult(self.vendor, "PR")
+        successful_result.file_path = self.report_file
+        no_usage_result = FetchData.ProcessResult(self.vendor, "PR_P1")
+        no_usage_result.completion_status = CompletionStatus.WARNING
+        no_usage_result.file_path = self.report_file
+        failed_result = FetchData.ProcessResult(self.vendor, "DR")
+        failed_result.completion_status = CompletionStatus.FAILED
+        missing_file_result = FetchData.ProcessResult(self.vendor, "TR")
+        missing_file_result.file_path = path.join(self.temp_dir.name, "2020_Vendor_TR.tsv")
+        for process_result in (successful_result, no_usage_result, failed_result, missing_file_result):
+            journal.record(process_result, self.begin_date, self.end_date)
+        journal.save()
+
+        journal = FetchData.FetchJournal(self.journal_dir, "journal.dat")
+        self.assertEqual(journal.get_missing_report_types("Vendor", ["PR", "PR_P1", "DR", "TR", "IR"],
+                                                         self.begin_date, self.end_date), ["DR", "TR", "IR"])
+        self.assertEqual(journal.get_missing_report_types("Vendor", ["PR"], self.begin_date, QDate(2020, 6, 1)),
+                         ["PR"])
+
+
+class SupportedReportsCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = self.temp_dir.name + "/cache/"
+        self.vendor = Vendor("Vendor", "https://sushi.example.com/r5", "customer", "", "", "", False, "", "")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_cached_supported_reports(self):
+        '''Test that cached report types are used until they expire or the vendor's connection details change'''
+        cache = FetchData.SupportedReportsCache(self.cache_dir, "cache.dat")
+        self.assertIsNone(cache.get(self.vendor, 24))
+        cache.add(self.vendor, ["PR", "PR_P1", "TR"])
+        cache.save()
+
+        cache = FetchData.SupportedReportsCache(self.cache_dir, "cache.dat")
+        self.assertEqual(cache.get(self.vendor, 24), ["PR", "PR_P1", "TR"])
+        cache.entries["Vendor"]["created"] -= 25 * 3600
+        self.assertIsNone(cache.get(self.vendor, 24))
+
+        cache.add(self.vendor, ["PR"])
+        changed_vendor = Vendor("Vendor", "https://sushi.example.com/r5", "other customer", "", "", "", False, "", "")
+        self.assertIsNone(cache.get(changed_vendor, 24))
+
+        cache.remove("Vendor")
+        self.assertIsNone(cache.get(self.vendor, 24))
+
+
+class JsonArchiveTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.archive_dir = self.temp_dir.name + "/_json/"
+        self.file_dir = self.archive_dir + "2020/Vendor/"
+        makedirs(self.file_dir)
+        self.file_path = self.file_dir + "2020_Vendor_PR.json"
+        self.json_string = '{"Report_Header": {"Report_ID": "PR"}, "Report_Items": [{"Platform": "Plateforme é"}]}'
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_compressed_round_trip(self):
+        '''Test that archived JSON reads back the same whatever its compression, replacing other compressions'''
+        for compression in ("none", "gzip"):
+            json_file = FetchData.open_archived_json_file(self.file_path, compression, 6)
+            json_file.write(self.json_string)
+            json_file.close()
+
+            self.assertEqual(FetchData.read_archived_json(self.file_path), self.json_string)
+            self.assertEqual(len(FetchData.get_archived_json_files(archive_dir=self.archive_dir)), 1)
+
+        self.assertFalse(path.isfile(self.file_path))
+        self.assertEqual(FetchData.read_archived_json(self.file_path + ".gz"), self.json_string)
+
+    def test_archived_json_files(self):
+        for file_path in (self.file_path, self.file_dir + "2020_Vendor_DR.json",
+                          self.archive_dir + "2019/Other/2019_Other_PR.json"):
+            if not path.isdir(path.dirname(file_path)): makedirs(path.dirname(file_path))
+            FetchData.open_archived_json_file(file_path, "gzip").close()
+
+        self.assertEqual(FetchData.get_archived_json_files(archive_dir=self.archive_dir),
+                         [self.archive_dir + "2019/Other/2019_Other_PR.json.gz",
+                          self.file_dir + "2020_Vendor_DR.json.gz", self.file_path + ".gz"])
+        self.assertEqual(FetchData.get_archived_json_files(2020, archive_dir=self.archive_dir),
+                         [self.file_dir + "2020_Vendor_DR.json.gz", self.file_path + ".gz"])
+        self.assertEqual(FetchData.get_archived_json_files(vendor_name="Other", archive_dir=self.archive_dir),
+                         [self.archive_dir + "2019/Other/2019_Other_PR.json.gz"])
+
+
+class ReportShardTests(unittest.TestCase):
+    def setUp(self):
+        self.begin_date = QDate(2020, 1, 1)
+        self.end_date = QDate(2020, 3, 1)
+
+    def create_row(self, item: str, component_title: str, month: str, count: int) -> FetchData.ReportRow:
+        row = FetchData.ReportRow(self.begin_date, self.end_date)
+        row.item = item
+        row.component_title = component_title
+        row.metric_type = "Total_Item_Requests"
+        row.month_counts[month] += count
+        row.total_count += count
+        return row
+
+    def test_merge_report_rows(self):
+        '''Test that matching rows are summed without changing the shard rows'''
+        january_rows = [self.create_row("A", "Component 1", "Jan-2020", 2)]
+        january_rows.append(copy.copy(january_rows[0]))  # Component rows share their metric row's month_counts
+        january_rows[1].component_title = "Component 2"
+        february_rows = [self.create_row("A", "Component 1", "Feb-2020", 3),
+                         self.create_row("B", "", "Feb-2020", 1)]
+
+        merged_rows = FetchData.ReportWorker.merge_report_rows([january_rows, february_rows])
+
+        self.assertEqual([(row.item, row.component_title) for row in merged_rows],
+                         [("A", "Component 1"), ("A", "Component 2"), ("B", "")])
+        self.assertEqual(merged_rows[0].month_counts, {"Jan-2020": 2, "Feb-2020": 3, "Mar-2020": 0})
+        self.assertEqual(merged_rows[0].total_count, 5)
+        self.assertEqual(merged_rows[1].month_counts, {"Jan-2020": 2, "Feb-2020": 0, "Mar-2020": 0})
+        self.assertEqual(january_rows[0].month_counts, {"Jan-2020": 2, "Feb-2020": 0, "Mar-2020": 0})
+
+    def test_retry_failed_shards(self):
+        '''Test that a retry later only fetches the shards that didn't return a result again'''
+        settings = Settings.SettingsModel(False, "./yearly/", "./other/", 0, 30, 2, 2, "UA", "USD")
+        vendor = Vendor("Vendor", "https://sushi.example.com/r5", "customer", "", "", "", False, "", "")
+        request_data = FetchData.RequestData(vendor, ["PR"], self.begin_date, self.end_date, "./other/", settings)
+        report_worker = FetchData.ReportWorker("Vendor-PR", "PR", request_data)
+        date_ranges = [(QDate(2020, month, 1), QDate(2020, month, 1)) for month in (1, 2, 3)]
+        fetched_months = []
+
+        def fetch_shard(begin_date: QDate, end_date: QDate, json_file_suffix: str):
+            fetched_months.append(begin_date.month())
+            if begin_date.month() == 2 and fetched_months.count(2) == 1:
+                raise FetchData.RetryLaterException([])
+            return begin_date.month()
+
+        with self.assertRaises(FetchData.RetryLaterException):
+            report_worker.fetch_shards(fetch_shard, date_ranges)
+        self.assertEqual(report_worker.fetch_shards(fetch_shard, date_ranges), [1, 2, 3])
+        self.assertEqual(sorted(fetched_months), [1, 2, 2, 3])
+
+    def test_component_rows(self):
+        '''Test that component rows read the metric row's columns and counts, and are expanded to be merged'''
+        metric_row = self.create_row("A", "", "Jan-2020", 2)
+        report_rows = []
+        FetchData.ReportWorker.add_metric_rows({"Total_Item_Requests": metric_row}, [
+            ("Component 1",) + ("",) * (len(FetchData.COMPONENT_FIELDS) - 1),
+            ("Component 2",) + ("",) * (len(FetchData.COMPONENT_FIELDS) - 1)], MajorReportType.ITEM, report_rows)
+
+        self.assertEqual([(row.item, row.component_title) for row in report_rows],
+                         [("A", "Component 1"), ("A", "Component 2")])
+        self.assertIs(report_rows[1].month_counts, metric_row.month_counts)
+        self.assertEqual(report_rows[0].get_values_key(), report_rows[0].expand().get_values_key())
+        with self.assertRaises(AttributeError):
+            report_rows[0].total_count = 1
+
+        merged_rows = FetchData.ReportWorker.merge_report_rows([report_rows, report_rows])
+        self.assertEqual([type(row) for row in merged_rows], [FetchData.ReportRow, FetchData.ReportRow])
+        self.assertEqual(merged_rows[1].component_title, "Component 2")
+        self.assertEqual(merged_rows[1].month_counts["Jan-2020"], 4)
+        self.assertEqual(metric_row.month_counts["Jan-2020"], 2)
+
+    def test_sort_rows(self):
+        '''Test that rows are sorted by their sort keys, and that merged sorted lists keep the order of equal rows'''
+        rows = [self.create_row(item, component_title, "Jan-2020", 1)
+                for item, component_title in [("b", "1"), ("A", "1"), ("a", "2"), ("C", "1")]]
+        for row in rows[:2]:
+            row.sort_key = FetchData.ReportWorker.get_sort_key(row, MajorReportType.ITEM)
+        self.assertEqual(rows[0].sort_key, "b")
+
+        sorted_rows = FetchData.ReportWorker.sort_rows(rows, MajorReportType.ITEM)
+        self.assertEqual([(row.item, row.component_title) for row in sorted_rows],
+                         [("A", "1"), ("a", "2"), ("b", "1"), ("C", "1")])
+
+        merged_rows = FetchData.ReportWorker.merge_sorted_rows([sorted_rows[1:], sorted_rows[:2]], MajorReportType.ITEM)
+        self.assertEqual([(row.item, row.component_title) for row in merged_rows],
+                         [("a", "2"), ("A", "1"), ("a", "2"), ("b", "1"), ("C", "1")])
+
+    def test_add_report_rows_to_file(self):
+        '''Test that special reports only have the selected optional columns, in the report type's column order'''
+        special_options = FetchData.SpecialReportOptions()
+        special_options.yop = (True,) + special_options.yop[1:]
+        special_options.data_type = (True,) + special_options.data_type[1:]
+        special_options.exclude_monthly_details = (True,) + special_options.exclude_monthly_details[1:]
+        row = self.create_row("A", "", "Jan-2020", 2)
+        row.title = "Title"
+        row.yop = 2019
+
+        file = io.StringIO(newline="")
+        self.assertTrue(FetchData.ReportWorker.add_report_rows_to_file(
+            "TR", [row], self.begin_date, self.end_date, file, True, True, special_options))
+        self.assertEqual(file.getvalue().splitlines()[0].split("\t")[-5:],
+                         ["URI", "Data_Type", "YOP", "Metric_Type", "Reporting_Period_Total"])
+        self.assertEqual(file.getvalue().splitlines()[1], "Title" + "\t" * 11 + "2019\tTotal_Item_Requests\t2")
+
+        file = io.StringIO(newline="")
+        self.assertFalse(FetchData.ReportWorker.add_report_rows_to_file(
+            "TR_J1", [], self.begin_date, self.end_date, file, False))
+        self.assertEqual(file.getvalue().splitlines()[0].split("\t")[-3:], ["Jan-2020", "Feb-2020", "Mar-2020"])
+
+    def test_add_report_rows_to_files(self):
+        '''Test that the user and protected files written in one pass match the files written separately'''
+        rows = [self.create_row("A", "", "Jan-2020", 2), self.create_row("B\tb", "", "Feb-2020", 1),
+                self.create_row('C "c"', "", "Mar-2020", 3)]
+        rows[0].data_type = "Journal"
+        rows[2].metric_type = None
+
+        for report_type in ("IR", "IR_M1"):
+            file = io.StringIO(newline="")
+            protected_file = io.StringIO(newline="")
+            self.assertTrue(FetchData.ReportWorker.add_report_rows_to_files(
+                report_type, rows, self.begin_date, self.end_date, file, protected_file))
+
+            expected_file = io.StringIO(newline="")
+            expected_protected_file = io.StringIO(newline="")
+            FetchData.ReportWorker.add_report_rows_to_file(report_type, rows, self.begin_date, self.end_date,
+                                                           expected_file, False)
+            FetchData.ReportWorker.add_report_rows_to_file(report_type, rows, self.begin_date, self.end_date,
+                                                           expected_protected_file, True)
+            self.assertEqual(file.getvalue(), expected_file.getvalue())
+            self.assertEqual(protected_file.getvalue(), expected_protected_file.getvalue())
+
+    def test_database_rows(self):
+        '''Test that the database rows made in memory are the rows read from the protected file'''
+        rows = [self.create_row("A", "", "Jan-2020", 2), self.create_row("B\tb", "", "Feb-2020", 1),
+                self.create_row("C", "", "Mar-2020", 3)]
+        rows[0].data_type = "Journal"
+        rows[1].month_counts["Mar-2020"] += 5
+        rows[2].metric_type = None
+        report_header = FetchData.ReportHeaderModel.from_json({
+            "Report_ID": "IR", "Created": "2020-04-01T00:00:00Z",
+            "Report_Filters": [{"Name": "Metric_Type", "Value": "Total_Item_Requests|Unique_Item_Requests"}]})
+        vendor = Vendor("Vendor", "https://sushi.example.com/r5", "customer", "", "", "", False, "", "")
+        settings = Settings.SettingsModel(False, "./yearly/", "./other/", 0, 30, 2, 2, "UA", "USD")
+        report_worker = FetchData.ReportWorker("Vendor-IR", "IR", FetchData.RequestData(
+            vendor, ["IR"], self.begin_date, self.end_date, settings.yearly_directory, settings))
+
+        with tempfile.TemporaryDirectory() as file_dir:
+            file_path = path.join(file_dir, "2020_Vendor_IR.tsv")
+            with open(file_path, 'w', encoding="utf-8", newline='') as file:
+                FetchData.ReportWorker.add_report_header_to_file(report_header, file, True)
+                FetchData.ReportWorker.add_report_rows_to_file("IR", rows, self.begin_date, self.end_date, file, True)
+            file_name, report, values = ManageDB.read_report_file(file_path, "Vendor", "2020")
+            expected_rows = ManageDB.replace_sql_text(file_name, report, values)[3]
+
+        report, database_rows = report_worker.get_database_rows(report_header, rows, "2020_Vendor_IR.tsv")
+        self.assertEqual(report, "IR")
+        self.assertEqual(len(database_rows), 4)
+        self.assertEqual(database_rows, [tuple(row_values) for row_values in expected_rows])
+
+    def test_report_row(self):
+        '''Test that rows of the same date range share a month index and keep the month columns in order'''
+        row = self.create_row("A", "", "Mar-2020", 4)
+        other_row = self.create_row("A", "", "Jan-2020", 1)
+        self.assertIs(row.month_counts.month_index, other_row.month_counts.month_index)
+        self.assertEqual(list(row.month_counts.keys()), ["Jan-2020", "Feb-2020", "Mar-2020"])
+        self.assertEqual(row.get_values_key(), other_row.get_values_key())
+        with self.assertRaises(KeyError):
+            row.month_counts["Apr-2020"] = 1
+        with self.assertRaises(AttributeError):
+            row.unknown_column = ""
+
+    def test_period_slot(self):
+        '''Test that report Begin_Dates map to their month's slot, and months outside the range are rejected'''
+        month_index = FetchData.get_month_index(self.begin_date, self.end_date)
+        self.assertEqual(month_index.get_period_slot("2020-02-01"), 1)
+        self.assertEqual(month_index.get_period_slot("2020-02-01"), 1)
+        with self.assertRaises(KeyError):
+            month_index.get_period_slot("2020-04-01")
+        self.assertNotIn("2020-04-01", month_index.period_slots)
+
+    def test_report_item_field_values(self):
+        '''Test that item and parent values go to their own fields, and that the last ID of a type is used'''
+        report_item_dict = {
+            "Item": "Article", "Publisher": "", "Platform": "Plat",
+            "Item_ID": [{"Type": "DOI", "Value": "10.1/a"}, {"Type": "Proprietary", "Value": "P:1"},
+                        {"Type": "Proprietary_ID", "Value": "P:2"}, {"Type": "Unknown", "Value": "?"}],
+            "Item_Contributors": [{"Type": "Author", "Name": "A", "Identifier": "ORCID:1"},
+                                  {"Type": "Editor", "Name": "E"}, {"Type": "Author", "Name": "B"}],
+            "Publisher_ID": [{"Type": "ISNI", "Value": "1"}, {"Type": "Proprietary", "Value": "2"}],
+            "Item_Parent": {"Item_Name": "Journal", "Item_ID": [{"Type": "Print_ISSN", "Value": "1234-5678"}],
+                            "Item_Contributors": [{"Type": "Author", "Name": "C"}],
+                            "Item_Dates": [{"Type": "Pub_Date", "Value": "2019"}]},
+            "Performance": []}
+        report_item = FetchData.ItemReportItemModel.from_json(report_item_dict)
+
+        field_values = FetchData.get_report_item_field_values(report_item, MajorReportType.ITEM)
+        self.assertEqual(field_values, {"item": "Article", "platform": "Plat", "publisher_id": "ISNI:1",
+                                        "authors": "A (ORCID:1); B", "doi": "10.1/a", "proprietary_id": "P:2",
+                                        "parent_title": "Journal", "parent_authors": "C",
+                                        "parent_publication_date": "2019", "parent_print_issn": "1234-5678"})
+        self.assertEqual(FetchData.get_report_item_json_field_values(report_item_dict, MajorReportType.ITEM),
+                         field_values)
+
+    def test_value_pool(self):
+        '''Test that equal low cardinality values share one string, and other values and types are kept as they are'''
+        value_pool = FetchData.ValuePool()
+        platform = "".join(["Pl", "at"])
+        other_platform = "".join(["Pla", "t"])
+        self.assertIsNot(platform, other_platform)
+
+        self.assertIs(value_pool.intern(platform), platform)
+        self.assertIs(value_pool.intern(other_platform), platform)
+        self.assertEqual(value_pool.intern(2019), 2019)
+
+        title = "".join(["Tit", "le"])
+        field_values = value_pool.intern_field_values({"platform": other_platform, "title": title})
+        self.assertIs(field_values["platform"], platform)
+        self.assertIs(field_values["title"], title)
+
+        row = self.create_row("A", "", "Jan-2020", 1)
+        row.platform = other_platform
+        value_pool.intern_row(row)
+        self.assertIs(row.platform, platform)
+
+
+class ReportHeaderTests(unittest.TestCase):
+    def test_exception_only_report(self):
+        '''Test that a no usage report gives its header and all its exceptions, with the response's exceptions first'''
+        json_dict = {"Code": 3031, "Message": "Usage Not Ready for Requested Dates",
+                     "Report_Header": {"Report_ID": "tr_j1", "Exceptions": [{"Code": 3030, "Message": "No Usage"}]}}
+
+        report_header, exceptions = FetchData.ReportModel.process_report_header(json_dict)
+        self.assertEqual(report_header.report_id, "TR_J1")
+        self.assertEqual(report_header.major_report_type, MajorReportType.TITLE)
+        self.assertEqual([exception.code for exception in exceptions], [3031, 3030])
+        self.assertEqual(report_header.exceptions[0].code, 3030)
+
+    def test_exception_codes(self):
+        '''Test that queued and unacceptable reports are raised before the report items are read'''
+        with self.assertRaises(FetchData.RetryLaterException):
+            FetchData.ReportModel.process_report_header({"Exception": {"Code": 1011, "Message": "Report Queued"}})
+        with self.assertRaises(FetchData.ReportHeaderMissingException):
+            FetchData.ReportModel.process_report_header({"Report_Items": []})
+        with self.assertRaises(FetchData.UnacceptableCodeException):
+            FetchData.ReportModel.process_report_header(
+                {"Report_Header": {"Report_ID": "PR", "Exceptions": [{"Code": 3000}]}, "Report_Items": None})
+
+
+class ReportProcessTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.settings = Settings.SettingsModel(False, self.temp_dir.name + "/yearly/", self.temp_dir.name + "/other/",
+                                               0, 30, 2, 2, "UA", "USD", use_report_processes=True)
+        self.vendor = Vendor("Vendor", "https://sushi.example.com/r5", "customer", "", "", "", False, "", "")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_process_report_json(self):
+        '''Test that the request data can be sent to a report process, and that only the result is sent back'''
+        request_data = FetchData.RequestData(self.vendor, ["PR_P1"], QDate(2020, 1, 1), QDate(2020, 2, 1),
+                                             self.settings.other_directory, self.settings)
+        request_data = pickle.loads(pickle.dumps(request_data))
+        json_string = json.dumps({
+            "Report_Header": {"Report_ID": "PR_P1", "Created": "2020-03-01T00:00:00Z"},
+            "Report_Items": [{"Platform": "Plat", "Performance": [
+                {"Period": {"Begin_Date": "2020-02-01"}, "Instance": [{"Metric_Type": "Searches_Platform",
+                                                                       "Count": 3}]}]}]})
+
+        process_result = FetchData.process_report_json("Vendor-PR_P1", "PR_P1", request_data, [json_string])
+        process_result = pickle.loads(pickle.dumps(process_result))
+
+        self.assertEqual(process_result.completion_status, CompletionStatus.SUCCESSFUL)
+        self.assertEqual(process_result.created, "2020-03-01T00:00:00Z")
+        with open(process_result.file_path, encoding="utf-8") as file:
+            self.assertEqual(file.read().splitlines()[-1], "Plat\tSearches_Platform\t3\t0\t3")
+
+    def test_process_report_json_file(self):
+        '''Test that a yearly report is read from its raw JSON file and added to the database by the report process'''
+        protected_dir, archive_dir = FetchData.PROTECTED_DATABASE_FILE_DIR, FetchData.JSON_ARCHIVE_FILE_DIR
+        database_location = ManageDB.DATABASE_LOCATION
+        FetchData.PROTECTED_DATABASE_FILE_DIR = self.temp_dir.name + "/protected/"
+        FetchData.JSON_ARCHIVE_FILE_DIR = self.temp_dir.name + "/json/"
+        ManageDB.DATABASE_LOCATION = path.join(self.temp_dir.name, "search.db")
+        try:
+            ManageDB.update_settings(self.settings)
+            ManageDB.setup_database(True, emit_signal=False)
+            request_data = FetchData.RequestData(self.vendor, ["PR_P1"], QDate(2020, 1, 1), QDate(2020, 2, 1),
+                                                 self.settings.yearly_directory, self.settings)
+            json_file_path = FetchData.ReportWorker("Vendor-PR_P1", "PR_P1", request_data).get_json_file_path()
+            with FetchData.open_archived_json_file(json_file_path) as json_file:
+                json_file.write(json.dumps({
+                    "Report_Header": {"Report_ID": "PR_P1", "Created": "2020-03-01T00:00:00Z"},
+                    "Report_Items": [{"Platform": "Plat", "Performance": [
+                        {"Period": {"Begin_Date": "2020-02-01"}, "Instance": [{"Metric_Type": "Searches_Platform",
+                                                                               "Count": 3}]}]}]}))
+
+            process_result = FetchData.process_report_json("Vendor-PR_P1", "PR_P1", request_data, [json_file_path],
+                                                           True)
+            connection = sqlite3.connect(ManageDB.DATABASE_LOCATION)
+            rows = connection.execute("SELECT platform, metric_type, month, metric FROM PR_P1").fetchall()
+            connection.close()
+        finally:
+            FetchData.PROTECTED_DATABASE_FILE_DIR, FetchData.JSON_ARCHIVE_FILE_DIR = protected_dir, archive_dir
+            ManageDB.DATABASE_LOCATION = database_location
+
+        self.assertEqual(process_result.completion_status, CompletionStatus.SUCCESSFUL)
+        self.assertTrue(process_result.is_added_to_database)
+        self.assertIsNone(process_result.database_rows)
+        self.assertEqual(rows, [("Plat", "Searches_Platform", 2, 3)])
+
+
+class ReportJsonStreamParserTests(unittest.TestCase):
+    def parse_in_chunks(self, json_string: str, chunk_size: int) -> tuple:
+        parser = FetchData.ReportJsonStreamParser()
+        report_item_dicts = []
+        for i in range(0, len(json_string), chunk_size):
+            report_item_dicts += parser.feed(json_string[i:i + chunk_size])
+        report_item_dicts += parser.close()
+        return parser.json_value, report_item_dicts
+
+    def test_report_items_streamed(self):
+        '''Test that report items are returned one at a time, however the document is split'''
+        json_string = '{"Report_Header": {"Report_ID": "PR"}, "Report_Items": [{"Platform": "A", "Count": 12.5}, ' \
+                      '{"Platform": "B", "Count": -3e2}], "Code": 3030, "Valid": true}'
+        for chunk_size in range(1, len(json_string) + 1):
+            json_value, report_item_dicts = self.parse_in_chunks(json_string, chunk_size)
+            self.assertEqual(json_value, {"Report_Header": {"Report_ID": "PR"}, "Code": 3030, "Valid": True})
+            self.assertEqual(report_item_dicts, [{"Platform": "A", "Count": 12.5}, {"Platform": "B", "Count": -300}])
+
+    def test_not_report_object(self):
+        json_value, report_item_dicts = self.parse_in_chunks('[{"Code": 3000}]', 4)
+        self.assertEqual(json_value, [{"Code": 3000}])
+        self.assertEqual(report_item_dicts, [])
+
+    def test_invalid_document(self):
+        with self.assertRaises(json.JSONDecodeError) as context:
+            self.parse_in_chunks("  ", 1)
+        self.assertEqual(context.exception.msg, "Expecting value")
+        with self.assertRaises(json.JSONDecodeError):
+            self.parse_in_chunks('{"Report_Items": [{"Platform": "A"}', 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
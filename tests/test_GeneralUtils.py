@@ -0,0 +1,80 @@
+import unittest
+import sys
+import os
+import tempfile
+from PyQt5.QtWidgets import QApplication
+
+import GeneralUtils
+
+app = QApplication(sys.argv)
+
+
+class JsonLoadsTests(unittest.TestCase):
+    def test_same_result_for_all_backends(self):
+        '''Test that every installed backend gives the json module's result, even for documents it rejects'''
+        json_string = '{"Report_Items": [{"Count": 1, "Title": "\\u00e9"}], "Average": NaN}'
+        expected_value = repr(GeneralUtils.json_loads(json_string, "json"))  # NaN != NaN
+        for json_backend in GeneralUtils.get_json_backends() + ["auto", "unknown"]:
+            self.assertEqual(repr(GeneralUtils.json_loads(json_string, json_backend)), expected_value)
+            self.assertEqual(repr(GeneralUtils.json_loads(json_string.encode("utf-8"), json_backend)), expected_value)
+
+    def test_invalid_json(self):
+        for json_backend in GeneralUtils.get_json_backends():
+            with self.assertRaises(ValueError):
+                GeneralUtils.json_loads("", json_backend)
+
+
+
+class AtomicFileTests(unittest.TestCase):
+    def test_replace_on_close(self):
+        '''Test that the file is only replaced when closed, and left unchanged if writing it fails'''
+        with tempfile.TemporaryDirectory() as file_dir:
+            file_path = os.path.join(file_dir, "2019_Vendor_PR.tsv")
+            GeneralUtils.save_json_file(file_dir + os.sep, "2019_Vendor_PR.tsv", "old")
+
+            with self.assertRaises(ValueError):
+                with GeneralUtils.AtomicFile(file_path, 'w', encoding="utf-8") as file:
+                    file.write("new")
+                    raise ValueError("Cancelled")
+            with open(file_path, encoding="utf-8") as file:
+                self.assertEqual(file.read(), "old")
+            self.assertEqual(os.listdir(file_dir), ["2019_Vendor_PR.tsv"])
+
+            with GeneralUtils.AtomicFile(file_path, 'w', sync_later=True, encoding="utf-8") as file:
+                file.write("new")
+                self.assertEqual(os.path.getsize(file_path), 3)
+            with open(file_path, encoding="utf-8") as file:
+                self.assertEqual(file.read(), "new")
+
+            self.assertEqual(GeneralUtils.take_unsynced_files(), [file_path])
+            GeneralUtils.add_unsynced_files([file_path])
+            GeneralUtils.sync_written_files()
+            self.assertEqual(GeneralUtils.take_unsynced_files(), [])
+
+    def test_sync_before_replace(self):
+        '''Test that a file written with sync_later is synced before it replaces the file, only its directory later'''
+        synced_paths = []
+        sync_file = GeneralUtils.sync_file
+
+        def record_sync(file_path: str, is_dir: bool = False):
+            synced_paths.append((os.path.basename(file_path), os.path.exists(file_path), is_dir))
+            sync_file(file_path, is_dir)
+
+        with tempfile.TemporaryDirectory() as file_dir:
+            file_path = os.path.join(file_dir, "2019_Vendor_PR.tsv")
+            GeneralUtils.sync_file = record_sync
+            try:
+                with GeneralUtils.AtomicFile(file_path, 'w', sync_later=True, encoding="utf-8") as file:
+                    file.write("new")
+                self.assertEqual(len(synced_paths), 1)
+                self.assertTrue(synced_paths[0][0].endswith(".tmp"))
+                self.assertFalse(synced_paths[0][2])
+
+                GeneralUtils.sync_written_files()
+                self.assertEqual(synced_paths[1:], [(os.path.basename(file_dir), True, True)])
+            finally:
+                GeneralUtils.sync_file = sync_file
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+import sys
+from PyQt5.QtWidgets import QApplication
+
+import HeadlessFetch
+import Settings
+from Constants import *
+from FetchData import ProcessResult
+from ManageVendors import Vendor
+
+app = QApplication(sys.argv)
+
+
+class HeadlessFetchTests(unittest.TestCase):
+    def setUp(self):
+        settings = Settings.SettingsModel(False, "./yearly/", "./other/", 0, 30, 2, 2, "UA", "USD")
+        self.vendor = Vendor("Vendor", "https://sushi.example.com/r5", "customer", "", "", "", False, "", "")
+        self.runner = HeadlessFetch.HeadlessFetchRunner([self.vendor], settings)
+
+    def test_parse_arguments(self):
+        args = HeadlessFetch.parse_arguments(["--year", "2019", "--vendors", "A", "B C", "--reports", "PR", "TR_J1"])
+        self.assertEqual(args.year, 2019)
+        self.assertEqual(args.vendors, ["A", "B C"])
+        self.assertEqual(args.reports, ["PR", "TR_J1"])
+        self.assertFalse(args.no_database)
+
+        with self.assertRaises(SystemExit) as context:
+            HeadlessFetch.parse_arguments(["--begin-date", "2020-01"])
+        self.assertEqual(context.exception.code, HEADLESS_EXIT_INVALID_ARGUMENTS)
+
+    def test_exit_code(self):
+        '''Test that the exit code only changes when a report fails, not when it has warnings'''
+        warning_result = ProcessResult(self.vendor, "PR")
+        warning_result.completion_status = CompletionStatus.WARNING
+        self.runner.update_results_ui(self.vendor, ProcessResult(self.vendor), [warning_result])
+        self.assertEqual(self.runner.exit_code, HEADLESS_EXIT_SUCCESS)
+
+        failed_result = ProcessResult(self.vendor, "DR")
+        failed_result.completion_status = CompletionStatus.FAILED
+        self.runner.update_results_ui(self.vendor, ProcessResult(self.vendor), [warning_result, failed_result])
+        self.assertEqual(self.runner.exit_code, HEADLESS_EXIT_FAILED)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+import sys
+import sqlite3
+import tempfile
+from os import path, makedirs
+from PyQt5.QtWidgets import QApplication
+
+import ManageDB
+import Settings
+from Constants import *
+
+app = QApplication(sys.argv)
+
+
+class UpdateDatabaseWorkerTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.database_location = ManageDB.DATABASE_LOCATION
+        ManageDB.update_settings(Settings.SettingsModel(False, "./yearly/", "./other/", 0, 30, 2, 2, "UA", "USD"))
+
+        self.files = []
+        for vendor in ("Vendor A", "Vendor B"):
+            file_dir = path.join(self.temp_dir.name, "2020", vendor)
+            makedirs(file_dir)
+            file_path = path.join(file_dir, f"2020_{vendor}_PR_P1.tsv")
+            with open(file_path, 'w', encoding="utf-8", newline='') as file:
+                header_values = {'report_id': "PR_P1", 'created': "2020-03-01"}
+                for header_entry in HEADER_ENTRIES:
+                    file.write(f"{header_entry}\t{header_values.get(header_entry, '')}\r\n")
+                file.write("\r\n")
+                file.write("Platform\tMetric_Type\tReporting_Period_Total\tJan-2020\tFeb-2020\r\n")
+                file.write("Plat 1\tSearches_Platform\t5\t2\t3\r\nPlat 2\tSearches_Platform\t4\t0\t4\r\n")
+            self.files.append({'file': file_path, 'vendor': vendor, 'year': "2020"})
+        self.files.append({'file': path.join(self.temp_dir.name, "2020_Vendor C_PR_P1.tsv"), 'vendor': "Vendor C",
+                           'year': "2020"})  # missing, left out of the parallel rebuild
+
+    def tearDown(self):
+        ManageDB.DATABASE_LOCATION = self.database_location
+        self.temp_dir.cleanup()
+
+    def test_parallel_rebuild(self):
+        '''Test that parsing the files in processes gives the database of inserting them one after another'''
+        ManageDB.DATABASE_LOCATION = path.join(self.temp_dir.name, "sequential.db")
+        ManageDB.UpdateDatabaseWorker(self.files[:2], True).work()
+        connection = sqlite3.connect(ManageDB.DATABASE_LOCATION)
+        expected_rows = connection.execute("SELECT * FROM PR_P1 ORDER BY vendor, platform, month").fetchall()
+        connection.close()
+
+        ManageDB.DATABASE_LOCATION = path.join(self.temp_dir.name, "parallel.db")
+        worker = ManageDB.UpdateDatabaseWorker(self.files, True, True, 2)
+        statuses = []
+        worker.status_changed_signal.connect(statuses.append)
+        worker.work()
+        connection = sqlite3.connect(ManageDB.DATABASE_LOCATION)
+        rows = connection.execute("SELECT * FROM PR_P1 ORDER BY vendor, platform, month").fetchall()
+        connection.close()
+
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(rows, expected_rows)
+        self.assertIn("6 rows", statuses[-2])
+
+    def test_database_writer(self):
+        '''Test that the queued files and rows are inserted like the files they're from'''
+        ManageDB.DATABASE_LOCATION = path.join(self.temp_dir.name, "files.db")
+        ManageDB.UpdateDatabaseWorker(self.files[:2], True).work()
+        connection = sqlite3.connect(ManageDB.DATABASE_LOCATION)
+        expected_rows = connection.execute("SELECT * FROM PR_P1 ORDER BY vendor, platform, month").fetchall()
+        connection.close()
+
+        ManageDB.DATABASE_LOCATION = path.join(self.temp_dir.name, "writer.db")
+        ManageDB.setup_database(True, emit_signal=False)
+        sql_statements, row_count = ManageDB.read_database_file(self.files[0])
+        worker = ManageDB.DatabaseWriterWorker()
+        file_names = []
+        worker.task_finished_signal.connect(file_names.append)
+        worker.add_file(dict(self.files[0], report="PR_P1", rows=sql_statements[1][1]))
+        worker.add_file(self.files[1])
+        worker.finish()
+        worker.work()
+        connection = sqlite3.connect(ManageDB.DATABASE_LOCATION)
+        rows = connection.execute("SELECT * FROM PR_P1 ORDER BY vendor, platform, month").fetchall()
+        connection.close()
+
+        self.assertEqual(file_names, ["2020_Vendor A_PR_P1.tsv", "2020_Vendor B_PR_P1.tsv"])
+        self.assertEqual(rows, expected_rows)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -66,6 +66,9 @@ class Ui_fetch_reports_tab(object):
         self.All_reports_edit_fetch.setObjectName("All_reports_edit_fetch")
         self.horizontalLayout_12.addWidget(self.All_reports_edit_fetch)
         self.horizontalLayout_10.addWidget(self.frame_28)
+        self.resume_fetch_check_box = QtWidgets.QCheckBox(self.frame_9)
+        self.resume_fetch_check_box.setObjectName("resume_fetch_check_box")
+        self.horizontalLayout_10.addWidget(self.resume_fetch_check_box)
         self.fetch_all_data_button = QtWidgets.QPushButton(self.frame_9)
         sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Fixed)
         sizePolicy.setHorizontalStretch(0)
@@ -125,6 +128,9 @@ class Ui_fetch_reports_tab(object):
         self.deselect_vendors_button_fetch = QtWidgets.QPushButton(self.horizontalFrame)
         self.deselect_vendors_button_fetch.setObjectName("deselect_vendors_button_fetch")
         self.horizontalLayout_4.addWidget(self.deselect_vendors_button_fetch)
+        self.refresh_supported_reports_button_fetch = QtWidgets.QPushButton(self.horizontalFrame)
+        self.refresh_supported_reports_button_fetch.setObjectName("refresh_supported_reports_button_fetch")
+        self.horizontalLayout_4.addWidget(self.refresh_supported_reports_button_fetch)
         self.verticalLayout_4.addWidget(self.horizontalFrame)
         self.vendors_list_view_fetch = QtWidgets.QListView(self.frame_10)
         font = QtGui.QFont()
@@ -381,10 +387,12 @@ class Ui_fetch_reports_tab(object):
 
         self.retranslateUi(fetch_reports_tab)
         QtCore.QMetaObject.connectSlotsByName(fetch_reports_tab)
-        fetch_reports_tab.setTabOrder(self.All_reports_edit_fetch, self.fetch_all_data_button)
+        fetch_reports_tab.setTabOrder(self.All_reports_edit_fetch, self.resume_fetch_check_box)
+        fetch_reports_tab.setTabOrder(self.resume_fetch_check_box, self.fetch_all_data_button)
         fetch_reports_tab.setTabOrder(self.fetch_all_data_button, self.select_vendors_button_fetch)
         fetch_reports_tab.setTabOrder(self.select_vendors_button_fetch, self.deselect_vendors_button_fetch)
-        fetch_reports_tab.setTabOrder(self.deselect_vendors_button_fetch, self.vendors_list_view_fetch)
+        fetch_reports_tab.setTabOrder(self.deselect_vendors_button_fetch, self.refresh_supported_reports_button_fetch)
+        fetch_reports_tab.setTabOrder(self.refresh_supported_reports_button_fetch, self.vendors_list_view_fetch)
         fetch_reports_tab.setTabOrder(self.vendors_list_view_fetch, self.select_report_types_button_fetch)
         fetch_reports_tab.setTabOrder(self.select_report_types_button_fetch, self.deselect_report_types_button_fetch)
         fetch_reports_tab.setTabOrder(self.deselect_report_types_button_fetch, self.report_types_help_button)
@@ -400,11 +408,15 @@ class Ui_fetch_reports_tab(object):
         self.label_35.setText(_translate("fetch_reports_tab", "Fetch All Reports"))
         self.label_34.setText(_translate("fetch_reports_tab", "Year"))
         self.All_reports_edit_fetch.setDisplayFormat(_translate("fetch_reports_tab", "yyyy"))
+        self.resume_fetch_check_box.setToolTip(_translate("fetch_reports_tab", "Skip reports that were already fetched successfully, only fetching missing or failed reports"))
+        self.resume_fetch_check_box.setText(_translate("fetch_reports_tab", "Only Missing or Failed"))
         self.fetch_all_data_button.setText(_translate("fetch_reports_tab", "Fetch All Reports"))
         self.Adv_Fetch_text.setText(_translate("fetch_reports_tab", "Advanced Fetch Reports"))
         self.label_11.setText(_translate("fetch_reports_tab", "Select Vendors"))
         self.select_vendors_button_fetch.setText(_translate("fetch_reports_tab", "Select All"))
         self.deselect_vendors_button_fetch.setText(_translate("fetch_reports_tab", "Deselect All"))
+        self.refresh_supported_reports_button_fetch.setToolTip(_translate("fetch_reports_tab", "Request the supported reports of the selected vendors again on their next fetch"))
+        self.refresh_supported_reports_button_fetch.setText(_translate("fetch_reports_tab", "Refresh Supported Reports"))
         self.label_12.setText(_translate("fetch_reports_tab", "Select Report Types"))
         self.select_report_types_button_fetch.setText(_translate("fetch_reports_tab", "Select All"))
         self.deselect_report_types_button_fetch.setText(_translate("fetch_reports_tab", "Deselect All"))
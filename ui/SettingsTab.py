@@ -251,6 +251,109 @@ class Ui_settings_tab(object):
         self.label_30 = QtWidgets.QLabel(self.frame_34)
         self.label_30.setObjectName("label_30")
         self.gridLayout_11.addWidget(self.label_30, 5, 0, 1, 1)
+        self.max_in_flight_requests_label = QtWidgets.QLabel(self.frame_34)
+        self.max_in_flight_requests_label.setObjectName("max_in_flight_requests_label")
+        self.gridLayout_11.addWidget(self.max_in_flight_requests_label, 9, 0, 1, 1)
+        self.max_in_flight_requests_spin_box = QtWidgets.QSpinBox(self.frame_34)
+        self.max_in_flight_requests_spin_box.setMinimum(1)
+        self.max_in_flight_requests_spin_box.setMaximum(9999)
+        self.max_in_flight_requests_spin_box.setObjectName("max_in_flight_requests_spin_box")
+        self.gridLayout_11.addWidget(self.max_in_flight_requests_spin_box, 9, 1, 1, 1)
+        self.max_in_flight_requests_help_button = QtWidgets.QPushButton(self.frame_34)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.max_in_flight_requests_help_button.sizePolicy().hasHeightForWidth())
+        self.max_in_flight_requests_help_button.setSizePolicy(sizePolicy)
+        self.max_in_flight_requests_help_button.setText("")
+        self.max_in_flight_requests_help_button.setIcon(icon1)
+        self.max_in_flight_requests_help_button.setObjectName("max_in_flight_requests_help_button")
+        self.gridLayout_11.addWidget(self.max_in_flight_requests_help_button, 9, 2, 1, 1)
+        self.supported_reports_ttl_label = QtWidgets.QLabel(self.frame_34)
+        self.supported_reports_ttl_label.setObjectName("supported_reports_ttl_label")
+        self.gridLayout_11.addWidget(self.supported_reports_ttl_label, 11, 0, 1, 1)
+        self.supported_reports_ttl_spin_box = QtWidgets.QDoubleSpinBox(self.frame_34)
+        self.supported_reports_ttl_spin_box.setDecimals(1)
+        self.supported_reports_ttl_spin_box.setMaximum(9999.0)
+        self.supported_reports_ttl_spin_box.setObjectName("supported_reports_ttl_spin_box")
+        self.gridLayout_11.addWidget(self.supported_reports_ttl_spin_box, 11, 1, 1, 1)
+        self.supported_reports_ttl_help_button = QtWidgets.QPushButton(self.frame_34)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.supported_reports_ttl_help_button.sizePolicy().hasHeightForWidth())
+        self.supported_reports_ttl_help_button.setSizePolicy(sizePolicy)
+        self.supported_reports_ttl_help_button.setText("")
+        self.supported_reports_ttl_help_button.setIcon(icon1)
+        self.supported_reports_ttl_help_button.setObjectName("supported_reports_ttl_help_button")
+        self.gridLayout_11.addWidget(self.supported_reports_ttl_help_button, 11, 2, 1, 1)
+        self.json_backend_label = QtWidgets.QLabel(self.frame_34)
+        self.json_backend_label.setObjectName("json_backend_label")
+        self.gridLayout_11.addWidget(self.json_backend_label, 12, 0, 1, 1)
+        self.json_backend_combobox = QtWidgets.QComboBox(self.frame_34)
+        self.json_backend_combobox.setObjectName("json_backend_combobox")
+        self.gridLayout_11.addWidget(self.json_backend_combobox, 12, 1, 1, 1)
+        self.json_backend_help_button = QtWidgets.QPushButton(self.frame_34)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.json_backend_help_button.sizePolicy().hasHeightForWidth())
+        self.json_backend_help_button.setSizePolicy(sizePolicy)
+        self.json_backend_help_button.setText("")
+        self.json_backend_help_button.setIcon(icon1)
+        self.json_backend_help_button.setObjectName("json_backend_help_button")
+        self.gridLayout_11.addWidget(self.json_backend_help_button, 12, 2, 1, 1)
+        self.json_archive_compression_label = QtWidgets.QLabel(self.frame_34)
+        self.json_archive_compression_label.setObjectName("json_archive_compression_label")
+        self.gridLayout_11.addWidget(self.json_archive_compression_label, 13, 0, 1, 1)
+        self.json_archive_compression_combobox = QtWidgets.QComboBox(self.frame_34)
+        self.json_archive_compression_combobox.setObjectName("json_archive_compression_combobox")
+        self.gridLayout_11.addWidget(self.json_archive_compression_combobox, 13, 1, 1, 1)
+        self.json_archive_compression_help_button = QtWidgets.QPushButton(self.frame_34)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.json_archive_compression_help_button.sizePolicy().hasHeightForWidth())
+        self.json_archive_compression_help_button.setSizePolicy(sizePolicy)
+        self.json_archive_compression_help_button.setText("")
+        self.json_archive_compression_help_button.setIcon(icon1)
+        self.json_archive_compression_help_button.setObjectName("json_archive_compression_help_button")
+        self.gridLayout_11.addWidget(self.json_archive_compression_help_button, 13, 2, 1, 1)
+        self.json_archive_compression_level_label = QtWidgets.QLabel(self.frame_34)
+        self.json_archive_compression_level_label.setObjectName("json_archive_compression_level_label")
+        self.gridLayout_11.addWidget(self.json_archive_compression_level_label, 14, 0, 1, 1)
+        self.json_archive_compression_level_spin_box = QtWidgets.QSpinBox(self.frame_34)
+        self.json_archive_compression_level_spin_box.setMinimum(1)
+        self.json_archive_compression_level_spin_box.setMaximum(22)
+        self.json_archive_compression_level_spin_box.setObjectName("json_archive_compression_level_spin_box")
+        self.gridLayout_11.addWidget(self.json_archive_compression_level_spin_box, 14, 1, 1, 1)
+        self.json_archive_compression_level_help_button = QtWidgets.QPushButton(self.frame_34)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.json_archive_compression_level_help_button.sizePolicy().hasHeightForWidth())
+        self.json_archive_compression_level_help_button.setSizePolicy(sizePolicy)
+        self.json_archive_compression_level_help_button.setText("")
+        self.json_archive_compression_level_help_button.setIcon(icon1)
+        self.json_archive_compression_level_help_button.setObjectName("json_archive_compression_level_help_button")
+        self.gridLayout_11.addWidget(self.json_archive_compression_level_help_button, 14, 2, 1, 1)
+        self.use_report_processes_label = QtWidgets.QLabel(self.frame_34)
+        self.use_report_processes_label.setObjectName("use_report_processes_label")
+        self.gridLayout_11.addWidget(self.use_report_processes_label, 15, 0, 1, 1)
+        self.use_report_processes_check_box = QtWidgets.QCheckBox(self.frame_34)
+        self.use_report_processes_check_box.setText("")
+        self.use_report_processes_check_box.setObjectName("use_report_processes_check_box")
+        self.gridLayout_11.addWidget(self.use_report_processes_check_box, 15, 1, 1, 1)
+        self.use_report_processes_help_button = QtWidgets.QPushButton(self.frame_34)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.use_report_processes_help_button.sizePolicy().hasHeightForWidth())
+        self.use_report_processes_help_button.setSizePolicy(sizePolicy)
+        self.use_report_processes_help_button.setText("")
+        self.use_report_processes_help_button.setIcon(icon1)
+        self.use_report_processes_help_button.setObjectName("use_report_processes_help_button")
+        self.gridLayout_11.addWidget(self.use_report_processes_help_button, 15, 2, 1, 1)
         self.verticalLayout_19.addWidget(self.frame_34)
         self.verticalLayout.addWidget(self.frame_33)
         self.settings_costs_frame = QtWidgets.QFrame(self.frame_4)
@@ -339,6 +442,35 @@ class Ui_settings_tab(object):
         self.settings_search_label.setFont(font)
         self.settings_search_label.setObjectName("settings_search_label")
         self.verticalLayout_20.addWidget(self.settings_search_label, 0, QtCore.Qt.AlignHCenter)
+        self.settings_search_items_frame = QtWidgets.QFrame(self.settings_search_frame)
+        self.settings_search_items_frame.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.settings_search_items_frame.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.settings_search_items_frame.setObjectName("settings_search_items_frame")
+        self.horizontalLayout_5 = QtWidgets.QHBoxLayout(self.settings_search_items_frame)
+        self.horizontalLayout_5.setObjectName("horizontalLayout_5")
+        self.parallel_database_rebuild_label = QtWidgets.QLabel(self.settings_search_items_frame)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Preferred)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.parallel_database_rebuild_label.sizePolicy().hasHeightForWidth())
+        self.parallel_database_rebuild_label.setSizePolicy(sizePolicy)
+        self.parallel_database_rebuild_label.setObjectName("parallel_database_rebuild_label")
+        self.horizontalLayout_5.addWidget(self.parallel_database_rebuild_label)
+        self.parallel_database_rebuild_check_box = QtWidgets.QCheckBox(self.settings_search_items_frame)
+        self.parallel_database_rebuild_check_box.setText("")
+        self.parallel_database_rebuild_check_box.setObjectName("parallel_database_rebuild_check_box")
+        self.horizontalLayout_5.addWidget(self.parallel_database_rebuild_check_box)
+        self.parallel_database_rebuild_help_button = QtWidgets.QPushButton(self.settings_search_items_frame)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.parallel_database_rebuild_help_button.sizePolicy().hasHeightForWidth())
+        self.parallel_database_rebuild_help_button.setSizePolicy(sizePolicy)
+        self.parallel_database_rebuild_help_button.setText("")
+        self.parallel_database_rebuild_help_button.setIcon(icon1)
+        self.parallel_database_rebuild_help_button.setObjectName("parallel_database_rebuild_help_button")
+        self.horizontalLayout_5.addWidget(self.parallel_database_rebuild_help_button)
+        self.verticalLayout_20.addWidget(self.settings_search_items_frame)
         self.settings_rebuild_database_button = QtWidgets.QPushButton(self.settings_search_frame)
         self.settings_rebuild_database_button.setObjectName("settings_rebuild_database_button")
         self.verticalLayout_20.addWidget(self.settings_rebuild_database_button)
@@ -377,10 +509,17 @@ class Ui_settings_tab(object):
         self.label_73.setText(_translate("settings_tab", "User Agent"))
         self.label_29.setText(_translate("settings_tab", "Other Reports Directory"))
         self.label_30.setText(_translate("settings_tab", "Report Request Interval"))
+        self.max_in_flight_requests_label.setText(_translate("settings_tab", "Concurrent Reports (All Vendors)"))
+        self.supported_reports_ttl_label.setText(_translate("settings_tab", "Supported Reports Cache (Hours)"))
+        self.json_backend_label.setText(_translate("settings_tab", "JSON Parser"))
+        self.json_archive_compression_label.setText(_translate("settings_tab", "Raw JSON Compression"))
+        self.json_archive_compression_level_label.setText(_translate("settings_tab", "Raw JSON Compression Level"))
+        self.use_report_processes_label.setText(_translate("settings_tab", "Process Reports in Separate Processes"))
         self.settings_costs_label.setText(_translate("settings_tab", "Costs"))
         self.settings_costs_default_currency_label.setText(_translate("settings_tab", "Default Currency"))
         self.save_button.setText(_translate("settings_tab", "Save All Changes"))
         self.settings_search_label.setText(_translate("settings_tab", "Search"))
+        self.parallel_database_rebuild_label.setText(_translate("settings_tab", "Parse Files in Parallel When Rebuilding"))
         self.settings_rebuild_database_button.setText(_translate("settings_tab", "Rebuild Database"))
 
 import Resources_rc